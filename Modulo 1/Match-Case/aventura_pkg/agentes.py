@@ -0,0 +1,120 @@
+"""
+Agentes que jogam sozinhos, usando a API de passos da Partida.
+
+Um agente recebe a partida em iniciar() e, a cada passo, devolve em
+escolher() a direção que quer tentar. Novos agentes são registrados em
+AGENTES pelo nome usado no torneio.
+"""
+
+import random
+from typing import Callable, Dict, List, Optional
+
+from aventura_pkg import resolvedor
+from aventura_pkg.motor import DIRECOES, Partida
+
+class Agente:
+    """
+    Interface dos agentes.
+
+    Atributos:
+        nome (str): Nome do agente no torneio.
+    """
+
+    nome = "agente"
+
+    def iniciar(self, partida: Partida) -> None:
+        """
+        Chamado uma vez antes do primeiro passo.
+        """
+
+    def escolher(self, partida: Partida) -> str:
+        """
+        Direção do próximo passo ('cima', 'baixo', 'esquerda' ou 'direita').
+        """
+        raise NotImplementedError
+
+class AgenteAleatorio(Agente):
+    """
+    Passeio aleatório: sorteia uma das direções livres a cada passo.
+    """
+
+    nome = "aleatorio"
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def escolher(self, partida: Partida) -> str:
+        livres = partida.direcoes_livres()
+        return self.rng.choice(livres) if livres else 'cima'
+
+class AgenteParede(Agente):
+    """
+    Seguidor de parede pela mão direita.
+
+    Tenta, nesta ordem, virar à direita, seguir em frente, virar à esquerda
+    e voltar. Em labirintos perfeitos (sem ciclos) sempre chega à maçã.
+    """
+
+    nome = "parede"
+
+    def iniciar(self, partida: Partida) -> None:
+        self.sentido = DIRECOES.index('direita')
+
+    def escolher(self, partida: Partida) -> str:
+        for giro in (1, 0, 3, 2):
+            direcao = DIRECOES[(self.sentido + giro) % 4]
+            if partida.livre(direcao):
+                self.sentido = (self.sentido + giro) % 4
+                return direcao
+        return DIRECOES[self.sentido]  # Célula isolada: só resta bater na parede
+
+class AgenteResolvedor(Agente):
+    """
+    Calcula o caminho mais curto no início e o segue passo a passo.
+    """
+
+    def __init__(self, algoritmo: str = "a*"):
+        self.algoritmo = algoritmo
+        self.nome = f"resolvedor-{algoritmo}"
+        self._passos: List[str] = []
+
+    def iniciar(self, partida: Partida) -> None:
+        sol = resolvedor.resolver(partida.maze, partida.posicao, partida.apple_pos, self.algoritmo)
+        delta_para_direcao = {(-1, 0): 'cima', (0, 1): 'direita', (1, 0): 'baixo', (0, -1): 'esquerda'}
+        self._passos = [
+            delta_para_direcao[(b[0] - a[0], b[1] - a[1])]
+            for a, b in zip(sol.caminho, sol.caminho[1:])
+        ]
+        self._passos.reverse()
+
+    def escolher(self, partida: Partida) -> str:
+        # Sem caminho até a maçã: fica parado tentando subir
+        return self._passos.pop() if self._passos else 'cima'
+
+AGENTES: Dict[str, Callable[[Optional[int]], Agente]] = {
+    "aleatorio": lambda seed=None: AgenteAleatorio(seed),
+    "parede": lambda seed=None: AgenteParede(),
+    "bfs": lambda seed=None: AgenteResolvedor("bfs"),
+    "a*": lambda seed=None: AgenteResolvedor("a*"),
+    "bidirecional": lambda seed=None: AgenteResolvedor("bidirecional"),
+}
+
+def jogar(agente: Agente, partida: Partida, max_passos: int) -> Partida:
+    """
+    Deixa o agente jogar até vencer ou esgotar os passos.
+
+    Args:
+        agente (Agente): Agente que escolhe as direções.
+        partida (Partida): Partida nova.
+        max_passos (int): Limite de passos (movimentos e colisões).
+
+    Retorna:
+        Partida: A mesma partida, no estado final.
+    """
+    agente.iniciar(partida)
+    passo, escolher = partida.passo, agente.escolher
+    for _ in range(max_passos):
+        if partida.venceu:
+            break
+        passo(escolher(partida))
+    return partida
@@ -0,0 +1,260 @@
+"""
+Formato binário de labirintos (.lab).
+
+Layout (little-endian):
+
+    cabeçalho (48 bytes)
+        4s   assinatura b'LABZ'
+        B    versão (1)
+        B    flags (bit 0: semente conhecida)
+        H    reservado
+        I    largura
+        I    altura
+        Q    semente
+        I    linha da maçã
+        I    coluna da maçã
+        16s  nome do algoritmo (ASCII, completado com zeros)
+    grade
+        height linhas de ceil(width / 8) bytes; cada bit é uma célula
+        (1 = parede), do bit mais significativo para o menos, e os bits
+        que sobram no fim da linha são 1.
+
+Cada linha ocupa um número inteiro de bytes, então a célula (r, c) fica em
+uma posição fixa do arquivo: abrir_labirinto() mapeia o arquivo com mmap e
+lê só as páginas das células consultadas, sem carregar a grade inteira.
+Um labirinto 2001x2001 ocupa cerca de 490 KB.
+"""
+
+import mmap
+import os
+import struct
+from typing import BinaryIO, Iterable, Optional, Tuple
+
+from aventura_pkg.labirinto import CAMINHO, PAREDE, Labirinto
+
+ASSINATURA = b'LABZ'
+VERSAO = 1
+CABECALHO = struct.Struct('<4sBBHIIQII16s')
+_SEMENTE_CONHECIDA = 1
+
+# Conversões entre a grade (PAREDE = 0, CAMINHO = 1) e os bits ('1' = parede)
+_PARA_BITS = bytes.maketrans(bytes([PAREDE, CAMINHO]), b'10')
+_DE_BITS = bytes.maketrans(b'10', bytes([PAREDE, CAMINHO]))
+
+class FormatoInvalido(ValueError):
+    """
+    Arquivo que não é um labirinto (ou replay) válido.
+    """
+
+def bytes_por_linha(width: int) -> int:
+    return (width + 7) // 8
+
+def empacotar_linha(linha: bytes) -> bytes:
+    """
+    Converte uma linha da grade (um byte por célula) em bits.
+    """
+    largura = len(linha)
+    sobra = -largura % 8
+    bits = linha.translate(_PARA_BITS) + b'1' * sobra
+    return int(bits, 2).to_bytes((largura + sobra) // 8, 'big')
+
+def desempacotar_linha(dados: bytes, width: int) -> bytes:
+    """
+    Converte os bits de uma linha de volta para um byte por célula.
+    """
+    bits = format(int.from_bytes(dados, 'big'), f'0{len(dados) * 8}b')
+    return bits[:width].encode('ascii').translate(_DE_BITS)
+
+def _cabecalho(width: int, height: int, apple_pos: Tuple[int,int], seed: Optional[int],
+               algoritmo: str) -> bytes:
+    nome = algoritmo.encode('ascii')
+    if len(nome) > 16:
+        raise ValueError(f"Nome de algoritmo longo demais para o formato: {algoritmo!r}")
+    flags = _SEMENTE_CONHECIDA if seed is not None else 0
+    return CABECALHO.pack(ASSINATURA, VERSAO, flags, 0, width, height, seed or 0,
+                          apple_pos[0], apple_pos[1], nome)
+
+def ler_cabecalho(dados: bytes) -> dict:
+    """
+    Decodifica o cabeçalho de um arquivo .lab.
+
+    Args:
+        dados (bytes): Pelo menos os primeiros CABECALHO.size bytes do arquivo.
+
+    Retorna:
+        dict: width, height, seed (ou None), apple_pos e algoritmo.
+
+    Raises:
+        FormatoInvalido: Se a assinatura ou a versão não baterem.
+    """
+    if len(dados) < CABECALHO.size:
+        raise FormatoInvalido("Arquivo menor que o cabeçalho")
+    assinatura, versao, flags, _, width, height, seed, apple_r, apple_c, nome = \
+        CABECALHO.unpack_from(dados)
+    if assinatura != ASSINATURA:
+        raise FormatoInvalido(f"Assinatura inválida: {assinatura!r}")
+    if versao != VERSAO:
+        raise FormatoInvalido(f"Versão não suportada: {versao}")
+    return {
+        'width': width,
+        'height': height,
+        'seed': seed if flags & _SEMENTE_CONHECIDA else None,
+        'apple_pos': (apple_r, apple_c),
+        'algoritmo': nome.rstrip(b'\0').decode('ascii'),
+    }
+
+def empacotar(maze: Labirinto) -> bytes:
+    """
+    Serializa o labirinto no formato .lab (cabeçalho + grade em bits).
+    """
+    partes = [_cabecalho(maze.width, maze.height, maze.apple_pos, maze.seed, maze.algoritmo)]
+    partes.extend(empacotar_linha(maze.linha(r)) for r in range(maze.height))
+    return b''.join(partes)
+
+def desempacotar(dados: bytes) -> Labirinto:
+    """
+    Lê um labirinto serializado por empacotar().
+
+    Raises:
+        FormatoInvalido: Se o cabeçalho for inválido ou a grade estiver incompleta.
+    """
+    info = ler_cabecalho(dados)
+    width, height = info['width'], info['height']
+    passo = bytes_por_linha(width)
+    inicio = CABECALHO.size
+    if len(dados) < inicio + passo * height:
+        raise FormatoInvalido("Grade incompleta")
+    grid = bytearray(width * height)
+    for r in range(height):
+        pos = inicio + r * passo
+        grid[r * width:(r + 1) * width] = desempacotar_linha(dados[pos:pos + passo], width)
+    return Labirinto(width, height, grid, info['apple_pos'], info['seed'], info['algoritmo'])
+
+def salvar_labirinto(maze: Labirinto, caminho: str) -> int:
+    """
+    Grava o labirinto em um arquivo .lab.
+
+    Retorna:
+        int: Tamanho do arquivo em bytes.
+    """
+    dados = empacotar(maze)
+    with open(caminho, 'wb') as f:
+        f.write(dados)
+    return len(dados)
+
+def salvar_linhas(caminho: str, linhas: Iterable[bytes], width: int, height: int,
+                  apple_pos: Tuple[int,int], seed: Optional[int] = None,
+                  algoritmo: str = "eller") -> int:
+    """
+    Grava um labirinto entregue linha a linha, sem montar a grade em memória.
+
+    Feito para geradores em fluxo como geradores.gerar_linhas_eller().
+
+    Args:
+        caminho (str): Arquivo de destino.
+        linhas (Iterable[bytes]): As height linhas da grade.
+        width (int): Número de colunas.
+        height (int): Número de linhas.
+        apple_pos (Tuple[int,int]): Posição da maçã (precisa ser caminho).
+        seed (int, optional): Semente usada.
+        algoritmo (str): Nome do algoritmo.
+
+    Retorna:
+        int: Tamanho do arquivo em bytes.
+
+    Raises:
+        ValueError: Se o número ou a largura das linhas não bater.
+    """
+    total = 0
+    with open(caminho, 'wb') as f:
+        f.write(_cabecalho(width, height, apple_pos, seed, algoritmo))
+        for linha in linhas:
+            if len(linha) != width:
+                raise ValueError(f"Linha {total} com {len(linha)} células, esperado {width}")
+            f.write(empacotar_linha(bytes(linha)))
+            total += 1
+        tamanho = f.tell()
+    if total != height:
+        os.remove(caminho)
+        raise ValueError(f"Recebidas {total} linhas, esperado {height}")
+    return tamanho
+
+def carregar_labirinto(caminho: str) -> Labirinto:
+    """
+    Lê um arquivo .lab inteiro para a grade compacta.
+    """
+    with open(caminho, 'rb') as f:
+        return desempacotar(f.read())
+
+class LabirintoMapeado:
+    """
+    Labirinto .lab aberto com mmap, consultado sem ler o arquivo inteiro.
+
+    Oferece a interface de consulta do Labirinto (width, height, apple_pos,
+    seed, algoritmo, eh_caminho, linha), o suficiente para jogar uma Partida
+    headless; as páginas do arquivo só são lidas pelo sistema operacional
+    quando uma célula delas é consultada. Para desenhar ou resolver, use
+    carregar().
+
+    Use como gerenciador de contexto ou chame close() ao terminar.
+    """
+
+    def __init__(self, caminho: str):
+        self._arquivo: BinaryIO = open(caminho, 'rb')
+        try:
+            self._mm = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            info = ler_cabecalho(self._mm[:CABECALHO.size])
+        except Exception:
+            self._arquivo.close()
+            raise
+        self.width = info['width']
+        self.height = info['height']
+        self.seed = info['seed']
+        self.apple_pos = info['apple_pos']
+        self.algoritmo = info['algoritmo']
+        self._passo = bytes_por_linha(self.width)
+        if len(self._mm) < CABECALHO.size + self._passo * self.height:
+            self.close()
+            raise FormatoInvalido("Grade incompleta")
+
+    def eh_caminho(self, row: int, col: int) -> bool:
+        """
+        Indica se a célula está dentro da grade e não é parede (lê um byte).
+        """
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return False
+        byte = self._mm[CABECALHO.size + row * self._passo + (col >> 3)]
+        return not (byte >> (7 - (col & 7))) & 1
+
+    def linha(self, row: int) -> bytes:
+        """
+        Retorna uma linha no formato da grade compacta (um byte por célula).
+        """
+        pos = CABECALHO.size + row * self._passo
+        return desempacotar_linha(self._mm[pos:pos + self._passo], self.width)
+
+    def carregar(self) -> Labirinto:
+        """
+        Lê a grade inteira para um Labirinto em memória.
+        """
+        grid = bytearray().join(self.linha(r) for r in range(self.height))
+        return Labirinto(self.width, self.height, grid, self.apple_pos, self.seed, self.algoritmo)
+
+    def close(self) -> None:
+        self._mm.close()
+        self._arquivo.close()
+
+    def __enter__(self) -> "LabirintoMapeado":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"LabirintoMapeado({self.width}x{self.height}, {self.algoritmo}, seed={self.seed})"
+
+def abrir_labirinto(caminho: str) -> LabirintoMapeado:
+    """
+    Abre um arquivo .lab com mmap (ver LabirintoMapeado).
+    """
+    return LabirintoMapeado(caminho)
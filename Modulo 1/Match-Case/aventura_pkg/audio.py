@@ -0,0 +1,314 @@
+"""
+Serviço de áudio do jogo.
+
+Criado uma vez na inicialização: resolve o caminho dos sons, escolhe a
+biblioteca de áudio disponível, decodifica os arquivos e deixa as amostras
+em cache. Uma única thread de reprodução, de vida longa, toca os sons
+pedidos, então uma vitória só enfileira um pedido: não há busca no disco,
+import nem decodificação no momento em que o jogador chega à maçã.
+
+O backend "nulo" não emite som (para rodar sem placa de áudio, em CI ou nos
+benchmarks) mas passa pelo mesmo caminho de carga e reprodução, então os
+tempos de inicialização e a latência até o som começar podem ser medidos.
+
+Uso:
+    iniciar_servico()                # em main.py, antes do menu
+    obter_servico().tocar("victory.wav")
+"""
+
+import os
+import queue
+import threading
+import time
+import wave
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional
+
+PASTA_PACOTE = os.path.dirname(os.path.abspath(__file__))
+PASTA_PROJETO = os.path.dirname(PASTA_PACOTE)
+
+SONS_PADRAO = ("victory.wav",)
+
+def resolver_caminho(path: str) -> Optional[str]:
+    """
+    Procura um arquivo de som na raiz do projeto, na pasta do pacote e na
+    pasta atual, nesta ordem.
+
+    Retorna:
+        str ou None: Caminho absoluto, ou None se o arquivo não existir.
+    """
+    if os.path.isabs(path):
+        candidatos = [path]
+    else:
+        candidatos = [os.path.join(PASTA_PROJETO, path), os.path.join(PASTA_PACOTE, path), path]
+    for candidato in candidatos:
+        if os.path.exists(candidato):
+            return os.path.abspath(candidato)
+    return None
+
+class Backend:
+    """
+    Interface das bibliotecas de áudio.
+
+    carregar() roda uma vez por arquivo, na inicialização; tocar() roda na
+    thread de reprodução e só retorna quando o som termina.
+    """
+
+    nome = "backend"
+
+    def carregar(self, caminho: str):
+        """
+        Decodifica o arquivo e devolve a amostra que tocar() recebe.
+        """
+        raise NotImplementedError
+
+    def tocar(self, amostra) -> None:
+        raise NotImplementedError
+
+    def fechar(self) -> None:
+        """
+        Libera o dispositivo de áudio.
+        """
+
+class BackendNulo(Backend):
+    """
+    Não emite som. Decodifica o WAV com o módulo wave (para a carga custar o
+    mesmo que em um backend real) e conta as reproduções.
+
+    Atributos:
+        tocados (int): Sons "tocados".
+    """
+
+    nome = "nulo"
+
+    def __init__(self):
+        self.tocados = 0
+
+    def carregar(self, caminho: str):
+        with wave.open(caminho, 'rb') as f:
+            return f.readframes(f.getnframes())
+
+    def tocar(self, amostra) -> None:
+        self.tocados += 1
+
+class BackendSimpleaudio(Backend):
+    nome = "simpleaudio"
+
+    def __init__(self):
+        import simpleaudio
+        self._sa = simpleaudio
+
+    def carregar(self, caminho: str):
+        return self._sa.WaveObject.from_wave_file(caminho)
+
+    def tocar(self, amostra) -> None:
+        amostra.play().wait_done()
+
+class BackendPygame(Backend):
+    """
+    Inicializa o mixer uma vez e guarda cada arquivo como um Sound já
+    decodificado (em vez de recarregar via mixer.music a cada vitória).
+    """
+
+    nome = "pygame"
+
+    def __init__(self):
+        import pygame
+        self._pygame = pygame
+        pygame.mixer.init()
+
+    def carregar(self, caminho: str):
+        return self._pygame.mixer.Sound(caminho)
+
+    def tocar(self, amostra) -> None:
+        canal = amostra.play()
+        while canal is not None and canal.get_busy():
+            time.sleep(0.05)
+
+    def fechar(self) -> None:
+        self._pygame.mixer.quit()
+
+class BackendPlaysound(Backend):
+    """
+    O playsound só toca a partir do caminho: não há o que pré-carregar.
+    """
+
+    nome = "playsound"
+
+    def __init__(self):
+        from playsound import playsound
+        self._playsound = playsound
+
+    def carregar(self, caminho: str):
+        return caminho
+
+    def tocar(self, amostra) -> None:
+        self._playsound(amostra)
+
+class BackendWinsound(Backend):
+    """
+    Guarda os bytes do WAV e toca da memória (apenas Windows).
+    """
+
+    nome = "winsound"
+
+    def __init__(self):
+        import winsound
+        self._winsound = winsound
+
+    def carregar(self, caminho: str):
+        with open(caminho, 'rb') as f:
+            return f.read()
+
+    def tocar(self, amostra) -> None:
+        self._winsound.PlaySound(amostra, self._winsound.SND_MEMORY)
+
+# Ordem de preferência na escolha automática
+BACKENDS: Dict[str, Callable[[], Backend]] = {
+    "simpleaudio": BackendSimpleaudio,
+    "pygame": BackendPygame,
+    "playsound": BackendPlaysound,
+    "winsound": BackendWinsound,
+    "nulo": BackendNulo,
+}
+
+def escolher_backend(nome: Optional[str] = None) -> Backend:
+    """
+    Cria o backend pedido ou, sem nome, o primeiro disponível.
+
+    Args:
+        nome (str, optional): Chave de BACKENDS.
+
+    Retorna:
+        Backend: O backend criado; o nulo se nenhuma biblioteca funcionar.
+
+    Raises:
+        ValueError: Se o nome não estiver em BACKENDS.
+    """
+    if nome is not None:
+        if nome not in BACKENDS:
+            raise ValueError(f"Backend de áudio desconhecido: {nome!r}")
+        return BACKENDS[nome]()
+    for chave, fabrica in BACKENDS.items():
+        if chave == "nulo":
+            continue
+        try:
+            return fabrica()
+        except ImportError:
+            if chave != "winsound":  # winsound só existe no Windows
+                print(f"⚠️ {chave} não instalado.")
+        except Exception as e:
+            print(f"⚠️ Erro ao iniciar o áudio com {chave}: {e}")
+    print("❌ Nenhuma biblioteca de áudio disponível para tocar o som.")
+    print("   Instale uma das seguintes: simpleaudio, pygame ou playsound")
+    return BackendNulo()
+
+class ServicoAudio:
+    """
+    Sons pré-carregados e uma thread de reprodução.
+
+    Atributos:
+        backend (Backend): Biblioteca de áudio escolhida.
+        amostras (Dict[str,object]): Amostras decodificadas, por caminho pedido.
+        latencias (deque): Segundos entre cada tocar() e o início do som.
+        segundos_inicio (float): Duração da inicialização (escolha do
+            backend e carga dos sons).
+    """
+
+    def __init__(self, sons: Iterable[str] = SONS_PADRAO, backend: Optional[str] = None):
+        """
+        Args:
+            sons (Iterable[str]): Arquivos a pré-carregar.
+            backend (str, optional): Chave de BACKENDS; padrão: o primeiro disponível.
+        """
+        inicio = time.perf_counter()
+        self.backend = escolher_backend(backend)
+        self.amostras: Dict[str, object] = {}
+        for path in sons:
+            self._carregar(path)
+        self.latencias = deque(maxlen=1000)
+        self._fila: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._reproduzir, name="audio", daemon=True)
+        self._thread.start()
+        self.segundos_inicio = time.perf_counter() - inicio
+
+    def _carregar(self, path: str):
+        # Carrega uma vez; um arquivo ausente ou inválido fica como None
+        # para o aviso não se repetir a cada vitória
+        if path in self.amostras:
+            return self.amostras[path]
+        amostra = None
+        caminho = resolver_caminho(path)
+        if caminho is None:
+            print(f"⚠️ Arquivo de som não encontrado: {path}")
+        else:
+            try:
+                amostra = self.backend.carregar(caminho)
+            except Exception as e:
+                print(f"⚠️ Erro ao carregar {caminho} com {self.backend.nome}: {e}")
+        self.amostras[path] = amostra
+        return amostra
+
+    def tocar(self, path: str = "victory.wav") -> None:
+        """
+        Pede a reprodução de um som e retorna na hora.
+
+        Sons não pré-carregados são carregados na thread de reprodução.
+        """
+        self._fila.put((path, time.perf_counter()))
+
+    def aguardar(self) -> None:
+        """
+        Bloqueia até a fila de sons esvaziar (útil em testes e benchmarks).
+        """
+        self._fila.join()
+
+    def _reproduzir(self) -> None:
+        while True:
+            pedido = self._fila.get()
+            try:
+                if pedido is None:
+                    return
+                path, pedido_em = pedido
+                amostra = self._carregar(path)
+                if amostra is not None:
+                    self.latencias.append(time.perf_counter() - pedido_em)
+                    try:
+                        self.backend.tocar(amostra)
+                    except Exception as e:
+                        print(f"⚠️ Erro ao tocar com {self.backend.nome}: {e}")
+            finally:
+                self._fila.task_done()
+
+    def fechar(self) -> None:
+        """
+        Encerra a thread de reprodução e libera o dispositivo.
+        """
+        if self._thread.is_alive():
+            self._fila.put(None)
+            self._thread.join(timeout=1.0)
+        self.backend.fechar()
+
+_servico: Optional[ServicoAudio] = None
+_servico_lock = threading.Lock()
+
+def iniciar_servico(backend: Optional[str] = None, sons: Iterable[str] = SONS_PADRAO) -> ServicoAudio:
+    """
+    Cria o serviço compartilhado (substituindo o anterior, se houver).
+    """
+    global _servico
+    with _servico_lock:
+        if _servico is not None:
+            _servico.fechar()
+        _servico = ServicoAudio(sons, backend)
+        return _servico
+
+def obter_servico() -> ServicoAudio:
+    """
+    Retorna o serviço compartilhado, criando-o na primeira chamada.
+    """
+    global _servico
+    with _servico_lock:
+        if _servico is None:
+            _servico = ServicoAudio()
+        return _servico
@@ -0,0 +1,322 @@
+"""
+Algoritmos de geração de labirintos.
+
+Todos trabalham sobre a grade compacta de bytes (PAREDE = 0, CAMINHO = 1,
+uma célula por byte, linha após linha) e geram labirintos perfeitos: existe
+exatamente um caminho entre quaisquer duas células. As células ficam nas
+posições ímpares (linha e coluna); as posições pares são paredes que podem
+ser abertas entre duas células vizinhas.
+
+Cada algoritmo é registrado em ALGORITMOS com a assinatura
+    gerador(width, height, rng) -> bytearray
+e é escolhido pelo nome em labirinto.gerar_labirinto_compacto().
+"""
+
+import itertools
+import random
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Valores das células na grade compacta
+PAREDE = 0
+CAMINHO = 1
+_BORDA = 2  # Moldura usada só durante a geração
+
+Gerador = Callable[[int, int, random.Random], bytearray]
+
+ALGORITMOS: Dict[str, Gerador] = {}
+
+def registrar_algoritmo(nome: str) -> Callable[[Gerador], Gerador]:
+    """
+    Decorador que registra um gerador em ALGORITMOS.
+
+    Args:
+        nome (str): Nome usado na linha de comando e no Labirinto.
+
+    Retorna:
+        Callable: O próprio gerador, sem alterações.
+    """
+    def decorador(func: Gerador) -> Gerador:
+        ALGORITMOS[nome] = func
+        return func
+    return decorador
+
+def _grade_com_borda(width: int, height: int) -> bytearray:
+    """
+    Cria a grade de trabalho: paredes cercadas por uma moldura de _BORDA.
+
+    A moldura faz os vizinhos a 2 células de distância das bordas caírem
+    em células já "ocupadas", então o laço de geração não precisa testar
+    limites.
+    """
+    wp = width + 2
+    g = bytearray(wp * (height + 2))
+    g[0:wp] = bytes([_BORDA]) * wp
+    g[(height + 1) * wp:] = bytes([_BORDA]) * wp
+    for r in range(1, height + 1):
+        g[r * wp] = g[r * wp + width + 1] = _BORDA
+    return g
+
+def _remove_borda(g: bytearray, width: int, height: int) -> bytearray:
+    wp = width + 2
+    grid = bytearray(width * height)
+    for r in range(height):
+        start = (r + 1) * wp + 1
+        grid[r * width:(r + 1) * width] = g[start:start + width]
+    return grid
+
+def _abrir_celulas(width: int, height: int) -> bytearray:
+    """
+    Grade sem moldura com todas as células abertas e todas as paredes fechadas.
+    """
+    linha = bytearray(width)
+    linha[1:width - 1:2] = bytes([CAMINHO]) * ((width - 1) // 2)
+    grid = bytearray(width * height)
+    for r in range(1, height - 1, 2):
+        grid[r * width:(r + 1) * width] = linha
+    return grid
+
+
+@registrar_algoritmo("backtracker")
+def gerar_backtracker(width: int, height: int, rng: random.Random) -> bytearray:
+    """
+    Recursive backtracker (DFS) iterativo.
+
+    A pilha é explícita, então o tamanho não é limitado pela recursão do
+    Python. As posições são índices no bytearray e os vizinhos são
+    deslocamentos fixos (±2 colunas, ±2 linhas); a ordem de visita vem de
+    uma das 24 permutações das direções, sorteada com bytes aleatórios
+    gerados em blocos. Produz corredores longos e poucas bifurcações.
+    """
+    wp = width + 2
+    g = _grade_com_borda(width, height)
+
+    # (deslocamento até o vizinho, deslocamento até a parede entre os dois)
+    perms = [tuple((d, d // 2) for d in p) for p in itertools.permutations((-2, 2, -2 * wp, 2 * wp))]
+    tabela = perms * 10  # 240 entradas: bytes >= 240 são descartados (sem viés)
+
+    cell = 2 * wp + 2  # Célula (1, 1) na grade com moldura
+    g[cell] = CAMINHO
+    stack = []
+    push, pop = stack.append, stack.pop
+
+    while True:
+        for b in rng.randbytes(65536):
+            if b >= 240:
+                continue
+            for d, h in tabela[b]:
+                n = cell + d
+                if not g[n]:
+                    g[cell + h] = CAMINHO
+                    g[n] = CAMINHO
+                    push(cell)
+                    cell = n
+                    break
+            else:
+                # Beco sem saída: volta pela pilha
+                if not stack:
+                    return _remove_borda(g, width, height)
+                cell = pop()
+
+
+@registrar_algoritmo("kruskal")
+def gerar_kruskal(width: int, height: int, rng: random.Random) -> bytearray:
+    """
+    Kruskal aleatório com union-find.
+
+    Todas as paredes entre células vizinhas são embaralhadas; cada uma é
+    aberta se as duas células ainda estiverem em conjuntos diferentes. O
+    union-find usa união por tamanho e compressão de caminho pela metade.
+    As paredes são codificadas como inteiros (célula * 2 + direção) para
+    não criar milhões de tuplas.
+    """
+    cw, ch = (width - 1) // 2, (height - 1) // 2
+    grid = _abrir_celulas(width, height)
+
+    paredes = [k * 2 for k in range(cw * ch) if k % cw != cw - 1]
+    paredes += [k * 2 + 1 for k in range((ch - 1) * cw)]
+    rng.shuffle(paredes)
+
+    pai = list(range(cw * ch))
+    tamanho = [1] * (cw * ch)
+    restantes = cw * ch - 1
+
+    for p in paredes:
+        a, baixo = p >> 1, p & 1
+        b = a + cw if baixo else a + 1
+        while pai[a] != a:
+            pai[a] = a = pai[pai[a]]
+        while pai[b] != b:
+            pai[b] = b = pai[pai[b]]
+        if a == b:
+            continue
+        if tamanho[a] < tamanho[b]:
+            a, b = b, a
+        pai[b] = a
+        tamanho[a] += tamanho[b]
+
+        i, j = divmod(p >> 1, cw)
+        pos = (2 * i + 1) * width + 2 * j + 1
+        grid[pos + width if baixo else pos + 1] = CAMINHO
+        restantes -= 1
+        if not restantes:
+            break
+    return grid
+
+
+@registrar_algoritmo("prim")
+def gerar_prim(width: int, height: int, rng: random.Random) -> bytearray:
+    """
+    Prim aleatório.
+
+    Mantém a fronteira de paredes que saem da área já gerada e abre uma
+    delas, sorteada, a cada passo (remoção em O(1) trocando com a última).
+    Produz muitos becos curtos e bifurcações perto do início.
+    """
+    wp = width + 2
+    g = _grade_com_borda(width, height)
+    desl = (2, -2, 2 * wp, -2 * wp)
+
+    cell = (2 * rng.randrange((height - 1) // 2) + 2) * wp + 2 * rng.randrange((width - 1) // 2) + 2
+    g[cell] = CAMINHO
+    # Cada item da fronteira é célula * 4 + direção
+    fronteira = [cell * 4 + k for k in range(4)]
+    randbelow = rng.randrange
+
+    while fronteira:
+        i = randbelow(len(fronteira))
+        item = fronteira[i]
+        fronteira[i] = fronteira[-1]
+        fronteira.pop()
+
+        cell, k = item >> 2, item & 3
+        n = cell + desl[k]
+        if g[n]:
+            continue
+        g[cell + desl[k] // 2] = CAMINHO
+        g[n] = CAMINHO
+        n4 = n * 4
+        fronteira.extend((n4, n4 + 1, n4 + 2, n4 + 3))
+    return _remove_borda(g, width, height)
+
+
+@registrar_algoritmo("wilson")
+def gerar_wilson(width: int, height: int, rng: random.Random) -> bytearray:
+    """
+    Algoritmo de Wilson (passeios aleatórios com remoção de laços).
+
+    A partir de cada célula ainda fora do labirinto, faz um passeio
+    aleatório até encontrar o labirinto, guardando só a última direção
+    tomada em cada célula (o que apaga os laços); depois refaz o caminho
+    pelas direções guardadas abrindo as paredes. Gera uma árvore geradora
+    uniforme, sem o viés dos outros algoritmos, mas os primeiros passeios
+    são longos e a geração é mais lenta.
+    """
+    wp = width + 2
+    g = _grade_com_borda(width, height)
+    desl = (2, -2, 2 * wp, -2 * wp)
+    direcoes = bytearray(len(g))
+    bits = rng.getrandbits
+
+    cw, ch = (width - 1) // 2, (height - 1) // 2
+    g[(2 * rng.randrange(ch) + 2) * wp + 2 * rng.randrange(cw) + 2] = CAMINHO
+
+    for r in range(2, height + 1, 2):
+        for inicio in range(r * wp + 2, r * wp + width + 1, 2):
+            if g[inicio]:
+                continue
+            cell = inicio
+            while not g[cell]:
+                k = bits(2)
+                while g[cell + desl[k]] == _BORDA:
+                    k = bits(2)
+                direcoes[cell] = k
+                cell += desl[k]
+
+            cell = inicio
+            while not g[cell]:
+                d = desl[direcoes[cell]]
+                g[cell] = CAMINHO
+                g[cell + d // 2] = CAMINHO
+                cell += d
+    return _remove_borda(g, width, height)
+
+
+def _linhas_eller(width: int, height: int, rng: random.Random) -> Iterator[bytearray]:
+    """
+    Algoritmo de Eller: gera o labirinto linha a linha.
+
+    Só a linha de células atual é mantida, com o conjunto de cada célula.
+    Em cada linha células vizinhas de conjuntos diferentes são unidas ao
+    acaso, e cada conjunto desce pelo menos uma vez para a linha seguinte;
+    na última linha todos os conjuntos restantes são unidos. A memória é
+    O(width), independente da altura.
+
+    Retorna:
+        Iterator[bytearray]: As height linhas da grade, de cima para baixo.
+    """
+    cw, ch = (width - 1) // 2, (height - 1) // 2
+    yield bytearray(width)  # Parede de cima
+
+    # Identificadores: células que desceram herdam a menor coluna do seu
+    # conjunto (0..cw-1); as novas recebem cw + coluna. Nunca passam de 2*cw.
+    conjuntos = list(range(cw))
+    for i in range(ch):
+        ultima = i == ch - 1
+        pai = list(range(2 * cw))
+
+        def raiz(c):
+            while pai[c] != c:
+                pai[c] = c = pai[pai[c]]
+            return c
+
+        linha = bytearray(width)
+        linha[1:width - 1:2] = bytes([CAMINHO]) * cw
+        for j in range(cw - 1):
+            a, b = raiz(conjuntos[j]), raiz(conjuntos[j + 1])
+            if a != b and (ultima or rng.getrandbits(1)):
+                pai[b] = a
+                linha[2 * j + 2] = CAMINHO
+        yield linha
+
+        baixo = bytearray(width)
+        if ultima:
+            yield baixo  # Parede de baixo
+            return
+
+        # Cada conjunto desce por pelo menos uma de suas células
+        grupos: Dict[int, List[int]] = {}
+        for j in range(cw):
+            grupos.setdefault(raiz(conjuntos[j]), []).append(j)
+        conjuntos = [cw + j for j in range(cw)]
+        for colunas in grupos.values():
+            descem = [j for j in colunas if rng.getrandbits(1)]
+            if not descem:
+                descem = [colunas[rng.randrange(len(colunas))]]
+            for j in descem:
+                conjuntos[j] = colunas[0]
+                baixo[2 * j + 1] = CAMINHO
+        yield baixo
+
+def gerar_linhas_eller(width: int, height: int, seed: Optional[int] = None) -> Iterator[bytearray]:
+    """
+    Gera um labirinto com o algoritmo de Eller, entregando uma linha por vez.
+
+    Útil para labirintos enormes que são gravados ou processados em fluxo:
+    a memória usada é proporcional à largura, não à área.
+
+    Args:
+        width (int): Número de colunas (ímpar).
+        height (int): Número de linhas (ímpar).
+        seed (int, optional): Semente; a mesma semente gera o mesmo labirinto.
+
+    Retorna:
+        Iterator[bytearray]: Linhas da grade (PAREDE = 0, CAMINHO = 1).
+    """
+    return _linhas_eller(width, height, random.Random(seed))
+
+@registrar_algoritmo("eller")
+def gerar_eller(width: int, height: int, rng: random.Random) -> bytearray:
+    """
+    Algoritmo de Eller com a grade inteira em memória (ver gerar_linhas_eller).
+    """
+    return bytearray().join(_linhas_eller(width, height, rng))
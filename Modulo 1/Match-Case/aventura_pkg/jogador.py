@@ -1,32 +1,138 @@
 import tkinter as tk
 from tkinter import messagebox
-from typing import List, Tuple
-from aventura_pkg import utils, labirinto
+from typing import List, Tuple, Union
+from collections import OrderedDict, deque
+from aventura_pkg import utils, labirinto, resolvedor
+from aventura_pkg.motor import Partida
+from aventura_pkg.replay import GravadorReplay
 import time
 CELL_SIZE = 18  # base pixels per cell; will scale if needed
+TILE_CELLS = 16  # Células por lado de cada bloco do cache de imagens
+HINT_STEPS = 12  # Células destacadas por dica
+
+# Cores das células na imagem do labirinto
+COR_PAREDE = "#222222"
+COR_CAMINHO = "#f5f5f5"
+COR_MACA = "#a8e6a1"
+COR_DICA = "#ffb347"
+_CORES = (COR_PAREDE, COR_CAMINHO)  # Indexadas pelo valor do byte da grade
+
+def imagem_regiao(maze: labirinto.Labirinto, r0: int, c0: int, r1: int, c1: int,
+                  cell_size: int) -> tk.PhotoImage:
+    """
+    Renderiza as células [r0, r1) x [c0, c1) do labirinto em uma imagem.
+
+    A imagem é montada com um pixel por célula (um único put() com todas as
+    linhas, lidas direto da grade de bytes) e depois ampliada com zoom(),
+    ambos executados pelo Tk.
+
+    Args:
+        maze (Labirinto): Labirinto em grade compacta.
+        r0, c0 (int): Primeira linha e coluna da região.
+        r1, c1 (int): Limites (exclusivos) da região.
+        cell_size (int): Tamanho da célula em pixels.
+
+    Retorna:
+        tk.PhotoImage: Imagem com (c1-c0) * cell_size x (r1-r0) * cell_size pixels.
+    """
+    pixels = tk.PhotoImage(width=c1 - c0, height=r1 - r0)
+    grid, w = maze.grid, maze.width
+    dados = ' '.join(
+        '{' + ' '.join([_CORES[b] for b in grid[r * w + c0:r * w + c1]]) + '}'
+        for r in range(r0, r1)
+    )
+    pixels.put(dados, to=(0, 0))
+    ar, ac = maze.apple_pos
+    if r0 <= ar < r1 and c0 <= ac < c1:
+        pixels.put(COR_MACA, to=(ac - c0, ar - r0))
+    return pixels.zoom(cell_size) if cell_size > 1 else pixels
+
+class TileCache:
+    """
+    Cache LRU das imagens dos blocos do labirinto.
+
+    Cada bloco cobre TILE_CELLS x TILE_CELLS células e só é renderizado na
+    primeira vez que aparece na tela. A capacidade é proporcional ao número
+    de blocos visíveis, então a memória depende do tamanho da janela, não do
+    labirinto.
+
+    Atributos:
+        maze (Labirinto): Labirinto renderizado.
+        cell_size (int): Tamanho da célula em pixels.
+        capacidade (int): Máximo de blocos guardados.
+    """
+
+    def __init__(self, maze: labirinto.Labirinto, cell_size: int, capacidade: int):
+        self.maze = maze
+        self.cell_size = cell_size
+        self.capacidade = capacidade
+        self._blocos = OrderedDict()
+        self.renderizados = 0
+
+    def get(self, tr: int, tc: int) -> tk.PhotoImage:
+        """
+        Retorna a imagem do bloco (linha tr, coluna tc), renderizando se preciso.
+        """
+        chave = (tr, tc)
+        imagem = self._blocos.get(chave)
+        if imagem is not None:
+            self._blocos.move_to_end(chave)
+            return imagem
+        r0, c0 = tr * TILE_CELLS, tc * TILE_CELLS
+        imagem = imagem_regiao(
+            self.maze, r0, c0,
+            min(r0 + TILE_CELLS, self.maze.height), min(c0 + TILE_CELLS, self.maze.width),
+            self.cell_size
+        )
+        self.renderizados += 1
+        self._blocos[chave] = imagem
+        # Blocos ainda na tela continuam vivos pela referência do GameWindow
+        while len(self._blocos) > self.capacidade:
+            self._blocos.popitem(last=False)
+        return imagem
+
+    def __len__(self) -> int:
+        return len(self._blocos)
 
 class GameWindow:
     """
-    Classe responsável pela janela principal do jogo e toda a lógica de renderização
-    e interação com o jogador.
+    Classe responsável pela janela principal do jogo: renderização e
+    teclado. As regras (movimento, paredes, vitória) ficam na Partida
+    (ver motor.py), que também roda sem interface gráfica.
     """
     
-    def __init__(self, root, lab: List[List[str]], apple_pos: Tuple[int,int], 
-                 victory_sound="victory.wav", player_color="#40a9ff"):
+    def __init__(self, root, lab: Union[List[List[str]], labirinto.Labirinto], apple_pos: Tuple[int,int], 
+                 victory_sound="victory.wav", player_color="#40a9ff", medir_quadros=False,
+                 replay_path=None, placar=None, jogador="Você"):
         """
         Inicializa a janela do jogo com o labirinto e configurações.
         
         Args:
             root (tk.Tk): Janela raiz do Tkinter.
-            lab (List[List[str]]): Matriz representando o labirinto.
+            lab (List[List[str]] ou Labirinto): Matriz do labirinto ou a grade
+                compacta (recomendada para labirintos grandes).
             apple_pos (Tuple[int,int]): Posição (linha, coluna) da maçã.
             victory_sound (str): Caminho para o arquivo de som de vitória.
             player_color (str): Código hexadecimal da cor da bolinha do jogador.
+            medir_quadros (bool): Mostra o tempo de cada quadro na barra de status
+                e um resumo no terminal ao final da partida.
+            replay_path (str, optional): Arquivo .rep onde a partida é gravada
+                ao vencer ou sair (ver replay.py).
+            placar (Placar, optional): Placar onde a vitória é registrada.
+            jogador (str): Nome do jogador no placar e na tela de vitória.
         """
-        self.lab = lab
-        self.apple_pos = apple_pos
-        self.rows = len(lab)
-        self.cols = len(lab[0])
+        if isinstance(lab, labirinto.Labirinto):
+            self.maze = lab
+        else:
+            self.maze = labirinto.Labirinto.de_lista(lab, apple_pos)
+        self.apple_pos = tuple(apple_pos)
+        self.partida = Partida(self.maze)
+        self.gravador = GravadorReplay(self.maze)
+        self.replay_path = replay_path
+        self.placar = placar
+        self.jogador = jogador
+        self.rows = self.maze.height
+        self.cols = self.maze.width
         self.root = root
         self.player_color = player_color  # Armazena a cor personalizada
         
@@ -35,7 +141,6 @@ class GameWindow:
         
         # Calcula dimensões do canvas
         canvas_width = self.cols * CELL_SIZE
-        canvas_height = self.rows * CELL_SIZE
         screen_w = self.window.winfo_screenwidth()
         screen_h = self.window.winfo_screenheight()
         
@@ -45,34 +150,45 @@ class GameWindow:
         else:
             scale = 1.0
         self.cell_size = max(8, int(CELL_SIZE * scale))
-        canvas_width = self.cols * self.cell_size
-        canvas_height = self.rows * self.cell_size
+        self.world_w = self.cols * self.cell_size
+        self.world_h = self.rows * self.cell_size
 
-        self.canvas = tk.Canvas(self.window, width=canvas_width, height=canvas_height, bg="black")
+        # Viewport: o canvas nunca passa do tamanho da tela; se o labirinto
+        # for maior, a câmera acompanha o jogador
+        self.view_w = min(self.world_w, screen_w - 120)
+        self.view_h = min(self.world_h, screen_h - 160)
+        self.canvas = tk.Canvas(
+            self.window, width=self.view_w, height=self.view_h, bg=COR_PAREDE,
+            highlightthickness=0, borderwidth=0,
+            scrollregion=(0, 0, self.world_w, self.world_h)
+        )
         self.canvas.pack()
 
+        # Blocos na tela: (linha, coluna) -> (item do canvas, imagem)
+        tile_px = TILE_CELLS * self.cell_size
+        visiveis = (self.view_w // tile_px + 2) * (self.view_h // tile_px + 2)
+        self.tiles = TileCache(self.maze, self.cell_size, capacidade=2 * visiveis)
+        self._tile_items = {}
+        self._faixa = None
+
         # Frame de status (tempo e movimentos)
         self.status = tk.Frame(self.window)
         self.status.pack(fill='x')
-        self.moves = 0
-        self.start_time = time.time()
         self.time_label = tk.Label(self.status, text="Tempo: 0.0s")
         self.moves_label = tk.Label(self.status, text="Movimentos: 0")
         self.time_label.pack(side='left', padx=10, pady=4)
         self.moves_label.pack(side='right', padx=10, pady=4)
 
-        # Posição inicial do jogador
-        self.player = [1, 1]
-        if self.lab[self.player[0]][self.player[1]] == '#':
-            # Procura primeiro espaço vazio se posição inicial estiver bloqueada
-            for r in range(self.rows):
-                for c in range(self.cols):
-                    if self.lab[r][c] == ' ':
-                        self.player = [r, c]
-                        break
-                else:
-                    continue
-                break
+        # Tempo de quadro (ms) dos últimos movimentos
+        self.medir_quadros = medir_quadros
+        self.frame_times = deque(maxlen=1000)
+        self.frame_label = tk.Label(self.status, text="Quadro: -")
+        if medir_quadros:
+            self.frame_label.pack(side='right', padx=10, pady=4)
+
+        # Distâncias até a maçã: calculadas uma vez, na primeira dica ou na vitória
+        self._distancias = None
+        self.hints = 0
 
         self.victory_sound = victory_sound
         self.draw_labirinto()
@@ -81,59 +197,162 @@ class GameWindow:
         self._running = True
         self.update_timer()
 
+    @property
+    def player(self):
+        """
+        Posição atual do jogador (linha, coluna).
+        """
+        return self.partida.posicao
+
+    @property
+    def moves(self):
+        return self.partida.movimentos
+
     def draw_labirinto(self):
         """
-        Renderiza o labirinto completo no canvas, incluindo paredes, espaços vazios,
-        a maçã e o jogador com sua cor personalizada.
+        Cria os itens fixos (maçã e jogador) e posiciona a câmera.
+
+        O labirinto em si é desenhado por blocos (ver _mostrar_blocos): só os
+        blocos que aparecem no viewport viram itens do canvas, e cada
+        movimento apenas reposiciona o jogador e, se preciso, a câmera.
         """
         self.canvas.delete("all")
-        
-        # Desenha todas as células do labirinto
-        for r in range(self.rows):
-            for c in range(self.cols):
-                x0 = c * self.cell_size
-                y0 = r * self.cell_size
-                x1 = x0 + self.cell_size
-                y1 = y0 + self.cell_size
-                val = self.lab[r][c]
-                
-                if val == '#':
-                    # Parede
-                    self.canvas.create_rectangle(x0, y0, x1, y1, fill="#222222", outline="#111111")
-                elif val == ' ':
-                    # Espaço vazio
-                    self.canvas.create_rectangle(x0, y0, x1, y1, fill="#f5f5f5", outline="#e0e0e0")
-                elif val == '🍎':
-                    # Maçã (objetivo)
-                    self.canvas.create_rectangle(x0, y0, x1, y1, fill="#a8e6a1", outline="#79c06a")
-                    try:
-                        self.canvas.create_text(
-                            x0 + self.cell_size/2, 
-                            y0 + self.cell_size/2, 
-                            text='🍎', 
-                            font=("Segoe UI Emoji", int(self.cell_size*0.8))
-                        )
-                    except Exception:
-                        # Fallback se emoji não funcionar
-                        self.canvas.create_oval(x0+4, y0+4, x1-4, y1-4, fill="red")
-        
+        self._tile_items = {}
+        self._faixa = None
+
+        # Maçã (objetivo)
+        ar, ac = self.apple_pos
+        x0 = ac * self.cell_size
+        y0 = ar * self.cell_size
+        try:
+            self.canvas.create_text(
+                x0 + self.cell_size/2,
+                y0 + self.cell_size/2,
+                text='🍎',
+                font=("Segoe UI Emoji", int(self.cell_size*0.8)),
+                tags="apple"
+            )
+        except Exception:
+            # Fallback se emoji não funcionar
+            self.canvas.create_oval(x0+4, y0+4, x0+self.cell_size-4, y0+self.cell_size-4,
+                                    fill="red", tags="apple")
+
         # Desenha o jogador (bolinha) com a cor personalizada
-        pr, pc = self.player
-        x0 = pc * self.cell_size
-        y0 = pr * self.cell_size
-        x1 = x0 + self.cell_size
-        y1 = y0 + self.cell_size
-        
-        # Calcula cor de borda mais escura
         outline_color = self._darken_color(self.player_color)
-        
         self.canvas.create_oval(
-            x0+3, y0+3, x1-3, y1-3, 
-            fill=self.player_color, 
-            outline=outline_color, 
+            0, 0, 0, 0,
+            fill=self.player_color,
+            outline=outline_color,
             width=2,
             tags="player"
         )
+        self._posicionar_jogador()
+
+    def _posicionar_jogador(self):
+        """
+        Move o item do jogador para a célula atual com canvas.coords e
+        centraliza a câmera nele.
+        """
+        pr, pc = self.player
+        x0 = pc * self.cell_size
+        y0 = pr * self.cell_size
+        self.canvas.coords("player", x0+3, y0+3, x0+self.cell_size-3, y0+self.cell_size-3)
+        self._mover_camera(x0 + self.cell_size/2 - self.view_w/2, y0 + self.cell_size/2 - self.view_h/2)
+
+    def _mover_camera(self, vx, vy):
+        """
+        Rola o canvas até o canto (vx, vy), limitado às bordas do labirinto.
+        """
+        vx = min(max(0, vx), self.world_w - self.view_w)
+        vy = min(max(0, vy), self.world_h - self.view_h)
+        self.canvas.xview_moveto(vx / self.world_w)
+        self.canvas.yview_moveto(vy / self.world_h)
+        self._mostrar_blocos(vx, vy)
+
+    def _mostrar_blocos(self, vx, vy):
+        """
+        Mantém no canvas só os blocos que cruzam o viewport.
+
+        Blocos que saíram da tela são removidos do canvas (a imagem continua
+        no TileCache); os que entraram são buscados no cache, que os
+        renderiza na primeira vez.
+        """
+        tile_px = TILE_CELLS * self.cell_size
+        faixa = (int(vy // tile_px), int((vy + self.view_h - 1) // tile_px),
+                 int(vx // tile_px), int((vx + self.view_w - 1) // tile_px))
+        if faixa == self._faixa:
+            return
+        self._faixa = faixa
+        tr0, tr1, tc0, tc1 = faixa
+        visiveis = {(tr, tc) for tr in range(tr0, tr1 + 1) for tc in range(tc0, tc1 + 1)}
+
+        for chave in list(self._tile_items):
+            if chave not in visiveis:
+                item, _ = self._tile_items.pop(chave)
+                self.canvas.delete(item)
+        for chave in visiveis:
+            if chave not in self._tile_items:
+                imagem = self.tiles.get(*chave)
+                item = self.canvas.create_image(chave[1] * tile_px, chave[0] * tile_px,
+                                                image=imagem, anchor='nw', tags="maze")
+                self._tile_items[chave] = (item, imagem)
+        self.canvas.tag_lower("maze")
+
+    def distancias(self):
+        """
+        Mapa de distâncias até a maçã (ver resolvedor.mapa_distancias).
+
+        É calculado uma única vez por labirinto; depois cada dica e a
+        contagem de movimentos ótimos são consultas O(1).
+        """
+        if self._distancias is None:
+            self._distancias = resolvedor.mapa_distancias(self.maze, self.apple_pos)
+        return self._distancias
+
+    def mostrar_dica(self):
+        """
+        Destaca as próximas HINT_STEPS células do caminho mais curto até a maçã.
+        """
+        self.canvas.delete("hint")
+        passos = resolvedor.proximos_passos(self.maze, self.distancias(), self.player, HINT_STEPS)
+        margem = self.cell_size * 0.3
+        for r, c in passos:
+            x0 = c * self.cell_size
+            y0 = r * self.cell_size
+            self.canvas.create_oval(x0+margem, y0+margem, x0+self.cell_size-margem, y0+self.cell_size-margem,
+                                    fill=COR_DICA, outline="", tags="hint")
+        self.canvas.tag_raise("player")
+        self.hints += 1
+
+    def optimal_moves(self):
+        """
+        Menor número de movimentos da posição inicial até a maçã.
+        """
+        return resolvedor.distancia(self.maze, self.distancias(), self.partida.inicio)
+
+    def frame_stats(self):
+        """
+        Resume os tempos de quadro registrados nos movimentos.
+
+        Retorna:
+            dict: quadros, media_ms, p95_ms e max_ms (vazio se não houve movimentos).
+        """
+        if not self.frame_times:
+            return {}
+        tempos = sorted(self.frame_times)
+        return {
+            'quadros': len(tempos),
+            'media_ms': sum(tempos) / len(tempos),
+            'p95_ms': tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))],
+            'max_ms': tempos[-1],
+        }
+
+    def _imprimir_quadros(self):
+        stats = self.frame_stats()
+        if self.medir_quadros and stats:
+            print(f"📊 Quadros ({self.rows}x{self.cols}): {stats['quadros']} movimentos, "
+                  f"média {stats['media_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, "
+                  f"máx {stats['max_ms']:.2f} ms")
 
     def _darken_color(self, hex_color):
         """
@@ -165,7 +384,7 @@ class GameWindow:
         """
         if not self._running:
             return
-        elapsed = time.time() - self.start_time
+        elapsed = self.partida.tempo()
         self.time_label.config(text=f"Tempo: {elapsed:.1f}s")
         self.window.after(100, self.update_timer)
 
@@ -178,41 +397,101 @@ class GameWindow:
         """
         key = event.keysym.lower()
         
-        # Mapeia teclas para direções de movimento
+        # Mapeia teclas para ações
         move_map = {
-            'w': (-1, 0), 'up': (-1, 0),      # Cima
-            's': (1, 0), 'down': (1, 0),       # Baixo
-            'a': (0, -1), 'left': (0, -1),     # Esquerda
-            'd': (0, 1), 'right': (0, 1),      # Direita
-            'q': 'quit'                         # Sair
+            'w': 'cima', 'up': 'cima',
+            's': 'baixo', 'down': 'baixo',
+            'a': 'esquerda', 'left': 'esquerda',
+            'd': 'direita', 'right': 'direita',
+            'h': 'dica',
         }
         
-        if key not in move_map:
-            return
-        
-        delta = move_map[key]
+        if key == 'q':
+            self.sair()
+        elif key in move_map:
+            self.executar(move_map[key])
+
+    def executar(self, acao):
+        """
+        Aplica uma ação do jogador (vinda do teclado ou de um replay).
         
-        # Comando de sair
-        if delta == 'quit':
-            self._running = False
-            self.window.destroy()
+        Args:
+            acao (str): 'cima', 'baixo', 'esquerda', 'direita' ou 'dica'.
+        """
+        if not self._running:
             return
+        if self.gravador is not None:
+            self.gravador.registrar(acao)
         
-        # Calcula nova posição
-        dr, dc = delta
-        nr = self.player[0] + dr
-        nc = self.player[1] + dc
+        if acao == 'dica':
+            self.mostrar_dica()
+            return
         
-        # Verifica se movimento é válido (dentro dos limites e não é parede)
-        if 0 <= nr < self.rows and 0 <= nc < self.cols and self.lab[nr][nc] != '#':
-            self.player = [nr, nc]
-            self.moves += 1
+        # A Partida valida o movimento (paredes, limites e fim de jogo)
+        inicio = time.perf_counter()
+        if self.partida.passo(acao):
             self.moves_label.config(text=f"Movimentos: {self.moves}")
-            self.draw_labirinto()
+            self.canvas.delete("hint")
+            self._posicionar_jogador()
+            # Inclui o redesenho do Tk na medida do quadro
+            self.canvas.update_idletasks()
+            quadro_ms = (time.perf_counter() - inicio) * 1000
+            self.frame_times.append(quadro_ms)
+            if self.medir_quadros:
+                self.frame_label.config(text=f"Quadro: {quadro_ms:.2f} ms")
             
             # Verifica se chegou na maçã (vitória)
-            if (nr, nc) == self.apple_pos:
-                elapsed = time.time() - self.start_time
+            if self.partida.venceu:
                 self._running = False
+                self._imprimir_quadros()
+                self._salvar_replay()
                 utils.play_victory_sound(self.victory_sound)
-                utils.tela_vitoria_gui(self.window, winner="Você", time_seconds=elapsed, moves=self.moves)
\ No newline at end of file
+                otimo = self.optimal_moves()
+                posicao = self._registrar_placar(otimo)
+                utils.tela_vitoria_gui(self.window, winner=self.jogador, time_seconds=self.partida.tempo(),
+                                       moves=self.moves, optimal_moves=otimo, posicao=posicao)
+
+    def sair(self):
+        """
+        Encerra a partida (tecla Q), gravando o replay se configurado.
+        """
+        if self._running:
+            self._running = False
+            self._imprimir_quadros()
+            self._salvar_replay()
+        self.window.destroy()
+
+    def _salvar_replay(self):
+        if self.replay_path and self.gravador is not None:
+            tamanho = self.gravador.salvar(self.replay_path, self.partida)
+            print(f"💾 Replay salvo em {self.replay_path} ({tamanho} bytes)")
+
+    def _registrar_placar(self, otimo):
+        """
+        Registra a vitória no placar, se houver um.
+        
+        Retorna:
+            int ou None: Posição do tempo no ranking deste labirinto.
+        """
+        if self.placar is None:
+            return None
+        maze, segundos = self.maze, self.partida.tempo()
+        self.placar.registrar(maze.seed, maze.algoritmo, maze.width, self.jogador, segundos, self.moves, otimo)
+        return self.placar.posicao(maze.seed, maze.algoritmo, maze.width, segundos)
+
+    def reproduzir_replay(self, replay, velocidade=1.0):
+        """
+        Refaz na janela as ações de um replay, nos intervalos gravados.
+        
+        O teclado fica desativado (exceto Q) e nada é gravado, nem no placar.
+        
+        Args:
+            replay (Replay): Replay carregado (o labirinto precisa ser o desta janela).
+            velocidade (float): Multiplicador da velocidade de reprodução.
+        """
+        self.gravador = None
+        self.placar = None
+        self.window.unbind("<Key>")
+        self.window.bind("<Key>", lambda event: event.keysym.lower() == 'q' and self.sair())
+        for ms, acao in replay.eventos:
+            self.window.after(int(ms / velocidade), lambda acao=acao: self.executar(acao))
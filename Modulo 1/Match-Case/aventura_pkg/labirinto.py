@@ -1,32 +1,147 @@
 import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-def gerar_labirinto(width:int=31, height:int=31) -> Tuple[List[List[str]], Tuple[int,int]]:
+from aventura_pkg.geradores import ALGORITMOS, CAMINHO, PAREDE
+
+# Conversão de bytes da grade para os caracteres usados pelo GameWindow
+_PARA_TEXTO = bytes.maketrans(bytes([PAREDE, CAMINHO]), b'# ')
+
+class Labirinto:
     """
-    Gera um labirinto usando recursive backtracker (DFS).
-    Retorna a matriz do labirinto e a posição da maçã (row, col).
+    Labirinto armazenado em uma grade compacta de bytes.
+
+    Cada célula ocupa um byte em um único bytearray, linha após linha
+    (PAREDE = 0, CAMINHO = 1). Um labirinto 2001x2001 ocupa cerca de 4 MB,
+    contra centenas de MB da lista de listas de strings.
+
+    Atributos:
+        width (int): Número de colunas (ímpar).
+        height (int): Número de linhas (ímpar).
+        grid (bytearray): Células, na posição row * width + col.
+        apple_pos (Tuple[int,int]): Posição (linha, coluna) da maçã.
+        seed (int): Semente que reproduz este labirinto (None se desconhecida).
+        algoritmo (str): Nome do algoritmo de geração.
     """
+
+    __slots__ = ('width', 'height', 'grid', 'apple_pos', 'seed', 'algoritmo')
+
+    def __init__(self, width: int, height: int, grid: bytearray, apple_pos: Tuple[int,int],
+                 seed: Optional[int], algoritmo: str = "backtracker"):
+        self.width = width
+        self.height = height
+        self.grid = grid
+        self.apple_pos = apple_pos
+        self.seed = seed
+        self.algoritmo = algoritmo
+
+    @classmethod
+    def de_lista(cls, lab: List[List[str]], apple_pos: Tuple[int,int]) -> "Labirinto":
+        """
+        Converte o formato antigo (lista de listas de '#', ' ', '🍎').
+
+        Args:
+            lab (List[List[str]]): Matriz do labirinto.
+            apple_pos (Tuple[int,int]): Posição (linha, coluna) da maçã.
+
+        Retorna:
+            Labirinto: Grade compacta, sem semente conhecida.
+        """
+        grid = bytearray(
+            PAREDE if v == '#' else CAMINHO
+            for linha in lab for v in linha
+        )
+        return cls(len(lab[0]), len(lab), grid, tuple(apple_pos), None, "lista")
+
+    def eh_caminho(self, row: int, col: int) -> bool:
+        """
+        Indica se a célula está dentro da grade e não é parede.
+        """
+        return 0 <= row < self.height and 0 <= col < self.width and \
+            self.grid[row * self.width + col] == CAMINHO
+
+    def linha(self, row: int) -> bytes:
+        """
+        Retorna uma cópia dos bytes de uma linha.
+        """
+        start = row * self.width
+        return bytes(self.grid[start:start + self.width])
+
+    def como_lista(self) -> List[List[str]]:
+        """
+        Converte para o formato antigo: lista de listas com '#', ' ' e '🍎'.
+
+        Retorna:
+            List[List[str]]: Matriz usada pelo GameWindow.
+        """
+        lab = [
+            list(self.linha(r).translate(_PARA_TEXTO).decode('ascii'))
+            for r in range(self.height)
+        ]
+        apple_r, apple_c = self.apple_pos
+        lab[apple_r][apple_c] = '🍎'
+        return lab
+
+    def __repr__(self) -> str:
+        return f"Labirinto({self.width}x{self.height}, {self.algoritmo}, seed={self.seed})"
+
+
+def _nova_semente() -> int:
+    return random.randrange(2**32)
+
+def _escolher_maca(grid: bytearray, width: int, height: int, rng: random.Random) -> Tuple[int,int]:
+    """
+    Sorteia uma célula de caminho para a maçã (diferente do início em (1,1)).
+    """
+    if grid.count(CAMINHO) < 2:
+        return 1, 1
+    while True:
+        r = rng.randrange(1, height - 1)
+        c = rng.randrange(1, width - 1)
+        if grid[r * width + c] == CAMINHO and (r, c) != (1, 1):
+            return r, c
+
+def gerar_labirinto_compacto(width: int = 31, height: int = 31, seed: Optional[int] = None,
+                             algoritmo: str = "backtracker") -> Labirinto:
+    """
+    Gera um labirinto na grade compacta com o algoritmo escolhido.
+
+    Args:
+        width (int): Número de colunas (arredondado para ímpar).
+        height (int): Número de linhas (arredondado para ímpar).
+        seed (int, optional): Semente; a mesma semente e o mesmo algoritmo
+            geram o mesmo labirinto.
+        algoritmo (str): Nome registrado em geradores.ALGORITMOS
+            (backtracker, kruskal, prim, eller, wilson).
+
+    Retorna:
+        Labirinto: Grade compacta com a posição da maçã e a semente usada.
+
+    Raises:
+        ValueError: Se o algoritmo não estiver registrado.
+    """
+    gerador = ALGORITMOS.get(algoritmo)
+    if gerador is None:
+        raise ValueError(f"Algoritmo desconhecido: {algoritmo!r} (use {', '.join(ALGORITMOS)})")
     if width % 2 == 0:
         width += 1
     if height % 2 == 0:
         height += 1
+    if seed is None:
+        seed = _nova_semente()
 
-    lab = [['#' for _ in range(width)] for __ in range(height)]
-
-    def carve(x, y):
-        lab[y][x] = ' '
-        dirs = [(2,0),(-2,0),(0,2),(0,-2)]
-        random.shuffle(dirs)
-        for dx, dy in dirs:
-            nx, ny = x + dx, y + dy
-            if 1 <= nx < width-1 and 1 <= ny < height-1 and lab[ny][nx] == '#':
-                lab[y + dy//2][x + dx//2] = ' '
-                carve(nx, ny)
-
-    carve(1,1)
+    rng = random.Random(seed)
+    grid = gerador(width, height, rng)
+    apple_pos = _escolher_maca(grid, width, height, rng)
+    return Labirinto(width, height, grid, apple_pos, seed, algoritmo)
 
-    path_cells = [(r,c) for r in range(1, height-1) for c in range(1, width-1) if lab[r][c] == ' ']
-    apple_pos = random.choice(path_cells)
-    lab[apple_pos[0]][apple_pos[1]] = '🍎'
+def gerar_labirinto(width:int=31, height:int=31, seed: Optional[int] = None,
+                    algoritmo: str = "backtracker") -> Tuple[List[List[str]], Tuple[int,int]]:
+    """
+    Gera um labirinto (por padrão com recursive backtracker/DFS).
+    Retorna a matriz do labirinto e a posição da maçã (row, col).
 
-    return lab, apple_pos
+    Adaptador sobre gerar_labirinto_compacto() que mantém o formato
+    List[List[str]] usado pelo GameWindow.
+    """
+    lab = gerar_labirinto_compacto(width, height, seed, algoritmo)
+    return lab.como_lista(), lab.apple_pos
@@ -0,0 +1,116 @@
+"""
+Regras do jogo, sem interface gráfica.
+
+A Partida guarda o estado de um jogo (posição do jogador, movimentos,
+colisões, vitória) e expõe uma API de passos: passo('cima') tenta mover o
+jogador e devolve se o movimento aconteceu. O GameWindow usa a Partida para
+as regras e só cuida de desenhar; agentes automáticos (ver agentes.py) e o
+torneio usam a mesma Partida sem Tk, então rodam sem servidor X.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from aventura_pkg.labirinto import CAMINHO, Labirinto
+
+# Direções em sentido horário (o seguidor de parede depende desta ordem)
+DIRECOES = ('cima', 'direita', 'baixo', 'esquerda')
+DELTAS: Dict[str, Tuple[int,int]] = {
+    'cima': (-1, 0),
+    'direita': (0, 1),
+    'baixo': (1, 0),
+    'esquerda': (0, -1),
+}
+
+class Partida:
+    """
+    Estado de uma partida e as regras de movimento.
+
+    Atributos:
+        maze (Labirinto): Labirinto em grade compacta.
+        posicao (Tuple[int,int]): Posição atual do jogador (linha, coluna).
+        inicio (Tuple[int,int]): Posição inicial do jogador.
+        movimentos (int): Movimentos válidos realizados.
+        colisoes (int): Tentativas de andar contra uma parede.
+        venceu (bool): Se o jogador chegou à maçã.
+    """
+
+    def __init__(self, maze: Labirinto, inicio: Optional[Tuple[int,int]] = None):
+        """
+        Args:
+            maze (Labirinto): Labirinto da partida.
+            inicio (Tuple[int,int], optional): Posição inicial; padrão (1, 1),
+                ou a primeira célula livre se (1, 1) for parede.
+        """
+        self.maze = maze
+        if inicio is None:
+            inicio = (1, 1)
+            if not maze.eh_caminho(*inicio):
+                pos = maze.grid.find(CAMINHO)
+                if pos >= 0:
+                    inicio = divmod(pos, maze.width)
+        self.inicio = tuple(inicio)
+        self.posicao = self.inicio
+        self.movimentos = 0
+        self.colisoes = 0
+        self.venceu = self.posicao == tuple(maze.apple_pos)
+        self._relogio = time.monotonic()
+        self._fim = None
+
+    @property
+    def apple_pos(self) -> Tuple[int,int]:
+        return self.maze.apple_pos
+
+    def passo(self, direcao: str) -> bool:
+        """
+        Tenta mover o jogador uma célula na direção indicada.
+
+        Args:
+            direcao (str): 'cima', 'baixo', 'esquerda' ou 'direita'.
+
+        Retorna:
+            bool: True se o jogador andou; False se bateu em uma parede ou
+                a partida já terminou.
+
+        Raises:
+            ValueError: Se a direção não existir.
+        """
+        try:
+            dr, dc = DELTAS[direcao]
+        except KeyError:
+            raise ValueError(f"Direção inválida: {direcao!r}") from None
+        if self.venceu:
+            return False
+        r, c = self.posicao[0] + dr, self.posicao[1] + dc
+        if not self.maze.eh_caminho(r, c):
+            self.colisoes += 1
+            return False
+        self.posicao = (r, c)
+        self.movimentos += 1
+        if self.posicao == self.maze.apple_pos:
+            self.venceu = True
+            self._fim = time.monotonic()
+        return True
+
+    def livre(self, direcao: str) -> bool:
+        """
+        Indica se há caminho na direção indicada, sem mover o jogador.
+        """
+        dr, dc = DELTAS[direcao]
+        return self.maze.eh_caminho(self.posicao[0] + dr, self.posicao[1] + dc)
+
+    def direcoes_livres(self) -> List[str]:
+        """
+        Direções para as quais o jogador pode andar a partir da posição atual.
+        """
+        return [d for d in DIRECOES if self.livre(d)]
+
+    def tempo(self) -> float:
+        """
+        Segundos desde o início da partida (congelado na vitória).
+        """
+        return (self._fim or time.monotonic()) - self._relogio
+
+    def __repr__(self) -> str:
+        estado = "venceu" if self.venceu else f"em {self.posicao}"
+        return f"Partida({self.maze}, {self.movimentos} movimentos, {estado})"
@@ -0,0 +1,176 @@
+"""
+Placar local das partidas vencidas (SQLite).
+
+Cada vitória é gravada com o labirinto que a gerou (semente, algoritmo e
+tamanho), o tempo e os movimentos. As consultas de ranking ("os N melhores
+deste labirinto" e "os N melhores desta dificuldade") são atendidas por
+índices que já estão na ordem do ranking:
+
+    idx_partidas_labirinto (tamanho, algoritmo, seed, segundos, movimentos)
+    idx_partidas_tamanho   (tamanho, segundos, movimentos)
+
+O SQLite desce o índice até o prefixo filtrado e lê só as N primeiras
+entradas, sem ordenar: o custo não cresce com o número de partidas
+gravadas (ver benchmarks/placar.py).
+
+As gravações são feitas em lote: registrar() acumula as partidas e uma
+única transação grava o lote quando ele enche, antes de cada consulta e em
+fechar().
+"""
+
+import os
+import sqlite3
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+PASTA_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_PADRAO = os.path.join(PASTA_PROJETO, "placar.db")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id          INTEGER PRIMARY KEY,
+    seed        INTEGER,            -- NULL para labirintos sem semente
+    algoritmo   TEXT    NOT NULL,
+    tamanho     INTEGER NOT NULL,
+    jogador     TEXT    NOT NULL,
+    segundos    REAL    NOT NULL,
+    movimentos  INTEGER NOT NULL,
+    otimo       INTEGER,
+    data        REAL    NOT NULL    -- time.time() da vitória
+);
+CREATE INDEX IF NOT EXISTS idx_partidas_labirinto
+    ON partidas (tamanho, algoritmo, seed, segundos, movimentos);
+CREATE INDEX IF NOT EXISTS idx_partidas_tamanho
+    ON partidas (tamanho, segundos, movimentos);
+"""
+
+_COLUNAS = "seed, algoritmo, tamanho, jogador, segundos, movimentos, otimo, data"
+
+class Registro(NamedTuple):
+    """
+    Uma partida vencida.
+    """
+    seed: Optional[int]
+    algoritmo: str
+    tamanho: int
+    jogador: str
+    segundos: float
+    movimentos: int
+    otimo: Optional[int]
+    data: float
+
+class Placar:
+    """
+    Placar gravado em um arquivo SQLite.
+
+    Atributos:
+        caminho (str): Arquivo do banco (":memory:" para um placar temporário).
+        lote (int): Partidas acumuladas antes de gravar.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_PADRAO, lote: int = 64):
+        self.caminho = caminho
+        self.lote = lote
+        self._pendentes: List[Tuple] = []
+        self._conexao = sqlite3.connect(caminho)
+        if caminho != ":memory:":
+            # WAL: leituras não esperam a gravação de um lote
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(_ESQUEMA)
+
+    def registrar(self, seed: Optional[int], algoritmo: str, tamanho: int, jogador: str,
+                  segundos: float, movimentos: int, otimo: Optional[int] = None,
+                  data: Optional[float] = None) -> None:
+        """
+        Acumula uma vitória; o lote é gravado quando chega a `lote` partidas.
+        """
+        self._pendentes.append((seed, algoritmo, tamanho, jogador, segundos, movimentos, otimo,
+                                time.time() if data is None else data))
+        if len(self._pendentes) >= self.lote:
+            self.gravar()
+
+    def gravar(self) -> int:
+        """
+        Grava as partidas acumuladas em uma única transação.
+
+        Retorna:
+            int: Quantas partidas foram gravadas.
+        """
+        if not self._pendentes:
+            return 0
+        lote, self._pendentes = self._pendentes, []
+        with self._conexao:
+            self._conexao.executemany(
+                f"INSERT INTO partidas ({_COLUNAS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", lote)
+        return len(lote)
+
+    def _consultar(self, sql: str, parametros: Tuple) -> List[Registro]:
+        self.gravar()
+        return [Registro(*linha) for linha in self._conexao.execute(sql, parametros)]
+
+    def melhores_labirinto(self, seed: Optional[int], algoritmo: str, tamanho: int,
+                           n: int = 10) -> List[Registro]:
+        """
+        As n partidas mais rápidas de um labirinto (empate: menos movimentos).
+        """
+        return self._consultar(
+            f"SELECT {_COLUNAS} FROM partidas "
+            "WHERE tamanho = ? AND algoritmo = ? AND seed IS ? "
+            "ORDER BY segundos, movimentos LIMIT ?",
+            (tamanho, algoritmo, seed, n))
+
+    def melhores_tamanho(self, tamanho: int, n: int = 10) -> List[Registro]:
+        """
+        As n partidas mais rápidas de um tamanho (dificuldade), em qualquer labirinto.
+        """
+        return self._consultar(
+            f"SELECT {_COLUNAS} FROM partidas WHERE tamanho = ? "
+            "ORDER BY segundos, movimentos LIMIT ?",
+            (tamanho, n))
+
+    def posicao(self, seed: Optional[int], algoritmo: str, tamanho: int, segundos: float) -> int:
+        """
+        Posição que um tempo ocupa no ranking do labirinto (1 = melhor).
+        """
+        self.gravar()
+        (mais_rapidas,) = self._conexao.execute(
+            "SELECT COUNT(*) FROM partidas "
+            "WHERE tamanho = ? AND algoritmo = ? AND seed IS ? AND segundos < ?",
+            (tamanho, algoritmo, seed, segundos)).fetchone()
+        return mais_rapidas + 1
+
+    def total(self) -> int:
+        """
+        Número de partidas gravadas (incluindo as pendentes).
+        """
+        (gravadas,) = self._conexao.execute("SELECT COUNT(*) FROM partidas").fetchone()
+        return gravadas + len(self._pendentes)
+
+    def tamanhos(self) -> List[int]:
+        """
+        Tamanhos que têm pelo menos uma partida, em ordem crescente.
+        """
+        self.gravar()
+        # Salta de um tamanho ao próximo pelo índice (uma busca por tamanho),
+        # em vez de percorrer todas as partidas como faria um DISTINCT
+        return [t for (t,) in self._conexao.execute(
+            "WITH RECURSIVE t(tamanho) AS ("
+            " SELECT MIN(tamanho) FROM partidas"
+            " UNION ALL"
+            " SELECT (SELECT MIN(tamanho) FROM partidas WHERE tamanho > t.tamanho) FROM t"
+            " WHERE t.tamanho IS NOT NULL"
+            ") SELECT tamanho FROM t WHERE tamanho IS NOT NULL")]
+
+    def fechar(self) -> None:
+        """
+        Grava o lote pendente e fecha o banco.
+        """
+        self.gravar()
+        self._conexao.close()
+
+    def __enter__(self) -> "Placar":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
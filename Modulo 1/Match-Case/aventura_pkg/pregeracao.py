@@ -0,0 +1,146 @@
+"""
+Pré-geração de labirintos em segundo plano.
+
+Gerar um labirinto grande na thread do Tk congela o menu. O PoolLabirintos
+mantém, para cada tamanho, uma fila com alguns labirintos já prontos,
+gerados em um processo separado (o gerador é Python puro e, em uma thread,
+disputaria o GIL com a interface). "Jogar" retira um labirinto da fila na
+hora, e o pool encomenda outro para repor.
+
+O pool não chama o Tk: a interface consulta retirar() e, se a fila estiver
+vazia, mostra um indicador de progresso e tenta de novo com root.after().
+"""
+
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import (BrokenExecutor, Executor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from aventura_pkg.labirinto import Labirinto, gerar_labirinto_compacto
+
+def _gerar(tamanho: int, algoritmo: str, atraso: float) -> Tuple[Labirinto, float]:
+    # Roda no processo de fundo; o Labirinto volta serializado com pickle
+    inicio = time.perf_counter()
+    if atraso:
+        time.sleep(atraso)
+    maze = gerar_labirinto_compacto(tamanho, tamanho, algoritmo=algoritmo)
+    return maze, time.perf_counter() - inicio
+
+class PoolLabirintos:
+    """
+    Filas de labirintos pré-gerados, uma por tamanho.
+
+    Atributos:
+        algoritmo (str): Algoritmo de geração.
+        profundidade (int): Labirintos mantidos prontos por tamanho.
+        atraso (float): Espera (s) antes de cada geração em segundo plano;
+            evita que a reposição dispute a CPU com a partida em andamento
+            e permite simular uma geração lenta.
+        latencias (Dict[int,float]): Duração (s) da última geração de cada
+            tamanho, incluindo o atraso.
+    """
+
+    def __init__(self, algoritmo: str = "backtracker", profundidade: int = 2, atraso: float = 0.0,
+                 usar_processo: bool = True):
+        """
+        Args:
+            algoritmo (str): Algoritmo de geração.
+            profundidade (int): Tamanho de cada fila (0 desliga a pré-geração).
+            atraso (float): Ver o atributo de mesmo nome.
+            usar_processo (bool): Gera em um processo separado; se False, usa
+                uma thread (mais simples, mas compete com o Tk pelo GIL).
+        """
+        if profundidade < 0:
+            raise ValueError("A profundidade da fila não pode ser negativa")
+        self.algoritmo = algoritmo
+        self.profundidade = profundidade
+        self.atraso = atraso
+        self.latencias: Dict[int, float] = {}
+        self._prontos: Dict[int, Deque[Labirinto]] = {}
+        self._pendentes: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._fechado = False
+        if usar_processo:
+            # spawn: o processo filho não herda o estado do Tk
+            self._executor: Executor = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pregeracao")
+
+    def aquecer(self, tamanhos: Iterable[int]) -> None:
+        """
+        Começa a encher as filas dos tamanhos indicados.
+        """
+        for tamanho in tamanhos:
+            self._repor(tamanho)
+
+    def prontos(self, tamanho: int) -> int:
+        """
+        Quantos labirintos do tamanho estão prontos na fila.
+        """
+        with self._lock:
+            return len(self._prontos.get(tamanho, ()))
+
+    def retirar(self, tamanho: int) -> Optional[Labirinto]:
+        """
+        Retira um labirinto pronto e encomenda a reposição.
+
+        Retorna:
+            Labirinto ou None: None se a fila está vazia; nesse caso a
+                geração já foi encomendada e basta tentar de novo.
+        """
+        with self._lock:
+            fila = self._prontos.get(tamanho)
+            maze = fila.popleft() if fila else None
+        self._repor(tamanho, minimo=0 if maze else 1)
+        return maze
+
+    def _repor(self, tamanho: int, minimo: int = 0) -> None:
+        # Encomenda o que falta para a fila chegar à profundidade (e pelo
+        # menos `minimo` labirinto a caminho, para quem está esperando)
+        with self._lock:
+            if self._fechado:
+                return
+            alvo = max(self.profundidade, minimo)
+            faltam = alvo - len(self._prontos.setdefault(tamanho, deque())) - self._pendentes.get(tamanho, 0)
+            if faltam <= 0:
+                return
+            self._pendentes[tamanho] = self._pendentes.get(tamanho, 0) + faltam
+        for _ in range(faltam):
+            try:
+                futuro = self._executor.submit(_gerar, tamanho, self.algoritmo, self.atraso)
+            except BrokenExecutor:
+                # O processo de fundo morreu: segue gerando em uma thread
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pregeracao")
+                futuro = self._executor.submit(_gerar, tamanho, self.algoritmo, self.atraso)
+            except RuntimeError:  # fechar() chamado por outra thread
+                return
+            futuro.add_done_callback(lambda f, t=tamanho: self._pronto(t, f))
+
+    def _pronto(self, tamanho: int, futuro: Future) -> None:
+        # Chamado pela thread do executor quando uma geração termina
+        with self._lock:
+            self._pendentes[tamanho] -= 1
+            if self._fechado or futuro.cancelled() or futuro.exception() is not None:
+                return
+            maze, segundos = futuro.result()
+            self._prontos[tamanho].append(maze)
+            self.latencias[tamanho] = segundos
+
+    def fechar(self) -> None:
+        """
+        Cancela as gerações pendentes e encerra o processo de fundo.
+        """
+        with self._lock:
+            self._fechado = True
+            self._prontos.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "PoolLabirintos":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
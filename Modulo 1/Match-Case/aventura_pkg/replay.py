@@ -0,0 +1,226 @@
+"""
+Gravação e reprodução de partidas (.rep).
+
+Um replay guarda as teclas de uma partida com o instante de cada uma, além
+do labirinto, e pode ser refeito sem interface (reproduzir) ou na janela do
+jogo (GameWindow.reproduzir_replay).
+
+Layout (little-endian):
+
+    cabeçalho (24 bytes)
+        4s   assinatura b'LABR'
+        B    versão (1)
+        B    flags (bit 0: labirinto embutido, bit 1: venceu)
+        H    reservado
+        I    número de eventos
+        I    movimentos ao final
+        I    duração em ms
+        I    tamanho do labirinto embutido (0 se não embutido)
+    labirinto
+        embutido: um arquivo .lab completo (ver arquivo.py)
+        não embutido: só o cabeçalho .lab; o labirinto é regenerado pela
+        semente e pelo algoritmo
+    eventos
+        5 bytes cada: I (ms desde o início) + B (ação)
+
+Uma partida típica no nível difícil ocupa algumas centenas de bytes.
+
+Como usar (a partir da pasta Match-Case/):
+    python -m aventura_pkg.replay partida.rep [outra.rep ...]
+"""
+
+import argparse
+import struct
+import sys
+import time
+from typing import List, NamedTuple, Tuple, Union
+
+from aventura_pkg import arquivo
+from aventura_pkg.labirinto import Labirinto, gerar_labirinto_compacto
+from aventura_pkg.motor import DIRECOES, Partida
+
+ASSINATURA = b'LABR'
+VERSAO = 1
+CABECALHO = struct.Struct('<4sBBHIIII')
+EVENTO = struct.Struct('<IB')
+_EMBUTIDO = 1
+_VENCEU = 2
+
+# Códigos das ações no arquivo: as quatro direções e a dica
+ACOES = DIRECOES + ('dica',)
+_CODIGOS = {acao: i for i, acao in enumerate(ACOES)}
+
+class Replay(NamedTuple):
+    """
+    Partida gravada.
+
+    Atributos:
+        maze (Labirinto): Labirinto jogado.
+        eventos (List[Tuple[int,str]]): (ms desde o início, ação) em ordem.
+        movimentos (int): Movimentos registrados ao final da partida.
+        venceu (bool): Se a partida terminou com vitória.
+        duracao_ms (int): Duração registrada.
+    """
+    maze: Labirinto
+    eventos: List[Tuple[int, str]]
+    movimentos: int
+    venceu: bool
+    duracao_ms: int
+
+class GravadorReplay:
+    """
+    Registra as ações de uma partida com o instante de cada uma.
+
+    Atributos:
+        maze (Labirinto): Labirinto da partida.
+        eventos (List[Tuple[int,str]]): Ações registradas.
+    """
+
+    def __init__(self, maze: Labirinto):
+        self.maze = maze
+        self.eventos: List[Tuple[int, str]] = []
+        self._inicio = time.monotonic()
+
+    def registrar(self, acao: str) -> None:
+        """
+        Registra uma ação ('cima', 'baixo', 'esquerda', 'direita' ou 'dica').
+
+        Tentativas contra paredes também são gravadas, para que a
+        reprodução refaça exatamente a mesma sequência.
+        """
+        if acao not in _CODIGOS:
+            raise ValueError(f"Ação inválida: {acao!r}")
+        self.eventos.append((int((time.monotonic() - self._inicio) * 1000), acao))
+
+    def empacotar(self, partida: Partida, embutir: bool = True) -> bytes:
+        """
+        Serializa o replay.
+
+        Args:
+            partida (Partida): Partida gravada, no estado final.
+            embutir (bool): Inclui a grade do labirinto. Se False, o
+                labirinto precisa ter semente para ser regenerado.
+
+        Raises:
+            ValueError: Se embutir=False e o labirinto não tiver semente.
+        """
+        if embutir:
+            lab = arquivo.empacotar(self.maze)
+        elif self.maze.seed is None:
+            raise ValueError("Labirinto sem semente: o replay precisa embutir a grade")
+        else:
+            lab = arquivo.empacotar(self.maze)[:arquivo.CABECALHO.size]
+        flags = (_EMBUTIDO if embutir else 0) | (_VENCEU if partida.venceu else 0)
+        duracao = self.eventos[-1][0] if self.eventos else 0
+        partes = [
+            CABECALHO.pack(ASSINATURA, VERSAO, flags, 0, len(self.eventos), partida.movimentos,
+                           duracao, len(lab) if embutir else 0),
+            lab,
+        ]
+        partes.extend(EVENTO.pack(ms, _CODIGOS[acao]) for ms, acao in self.eventos)
+        return b''.join(partes)
+
+    def salvar(self, caminho: str, partida: Partida, embutir: bool = True) -> int:
+        """
+        Grava o replay em um arquivo .rep.
+
+        Retorna:
+            int: Tamanho do arquivo em bytes.
+        """
+        dados = self.empacotar(partida, embutir)
+        with open(caminho, 'wb') as f:
+            f.write(dados)
+        return len(dados)
+
+def desempacotar(dados: bytes) -> Replay:
+    """
+    Lê um replay serializado por GravadorReplay.empacotar().
+
+    Raises:
+        arquivo.FormatoInvalido: Se o conteúdo não for um replay válido.
+    """
+    if len(dados) < CABECALHO.size:
+        raise arquivo.FormatoInvalido("Arquivo menor que o cabeçalho do replay")
+    assinatura, versao, flags, _, n_eventos, movimentos, duracao, tam_lab = CABECALHO.unpack_from(dados)
+    if assinatura != ASSINATURA:
+        raise arquivo.FormatoInvalido(f"Assinatura inválida: {assinatura!r}")
+    if versao != VERSAO:
+        raise arquivo.FormatoInvalido(f"Versão não suportada: {versao}")
+
+    pos = CABECALHO.size
+    if flags & _EMBUTIDO:
+        maze = arquivo.desempacotar(dados[pos:pos + tam_lab])
+        pos += tam_lab
+    else:
+        info = arquivo.ler_cabecalho(dados[pos:pos + arquivo.CABECALHO.size])
+        pos += arquivo.CABECALHO.size
+        maze = gerar_labirinto_compacto(info['width'], info['height'], info['seed'], info['algoritmo'])
+        if maze.apple_pos != info['apple_pos']:
+            raise arquivo.FormatoInvalido("O labirinto regenerado não confere com o replay")
+
+    if len(dados) < pos + n_eventos * EVENTO.size:
+        raise arquivo.FormatoInvalido("Eventos incompletos")
+    eventos = []
+    for ms, codigo in EVENTO.iter_unpack(dados[pos:pos + n_eventos * EVENTO.size]):
+        if codigo >= len(ACOES):
+            raise arquivo.FormatoInvalido(f"Ação desconhecida: {codigo}")
+        eventos.append((ms, ACOES[codigo]))
+    return Replay(maze, eventos, movimentos, bool(flags & _VENCEU), duracao)
+
+def carregar_replay(caminho: str) -> Replay:
+    """
+    Lê um arquivo .rep.
+    """
+    with open(caminho, 'rb') as f:
+        return desempacotar(f.read())
+
+def reproduzir(replay: Replay) -> Partida:
+    """
+    Refaz a partida sem interface, aplicando as ações na ordem gravada.
+
+    Retorna:
+        Partida: Estado final da partida refeita.
+    """
+    partida = Partida(replay.maze)
+    for _, acao in replay.eventos:
+        if acao != 'dica':
+            partida.passo(acao)
+    return partida
+
+def verificar(replay: Union[Replay, str]) -> bool:
+    """
+    Confere se a partida refeita chega ao mesmo resultado gravado.
+
+    Args:
+        replay (Replay ou str): Replay carregado ou caminho do arquivo.
+
+    Retorna:
+        bool: True se movimentos e vitória batem com o replay.
+    """
+    if isinstance(replay, str):
+        replay = carregar_replay(replay)
+    partida = reproduzir(replay)
+    return partida.movimentos == replay.movimentos and partida.venceu == replay.venceu
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica replays do labirinto sem interface gráfica")
+    parser.add_argument('arquivos', nargs='+', metavar='ARQUIVO.rep')
+    args = parser.parse_args()
+
+    falhas = 0
+    for caminho in args.arquivos:
+        try:
+            replay = carregar_replay(caminho)
+        except (OSError, arquivo.FormatoInvalido) as e:
+            print(f"❌ {caminho}: {e}")
+            falhas += 1
+            continue
+        ok = verificar(replay)
+        falhas += not ok
+        resultado = "vitória" if replay.venceu else "sem vitória"
+        print(f"{'✅' if ok else '❌'} {caminho}: {replay.maze}, {len(replay.eventos)} ações, "
+              f"{replay.movimentos} movimentos, {replay.duracao_ms / 1000:.1f}s, {resultado}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == '__main__':
+    main()
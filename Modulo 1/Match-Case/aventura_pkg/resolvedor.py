@@ -0,0 +1,298 @@
+"""
+Busca de caminhos no labirinto: BFS, A* e BFS bidirecional.
+
+Todos trabalham direto na grade compacta (Labirinto.grid), com as posições
+como índices no bytearray (row * width + col). Como a borda da grade é
+sempre parede, os vizinhos de uma célula de caminho (±1, ±width) nunca
+saem da grade e o laço não precisa testar limites.
+
+Em vez de um dicionário de "pais", cada busca guarda em um bytearray por
+qual direção chegou a cada célula (0 = não visitada), o que custa um byte
+por célula e permite reconstruir o caminho de trás para frente.
+
+Para as dicas do jogo, mapa_distancias() calcula uma vez a distância de
+todas as células até a maçã; a partir daí o próximo passo de qualquer
+posição é O(1) (ver proximos_passos).
+"""
+
+import heapq
+from array import array
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from aventura_pkg.labirinto import Labirinto
+
+_ORIGEM = 5  # Marca a célula inicial no vetor de direções
+
+class Solucao(NamedTuple):
+    """
+    Resultado de uma busca.
+
+    Atributos:
+        caminho (List[Tuple[int,int]]): Células do início ao fim, inclusive
+            (vazio se não houver caminho).
+        expandidos (int): Células retiradas da fronteira e expandidas.
+        algoritmo (str): Nome do algoritmo usado.
+    """
+    caminho: List[Tuple[int,int]]
+    expandidos: int
+    algoritmo: str
+
+    @property
+    def movimentos(self) -> int:
+        """
+        Número de movimentos do caminho (-1 se não houver caminho).
+        """
+        return len(self.caminho) - 1
+
+def _deslocamentos(width: int) -> Tuple[int, int, int, int]:
+    return (-width, width, -1, 1)
+
+def _reconstruir(veio: bytearray, desl: Tuple[int, ...], p: int) -> List[int]:
+    """
+    Segue as direções de chegada de p até a origem da busca.
+
+    Retorna:
+        List[int]: Índices da origem até p.
+    """
+    caminho = [p]
+    while veio[p] != _ORIGEM:
+        p -= desl[veio[p] - 1]
+        caminho.append(p)
+    caminho.reverse()
+    return caminho
+
+def _para_celulas(caminho: List[int], width: int) -> List[Tuple[int,int]]:
+    return [divmod(p, width) for p in caminho]
+
+def bfs(maze: Labirinto, inicio: Tuple[int,int], fim: Tuple[int,int]) -> Solucao:
+    """
+    Busca em largura, expandindo uma camada de distância por vez.
+
+    Args:
+        maze (Labirinto): Labirinto em grade compacta.
+        inicio (Tuple[int,int]): Posição (linha, coluna) inicial.
+        fim (Tuple[int,int]): Posição (linha, coluna) de destino.
+
+    Retorna:
+        Solucao: Caminho mais curto e células expandidas.
+    """
+    w, g = maze.width, maze.grid
+    desl = _deslocamentos(w)
+    direcoes = tuple(enumerate(desl, 1))
+    origem, alvo = inicio[0] * w + inicio[1], fim[0] * w + fim[1]
+
+    veio = bytearray(len(g))
+    veio[origem] = _ORIGEM
+    camada = [origem]
+    expandidos = 0
+    while camada:
+        proxima = []
+        for p in camada:
+            expandidos += 1
+            if p == alvo:
+                return Solucao(_para_celulas(_reconstruir(veio, desl, p), w), expandidos, "bfs")
+            for k, d in direcoes:
+                n = p + d
+                if g[n] and not veio[n]:
+                    veio[n] = k
+                    proxima.append(n)
+        camada = proxima
+    return Solucao([], expandidos, "bfs")
+
+def a_estrela(maze: Labirinto, inicio: Tuple[int,int], fim: Tuple[int,int]) -> Solucao:
+    """
+    A* com heurística de Manhattan (admissível e consistente na grade).
+
+    Empates no custo estimado favorecem os nós mais profundos, que em
+    labirintos costuma reduzir bastante as expansões. Entradas repetidas
+    na fila de prioridade são descartadas quando a célula já foi fechada.
+
+    Args:
+        maze (Labirinto): Labirinto em grade compacta.
+        inicio (Tuple[int,int]): Posição (linha, coluna) inicial.
+        fim (Tuple[int,int]): Posição (linha, coluna) de destino.
+
+    Retorna:
+        Solucao: Caminho mais curto e células expandidas.
+    """
+    w, g = maze.width, maze.grid
+    desl = _deslocamentos(w)
+    direcoes = tuple(enumerate(desl, 1))
+    origem, alvo = inicio[0] * w + inicio[1], fim[0] * w + fim[1]
+    tr, tc = fim
+    push, pop = heapq.heappush, heapq.heappop
+
+    veio = bytearray(len(g))
+    r, c = inicio
+    fila = [(abs(r - tr) + abs(c - tc), 0, origem, _ORIGEM)]
+    expandidos = 0
+    while fila:
+        _, menos_custo, p, k = pop(fila)
+        if veio[p]:
+            continue
+        veio[p] = k
+        expandidos += 1
+        if p == alvo:
+            return Solucao(_para_celulas(_reconstruir(veio, desl, p), w), expandidos, "a*")
+        # O custo vai negativo na fila para desempatar pelo mais profundo
+        custo = 1 - menos_custo
+        for k, d in direcoes:
+            n = p + d
+            if g[n] and not veio[n]:
+                r, c = divmod(n, w)
+                push(fila, (custo + abs(r - tr) + abs(c - tc), -custo, n, k))
+    return Solucao([], expandidos, "a*")
+
+def bfs_bidirecional(maze: Labirinto, inicio: Tuple[int,int], fim: Tuple[int,int]) -> Solucao:
+    """
+    BFS a partir das duas pontas, expandindo sempre a menor fronteira.
+
+    Quando uma camada encontra células já visitadas pelo outro lado, a
+    camada é terminada e o menor dos caminhos encontrados é escolhido
+    (parar no primeiro encontro nem sempre dá o caminho mais curto).
+
+    Args:
+        maze (Labirinto): Labirinto em grade compacta.
+        inicio (Tuple[int,int]): Posição (linha, coluna) inicial.
+        fim (Tuple[int,int]): Posição (linha, coluna) de destino.
+
+    Retorna:
+        Solucao: Caminho mais curto e células expandidas.
+    """
+    w, g = maze.width, maze.grid
+    desl = _deslocamentos(w)
+    direcoes = tuple(enumerate(desl, 1))
+    origem, alvo = inicio[0] * w + inicio[1], fim[0] * w + fim[1]
+    if origem == alvo:
+        return Solucao([tuple(inicio)], 1, "bidirecional")
+
+    veio_a, veio_b = bytearray(len(g)), bytearray(len(g))
+    veio_a[origem] = veio_b[alvo] = _ORIGEM
+    fronteira_a, fronteira_b = [origem], [alvo]
+    expandidos = 0
+
+    while fronteira_a and fronteira_b:
+        if len(fronteira_a) <= len(fronteira_b):
+            camada, veio, outro = fronteira_a, veio_a, veio_b
+        else:
+            camada, veio, outro = fronteira_b, veio_b, veio_a
+        proxima, encontros = [], []
+        for p in camada:
+            expandidos += 1
+            for k, d in direcoes:
+                n = p + d
+                if g[n] and not veio[n]:
+                    veio[n] = k
+                    proxima.append(n)
+                    if outro[n]:
+                        encontros.append(n)
+        if encontros:
+            melhor = None
+            for n in encontros:
+                ida = _reconstruir(veio_a, desl, n)
+                volta = _reconstruir(veio_b, desl, n)
+                if melhor is None or len(ida) + len(volta) - 1 < len(melhor):
+                    melhor = ida + volta[-2::-1]
+            return Solucao(_para_celulas(melhor, w), expandidos, "bidirecional")
+        if veio is veio_a:
+            fronteira_a = proxima
+        else:
+            fronteira_b = proxima
+    return Solucao([], expandidos, "bidirecional")
+
+RESOLVEDORES: Dict[str, Callable[[Labirinto, Tuple[int,int], Tuple[int,int]], Solucao]] = {
+    "bfs": bfs,
+    "a*": a_estrela,
+    "bidirecional": bfs_bidirecional,
+}
+
+def mapa_distancias(maze: Labirinto, destino: Tuple[int,int]) -> array:
+    """
+    Distância (em movimentos) de cada célula até o destino.
+
+    Uma única BFS a partir do destino; depois disso a distância e o próximo
+    passo de qualquer posição são consultas O(1).
+
+    Args:
+        maze (Labirinto): Labirinto em grade compacta.
+        destino (Tuple[int,int]): Posição (linha, coluna) de destino (a maçã).
+
+    Retorna:
+        array: Vetor 'i' indexado por row * width + col (-1 para paredes e
+            células inalcançáveis).
+    """
+    w, g = maze.width, maze.grid
+    desl = _deslocamentos(w)
+    dist = array('i', [-1]) * len(g)
+    p = destino[0] * w + destino[1]
+    dist[p] = 0
+    camada, nivel = [p], 0
+    while camada:
+        nivel += 1
+        proxima = []
+        for p in camada:
+            for d in desl:
+                n = p + d
+                if g[n] and dist[n] < 0:
+                    dist[n] = nivel
+                    proxima.append(n)
+        camada = proxima
+    return dist
+
+def distancia(maze: Labirinto, dist: array, pos: Tuple[int,int]) -> int:
+    """
+    Consulta o mapa de distâncias (-1 se a posição não alcança o destino).
+    """
+    return dist[pos[0] * maze.width + pos[1]]
+
+def proximos_passos(maze: Labirinto, dist: array, pos: Tuple[int,int],
+                    passos: int = 10) -> List[Tuple[int,int]]:
+    """
+    Próximas células do caminho mais curto até o destino do mapa.
+
+    Args:
+        maze (Labirinto): Labirinto em grade compacta.
+        dist (array): Mapa criado por mapa_distancias().
+        pos (Tuple[int,int]): Posição atual (linha, coluna).
+        passos (int): Quantas células devolver, no máximo.
+
+    Retorna:
+        List[Tuple[int,int]]: Células seguintes (sem incluir pos); vazio se
+            pos já é o destino ou não o alcança.
+    """
+    w = maze.width
+    desl = _deslocamentos(w)
+    p = pos[0] * w + pos[1]
+    caminho = []
+    while len(caminho) < passos and dist[p] > 0:
+        alvo = dist[p] - 1
+        for d in desl:
+            if dist[p + d] == alvo:
+                p += d
+                break
+        else:
+            break
+        caminho.append(divmod(p, w))
+    return caminho
+
+def resolver(maze: Labirinto, inicio: Optional[Tuple[int,int]] = None,
+             fim: Optional[Tuple[int,int]] = None, algoritmo: str = "a*") -> Solucao:
+    """
+    Resolve o labirinto com o algoritmo escolhido.
+
+    Args:
+        maze (Labirinto): Labirinto em grade compacta.
+        inicio (Tuple[int,int], optional): Padrão: (1, 1).
+        fim (Tuple[int,int], optional): Padrão: a maçã.
+        algoritmo (str): bfs, a* ou bidirecional.
+
+    Retorna:
+        Solucao: Caminho mais curto e células expandidas.
+
+    Raises:
+        ValueError: Se o algoritmo não existir.
+    """
+    func = RESOLVEDORES.get(algoritmo)
+    if func is None:
+        raise ValueError(f"Resolvedor desconhecido: {algoritmo!r} (use {', '.join(RESOLVEDORES)})")
+    return func(maze, inicio or (1, 1), fim or maze.apple_pos)
@@ -0,0 +1,177 @@
+"""
+Torneio de agentes em modo headless.
+
+Joga milhares de partidas em um pool de processos, sem Tk (roda em CI sem
+servidor X). Cada jogo é identificado por (agente, dificuldade, semente):
+todos os agentes jogam os mesmos labirintos, e o mesmo torneio com a mesma
+semente base dá o mesmo resultado (exceto os tempos).
+
+Para cada agente e dificuldade mostra vitórias, distribuição de
+movimentos (média, p50, p95), eficiência em relação ao caminho ótimo e
+tempo por partida.
+
+Como usar (a partir da pasta Match-Case/):
+    python -m aventura_pkg.torneio
+    python -m aventura_pkg.torneio --jogos 2000 --agentes parede a* --dificuldades dificil
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Sequence
+
+from aventura_pkg import resolvedor
+from aventura_pkg.agentes import AGENTES, jogar
+from aventura_pkg.geradores import ALGORITMOS
+from aventura_pkg.labirinto import CAMINHO, gerar_labirinto_compacto
+from aventura_pkg.motor import Partida
+
+# Mesmos tamanhos de main.obter_tamanho_labirinto
+DIFICULDADES: Dict[str, int] = {'facil': 21, 'medio': 31, 'dificil': 41}
+
+class Jogo(NamedTuple):
+    """
+    Resultado de uma partida do torneio.
+    """
+    agente: str
+    dificuldade: str
+    seed: int
+    venceu: bool
+    movimentos: int
+    colisoes: int
+    otimo: int
+    segundos: float
+
+def jogar_um(agente: str, dificuldade: str, seed: int, algoritmo: str = "backtracker",
+             limite_por_celula: int = 50) -> Jogo:
+    """
+    Gera o labirinto da semente e deixa o agente jogar.
+
+    Args:
+        agente (str): Nome em agentes.AGENTES.
+        dificuldade (str): Chave de DIFICULDADES.
+        seed (int): Semente do labirinto (e do agente, se for aleatório).
+        algoritmo (str): Algoritmo de geração.
+        limite_por_celula (int): Passos permitidos por célula de caminho;
+            partidas que passam disso contam como derrota.
+
+    Retorna:
+        Jogo: Resultado da partida.
+    """
+    tamanho = DIFICULDADES[dificuldade]
+    maze = gerar_labirinto_compacto(tamanho, tamanho, seed, algoritmo)
+    partida = Partida(maze)
+    otimo = resolvedor.bfs(maze, partida.inicio, maze.apple_pos).movimentos
+
+    inicio = time.perf_counter()
+    jogar(AGENTES[agente](seed), partida, limite_por_celula * maze.grid.count(CAMINHO))
+    segundos = time.perf_counter() - inicio
+    return Jogo(agente, dificuldade, seed, partida.venceu, partida.movimentos,
+                partida.colisoes, otimo, segundos)
+
+def _jogar_tarefa(tarefa):
+    return jogar_um(*tarefa)
+
+def rodar_torneio(agentes: Sequence[str], dificuldades: Sequence[str], jogos: int,
+                  seed: int = 0, processos: int = None, algoritmo: str = "backtracker",
+                  limite_por_celula: int = 50) -> List[Jogo]:
+    """
+    Joga `jogos` labirintos por dificuldade com cada agente, em paralelo.
+
+    Args:
+        agentes (Sequence[str]): Nomes dos agentes.
+        dificuldades (Sequence[str]): Dificuldades a jogar.
+        jogos (int): Labirintos por dificuldade (os mesmos para todos os agentes).
+        seed (int): Semente base; o jogo i usa seed + i.
+        processos (int, optional): Tamanho do pool. Padrão: número de CPUs.
+            Com 1, joga no próprio processo.
+        algoritmo (str): Algoritmo de geração dos labirintos.
+        limite_por_celula (int): Ver jogar_um.
+
+    Retorna:
+        List[Jogo]: Um resultado por partida.
+    """
+    tarefas = [
+        (agente, dificuldade, seed + i, algoritmo, limite_por_celula)
+        for dificuldade in dificuldades
+        for i in range(jogos)
+        for agente in agentes
+    ]
+    processos = processos or os.cpu_count() or 1
+    if processos == 1:
+        return [_jogar_tarefa(t) for t in tarefas]
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        # Lotes grandes: cada partida é curta e o custo de IPC dominaria
+        lote = max(1, len(tarefas) // (processos * 8))
+        return list(pool.map(_jogar_tarefa, tarefas, chunksize=lote))
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def resumir(resultados: Sequence[Jogo]) -> List[dict]:
+    """
+    Agrega os resultados por (agente, dificuldade).
+
+    Retorna:
+        List[dict]: agente, dificuldade, jogos, vitorias (%), movimentos
+            (média, p50, p95 das vitórias), eficiencia (%), colisoes (média)
+            e tempo_ms (média, p95).
+    """
+    grupos: Dict[tuple, List[Jogo]] = {}
+    for jogo in resultados:
+        grupos.setdefault((jogo.agente, jogo.dificuldade), []).append(jogo)
+
+    linhas = []
+    for (agente, dificuldade), jogos in grupos.items():
+        vitorias = [j for j in jogos if j.venceu]
+        movimentos = [j.movimentos for j in vitorias] or [0]
+        tempos = [j.segundos * 1000 for j in jogos]
+        linhas.append({
+            'agente': agente,
+            'dificuldade': dificuldade,
+            'jogos': len(jogos),
+            'vitorias': 100 * len(vitorias) / len(jogos),
+            'mov_media': statistics.fmean(movimentos),
+            'mov_p50': _percentil(movimentos, 0.5),
+            'mov_p95': _percentil(movimentos, 0.95),
+            'eficiencia': 100 * statistics.fmean([j.otimo / j.movimentos for j in vitorias if j.movimentos] or [0]),
+            'colisoes': statistics.fmean(j.colisoes for j in jogos),
+            'tempo_media': statistics.fmean(tempos),
+            'tempo_p95': _percentil(tempos, 0.95),
+        })
+    return linhas
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneio de agentes no labirinto (sem interface gráfica)")
+    parser.add_argument('--agentes', nargs='+', default=list(AGENTES), choices=list(AGENTES))
+    parser.add_argument('--dificuldades', nargs='+', default=list(DIFICULDADES), choices=list(DIFICULDADES))
+    parser.add_argument('--jogos', type=int, default=1000, help='Labirintos por dificuldade')
+    parser.add_argument('--seed', type=int, default=0, help='Semente base')
+    parser.add_argument('--processos', type=int, default=None, help='Processos do pool (padrão: CPUs)')
+    parser.add_argument('--algoritmo', default='backtracker', choices=list(ALGORITMOS))
+    parser.add_argument('--limite', type=int, default=50,
+                        help='Passos permitidos por célula de caminho antes de desistir')
+    args = parser.parse_args()
+
+    total = args.jogos * len(args.dificuldades) * len(args.agentes)
+    print("=" * 78)
+    print(f"🏆 Torneio: {total} partidas ({', '.join(args.agentes)})")
+    print("=" * 78)
+    inicio = time.perf_counter()
+    resultados = rodar_torneio(args.agentes, args.dificuldades, args.jogos, args.seed,
+                               args.processos, args.algoritmo, args.limite)
+    print(f"⏱️ {time.perf_counter() - inicio:.1f}s")
+    print()
+
+    print(f"   {'agente':<20}{'nível':<9}{'vitórias':>9}{'mov. média':>12}{'p50':>7}{'p95':>7}"
+          f"{'efic. %':>9}{'colisões':>10}{'ms média':>10}{'ms p95':>9}")
+    for l in resumir(resultados):
+        print(f"   {l['agente']:<20}{l['dificuldade']:<9}{l['vitorias']:>8.1f}%{l['mov_media']:>12.1f}"
+              f"{l['mov_p50']:>7}{l['mov_p95']:>7}{l['eficiencia']:>9.1f}{l['colisoes']:>10.1f}"
+              f"{l['tempo_media']:>10.2f}{l['tempo_p95']:>9.2f}")
+
+if __name__ == '__main__':
+    main()
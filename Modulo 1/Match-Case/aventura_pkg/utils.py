@@ -1,7 +1,7 @@
 import tkinter as tk
-import threading
-import os
+import time
 from pathlib import Path
+from aventura_pkg import audio
 
 def imprime_instrucoes():
     """
@@ -11,6 +11,7 @@ def imprime_instrucoes():
     texto = (
         "Instruções:\n\n"
         "- Use as teclas W/A/S/D ou as setas para se mover.\n"
+        "- Pressione H para ver os próximos passos até a maçã.\n"
         "- Encontre a 🍎 para vencer.\n"
         "- Pressione Q para sair durante o jogo.\n\n"
         "Dica: escolha dificuldade 'difícil' para labirintos maiores."
@@ -27,93 +28,19 @@ def imprime_instrucoes():
 
 def play_victory_sound(path="victory.wav"):
     """
-    Toca um arquivo de som WAV em uma thread separada para não bloquear o jogo.
-    Tenta múltiplas bibliotecas de áudio como fallback.
+    Toca um arquivo de som WAV sem bloquear o jogo.
+    
+    O som é tocado pelo serviço de áudio (ver audio.py), que já tem o
+    arquivo decodificado e a biblioteca de áudio escolhida desde a
+    inicialização; aqui só é feito o pedido.
     
     Args:
         path (str): Caminho relativo ou absoluto para o arquivo WAV.
     """
-    def _play():
-        # Resolve o caminho absoluto do arquivo
-        if not os.path.isabs(path):
-            # Tenta primeiro na pasta atual
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            # Vai para o diretório pai (raiz do projeto)
-            project_root = os.path.dirname(script_dir)
-            full_path = os.path.join(project_root, path)
-            
-            # Se não encontrar, tenta na pasta do script
-            if not os.path.exists(full_path):
-                full_path = os.path.join(script_dir, path)
-            
-            # Se ainda não encontrar, tenta na pasta de execução atual
-            if not os.path.exists(full_path):
-                full_path = path
-        else:
-            full_path = path
-        
-        # Verifica se o arquivo existe
-        if not os.path.exists(full_path):
-            print(f"⚠️ Arquivo de som não encontrado: {full_path}")
-            return
-        
-        # Tenta tocar com simpleaudio primeiro
-        try:
-            import simpleaudio as sa
-            wave_obj = sa.WaveObject.from_wave_file(full_path)
-            play_obj = wave_obj.play()
-            play_obj.wait_done()
-            return
-        except ImportError:
-            print("⚠️ simpleaudio não instalado. Tentando pygame...")
-        except Exception as e:
-            print(f"⚠️ Erro ao tocar com simpleaudio: {e}")
-        
-        # Fallback 1: pygame
-        try:
-            import pygame
-            pygame.mixer.init()
-            pygame.mixer.music.load(full_path)
-            pygame.mixer.music.play()
-            # Aguarda o som terminar
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-            pygame.mixer.quit()
-            return
-        except ImportError:
-            print("⚠️ pygame não instalado. Tentando playsound...")
-        except Exception as e:
-            print(f"⚠️ Erro ao tocar com pygame: {e}")
-        
-        # Fallback 2: playsound
-        try:
-            from playsound import playsound
-            playsound(full_path)
-            return
-        except ImportError:
-            print("⚠️ playsound não instalado.")
-        except Exception as e:
-            print(f"⚠️ Erro ao tocar com playsound: {e}")
-        
-        # Fallback 3: winsound (apenas Windows)
-        try:
-            import winsound
-            winsound.PlaySound(full_path, winsound.SND_FILENAME)
-            return
-        except ImportError:
-            pass  # winsound só existe no Windows
-        except Exception as e:
-            print(f"⚠️ Erro ao tocar com winsound: {e}")
-        
-        print("❌ Nenhuma biblioteca de áudio disponível para tocar o som.")
-        print("   Instale uma das seguintes: simpleaudio, pygame ou playsound")
-    
-    # Executa em thread separada para não bloquear a interface
-    t = threading.Thread(target=_play, daemon=True)
-    t.start()
+    audio.obter_servico().tocar(path)
 
 
-def tela_vitoria_gui(root, winner="Jogador", time_seconds=0.0, moves=0):
+def tela_vitoria_gui(root, winner="Jogador", time_seconds=0.0, moves=0, optimal_moves=None, posicao=None):
     """
     Exibe uma janela de vitória animada com informações da partida.
     Utiliza função recursiva interna para criar animação de estrelas.
@@ -123,6 +50,9 @@ def tela_vitoria_gui(root, winner="Jogador", time_seconds=0.0, moves=0):
         winner (str): Nome do vencedor a ser exibido.
         time_seconds (float): Tempo total da partida em segundos.
         moves (int): Número total de movimentos realizados.
+        optimal_moves (int, optional): Menor número de movimentos possível,
+            exibido para comparação.
+        posicao (int, optional): Posição do tempo no placar deste labirinto.
     """
     win = tk.Toplevel(root)
     win.title("Vitória!")
@@ -136,9 +66,15 @@ def tela_vitoria_gui(root, winner="Jogador", time_seconds=0.0, moves=0):
     lbl.pack(padx=20, pady=8)
     
     # Informações de desempenho
+    texto_info = f"Tempo: {time_seconds:.2f} segundos\nMovimentos: {moves}"
+    if optimal_moves is not None and optimal_moves > 0:
+        eficiencia = 100 * optimal_moves / max(moves, optimal_moves)
+        texto_info += f"\nCaminho ótimo: {optimal_moves} movimentos ({eficiencia:.0f}% de eficiência)"
+    if posicao is not None:
+        texto_info += f"\n🏅 Posição no placar deste labirinto: {posicao}º"
     info = tk.Label(
         win, 
-        text=f"Tempo: {time_seconds:.2f} segundos\nMovimentos: {moves}", 
+        text=texto_info, 
         font=("Segoe UI", 11)
     )
     info.pack(pady=6)
@@ -177,4 +113,61 @@ def tela_vitoria_gui(root, winner="Jogador", time_seconds=0.0, moves=0):
         text="Fechar", 
         command=lambda: (win.destroy(), root.destroy())
     )
-    btn.pack(pady=8)
\ No newline at end of file
+    btn.pack(pady=8)
+
+
+def tela_placar(root, placar, dificuldades, n=10):
+    """
+    Exibe os melhores tempos de cada dificuldade, lidos do placar.
+    
+    Cada botão mostra o ranking de um tamanho; tamanhos livres já jogados
+    (--tamanho) também ganham um botão.
+    
+    Args:
+        root (tk.Tk): Janela pai.
+        placar (Placar): Placar aberto (ver placar.py).
+        dificuldades (dict): Nome exibido -> tamanho do labirinto.
+        n (int): Quantas partidas mostrar por ranking.
+    """
+    win = tk.Toplevel(root)
+    win.title("🏅 Placar")
+    
+    tamanhos = dict(dificuldades)
+    for tamanho in placar.tamanhos():
+        if tamanho not in tamanhos.values():
+            tamanhos[f"{tamanho}x{tamanho}"] = tamanho
+    
+    titulo = tk.Label(win, text="🏅 Melhores tempos", font=("Segoe UI", 14, "bold"))
+    titulo.pack(pady=8)
+    
+    botoes = tk.Frame(win)
+    botoes.pack(pady=4)
+    txt = tk.Text(win, width=72, height=n + 3, wrap='none', font=("Consolas", 10))
+    txt.pack(padx=10, pady=6)
+    
+    def mostrar(nome):
+        """
+        Preenche o texto com o ranking do tamanho escolhido.
+        """
+        registros = placar.melhores_tamanho(tamanhos[nome], n)
+        linhas = [f"{nome} ({tamanhos[nome]}x{tamanhos[nome]})", ""]
+        if registros:
+            linhas.append(f"{'#':>3}  {'Jogador':<16}{'Tempo':>9}{'Movim.':>8}{'Ótimo':>7}  {'Algoritmo':<12}{'Data':<10}")
+            for i, r in enumerate(registros, 1):
+                otimo = r.otimo if r.otimo is not None else "-"
+                data = time.strftime("%d/%m/%Y", time.localtime(r.data))
+                linhas.append(f"{i:>3}  {r.jogador[:15]:<16}{r.segundos:>8.2f}s{r.movimentos:>8}{otimo:>7}  "
+                              f"{r.algoritmo:<12}{data:<10}")
+        else:
+            linhas.append("Nenhuma vitória registrada ainda.")
+        txt.config(state='normal')
+        txt.delete('1.0', 'end')
+        txt.insert('1.0', "\n".join(linhas))
+        txt.config(state='disabled')
+    
+    for nome in tamanhos:
+        tk.Button(botoes, text=nome, width=10, command=lambda nome=nome: mostrar(nome)).pack(side='left', padx=3)
+    
+    btn = tk.Button(win, text="Fechar", command=win.destroy)
+    btn.pack(pady=6)
+    mostrar(next(iter(tamanhos)))
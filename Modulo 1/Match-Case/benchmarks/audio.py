@@ -0,0 +1,102 @@
+"""
+Benchmark do serviço de áudio.
+
+Mede, com o backend escolhido (padrão: nulo, que não precisa de placa de
+som):
+
+- inicialização: escolha do backend e carga dos sons, feita uma vez
+- latência de vitória: do pedido de som até o backend começar a tocar
+
+e compara com o caminho antigo de utils.play_victory_sound, que a cada
+vitória criava uma thread, procurava o arquivo no disco, tentava importar
+as bibliotecas de áudio uma a uma e decodificava o WAV de novo.
+
+Como usar (a partir da pasta Match-Case/):
+    python benchmarks/audio.py
+    python benchmarks/audio.py --vitorias 500 --backend pygame
+"""
+
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import threading
+import time
+import wave
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from aventura_pkg import audio
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def vitoria_antiga(path, latencias):
+    """
+    Reproduz o custo do play_victory_sound antigo até o ponto em que o som
+    começaria a tocar (sem tocar de fato).
+    """
+    pedido_em = time.perf_counter()
+
+    def _play():
+        caminho = audio.resolver_caminho(path)
+        for modulo in ("simpleaudio", "pygame", "playsound", "winsound"):
+            try:
+                importlib.import_module(modulo)
+                break
+            except ImportError:
+                continue
+        with wave.open(caminho, 'rb') as f:
+            f.readframes(f.getnframes())
+        latencias.append(time.perf_counter() - pedido_em)
+
+    t = threading.Thread(target=_play, daemon=True)
+    t.start()
+    return t
+
+def medir_servico(backend, vitorias, som):
+    inicio = time.perf_counter()
+    servico = audio.ServicoAudio([som], backend)
+    inicializacao = time.perf_counter() - inicio
+    for _ in range(vitorias):
+        servico.tocar(som)
+        servico.aguardar()  # uma vitória por vez, como no jogo
+    latencias = list(servico.latencias)
+    servico.fechar()
+    return inicializacao, latencias
+
+def medir_antigo(vitorias, som):
+    latencias = []
+    for _ in range(vitorias):
+        vitoria_antiga(som, latencias).join()
+    return latencias
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede inicialização e latência do áudio de vitória")
+    parser.add_argument('--vitorias', type=int, default=200, help='Sons de vitória pedidos')
+    parser.add_argument('--backend', default='nulo', choices=list(audio.BACKENDS))
+    parser.add_argument('--som', default='victory.wav')
+    args = parser.parse_args()
+
+    if audio.resolver_caminho(args.som) is None:
+        parser.error(f"arquivo de som não encontrado: {args.som}")
+
+    print("=" * 64)
+    print(f"🔊 Áudio de vitória: {args.vitorias} vitórias, backend {args.backend}")
+    print("=" * 64)
+    inicializacao, novas = medir_servico(args.backend, args.vitorias, args.som)
+    antigas = medir_antigo(args.vitorias, args.som)
+
+    print(f"   inicialização do serviço: {inicializacao * 1000:.2f} ms (uma vez)")
+    print()
+    print(f"   {'latência até tocar':<22}{'média (ms)':>12}{'p50':>9}{'p95':>9}{'máx':>9}")
+    for nome, valores in (("serviço", novas), ("antigo (por vitória)", antigas)):
+        ms = [v * 1000 for v in valores]
+        print(f"   {nome:<22}{statistics.fmean(ms):>12.3f}{_percentil(ms, 0.5):>9.3f}"
+              f"{_percentil(ms, 0.95):>9.3f}{max(ms):>9.3f}")
+
+if __name__ == '__main__':
+    main()
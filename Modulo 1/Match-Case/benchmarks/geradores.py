@@ -0,0 +1,135 @@
+"""
+Benchmark dos algoritmos de geração de labirintos.
+
+Para cada algoritmo registrado em aventura_pkg.geradores.ALGORITMOS e cada
+tamanho, mede:
+
+- tempo de geração (melhor de N repetições)
+- pico de memória alocada durante a geração (tracemalloc, em uma execução
+  separada, porque o rastreamento deixa a geração mais lenta)
+- becos sem saída (células com uma só passagem), em % das células
+- bifurcações (células com 3 ou 4 passagens), em % das células
+- comprimento médio dos corredores (passos entre dois becos/bifurcações)
+
+O algoritmo de Eller também é medido em fluxo (gerar_linhas_eller), sem
+guardar a grade, para mostrar a memória O(largura).
+
+Como usar (a partir da pasta Match-Case/):
+    python benchmarks/geradores.py
+    python benchmarks/geradores.py --tamanhos 101 1001 --algoritmos kruskal eller
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from aventura_pkg.geradores import ALGORITMOS, CAMINHO, gerar_linhas_eller
+from aventura_pkg.labirinto import gerar_labirinto_compacto
+
+def estatisticas(lab):
+    """
+    Calcula as estatísticas estruturais de um labirinto perfeito.
+
+    O labirinto é uma árvore cujos vértices são as posições de caminho.
+    Contraindo as posições com exatamente 2 passagens (meio de corredor),
+    sobram só becos e bifurcações, ligados por (nós - 1) corredores.
+
+    Args:
+        lab (Labirinto): Labirinto gerado.
+
+    Retorna:
+        dict: becos, bifurcacoes (em % das células) e corredor_medio.
+    """
+    g, w = lab.grid, lab.width
+    celulas = ((lab.width - 1) // 2) * ((lab.height - 1) // 2)
+    caminhos = g.count(CAMINHO)
+    becos = bifurcacoes = 0
+    for r in range(1, lab.height - 1, 2):
+        for p in range(r * w + 1, r * w + w - 1, 2):
+            grau = g[p - 1] + g[p + 1] + g[p - w] + g[p + w]
+            if grau == 1:
+                becos += 1
+            elif grau > 2:
+                bifurcacoes += 1
+    # Paredes abertas sempre têm grau 2, então só as células viram nós
+    nos = becos + bifurcacoes
+    return {
+        'becos': 100 * becos / celulas,
+        'bifurcacoes': 100 * bifurcacoes / celulas,
+        'corredor_medio': (caminhos - 1) / (nos - 1) if nos > 1 else float(caminhos - 1),
+    }
+
+def medir_tempo(funcao, repeticoes):
+    melhor = float('inf')
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def medir_memoria(funcao):
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def _consumir_eller(tamanho, seed):
+    for _ in gerar_linhas_eller(tamanho, tamanho, seed):
+        pass
+
+def rodar(algoritmos, tamanhos, repeticoes, seed):
+    """
+    Mede cada algoritmo em cada tamanho.
+
+    Retorna:
+        list[tuple]: (algoritmo, tamanho, segundos, bytes, estatísticas ou None)
+    """
+    linhas = []
+    for tamanho in tamanhos:
+        for nome in algoritmos:
+            gerar = lambda: gerar_labirinto_compacto(tamanho, tamanho, seed, nome)
+            segundos, lab = medir_tempo(gerar, repeticoes)
+            pico = medir_memoria(gerar)
+            linhas.append((nome, tamanho, segundos, pico, estatisticas(lab)))
+            print(f"   {nome:<12}{tamanho:>6}: {segundos:.3f}s", flush=True)
+        if 'eller' in algoritmos:
+            stream = lambda: _consumir_eller(tamanho, seed)
+            segundos, _ = medir_tempo(stream, repeticoes)
+            linhas.append(('eller/fluxo', tamanho, segundos, medir_memoria(stream), None))
+    return linhas
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os algoritmos de geração de labirintos")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[51, 201, 1001],
+                        help='Lados dos labirintos (ímpares)')
+    parser.add_argument('--algoritmos', nargs='+', default=list(ALGORITMOS), choices=list(ALGORITMOS))
+    parser.add_argument('--repeticoes', type=int, default=3, help='Execuções por medida de tempo')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"🧱 Geradores de labirinto: {', '.join(args.algoritmos)}")
+    print("=" * 72)
+    linhas = rodar(args.algoritmos, args.tamanhos, args.repeticoes, args.seed)
+
+    print()
+    print("📊 Resultado")
+    print(f"   {'algoritmo':<13}{'lado':>6}{'tempo (s)':>11}{'pico (KB)':>11}"
+          f"{'becos %':>9}{'bifurc. %':>11}{'corredor':>10}")
+    for nome, tamanho, segundos, pico, est in linhas:
+        if est is None:
+            extra = f"{'-':>9}{'-':>11}{'-':>10}"
+        else:
+            extra = f"{est['becos']:>9.1f}{est['bifurcacoes']:>11.1f}{est['corredor_medio']:>10.2f}"
+        print(f"   {nome:<13}{tamanho:>6}{segundos:>11.3f}{pico / 1024:>11,.0f}{extra}")
+
+if __name__ == '__main__':
+    main()
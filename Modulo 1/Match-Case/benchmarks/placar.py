@@ -0,0 +1,140 @@
+"""
+Benchmark do placar (SQLite).
+
+Preenche um placar temporário com partidas sintéticas (tamanhos do jogo e
+alguns livres, todos os algoritmos, sementes repetidas para os rankings
+por labirinto terem várias partidas) e mede:
+
+- gravação: em lotes e uma transação por partida, em uma amostra, e o
+  preenchimento completo
+- consultas: top N por labirinto, top N por tamanho e posição de um tempo,
+  com os índices e sem eles (NOT INDEXED), e a lista de tamanhos
+
+e mostra o plano de cada consulta (EXPLAIN QUERY PLAN).
+
+Como usar (a partir da pasta Match-Case/):
+    python benchmarks/placar.py
+    python benchmarks/placar.py --partidas 1000000 --consultas 500
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from aventura_pkg.geradores import ALGORITMOS
+from aventura_pkg.placar import Placar
+
+TAMANHOS = [21, 31, 41, 101, 1001]
+
+def partida_sintetica(rng, sementes):
+    tamanho = rng.choice(TAMANHOS)
+    otimo = rng.randint(tamanho, tamanho * tamanho // 4)
+    movimentos = otimo + int(rng.expovariate(1 / max(1, otimo)))
+    return (rng.randrange(sementes), rng.choice(list(ALGORITMOS)), tamanho, f"jogador{rng.randrange(50)}",
+            round(movimentos * rng.uniform(0.12, 0.4), 3), movimentos, otimo, 1.7e9 + rng.random() * 1e7)
+
+def preencher(placar, partidas, sementes, seed):
+    rng = random.Random(seed)
+    inicio = time.perf_counter()
+    for _ in range(partidas):
+        placar.registrar(*partida_sintetica(rng, sementes))
+    placar.gravar()
+    return time.perf_counter() - inicio
+
+def gravar_amostra(caminho, partidas, sementes, seed, lote):
+    # Com lote=1 cada partida é uma transação
+    rng = random.Random(seed)
+    linhas = [partida_sintetica(rng, sementes) for _ in range(partidas)]
+    placar = Placar(caminho, lote=lote)
+    inicio = time.perf_counter()
+    for linha in linhas:
+        placar.registrar(*linha)
+    placar.gravar()
+    segundos = time.perf_counter() - inicio
+    placar.fechar()
+    return segundos
+
+def consultas(rng, sementes, n):
+    """
+    (nome, sql, parâmetros) de cada consulta medida; {idx} vira "" ou "NOT INDEXED".
+    """
+    algoritmos = list(ALGORITMOS)
+    for _ in range(n):
+        tamanho = rng.choice(TAMANHOS)
+        labirinto = (tamanho, rng.choice(algoritmos), rng.randrange(sementes))
+        yield ("top 10 do labirinto",
+               "SELECT * FROM partidas {idx} WHERE tamanho = ? AND algoritmo = ? AND seed IS ? "
+               "ORDER BY segundos, movimentos LIMIT 10", labirinto)
+        yield ("top 10 do tamanho",
+               "SELECT * FROM partidas {idx} WHERE tamanho = ? ORDER BY segundos, movimentos LIMIT 10",
+               (tamanho,))
+        yield ("posição de um tempo",
+               "SELECT COUNT(*) FROM partidas {idx} WHERE tamanho = ? AND algoritmo = ? AND seed IS ? "
+               "AND segundos < ?", labirinto + (rng.uniform(1, 100),))
+
+def medir_consultas(conexao, rng_seed, sementes, n, indexado):
+    tempos = {}
+    planos = {}
+    idx = "" if indexado else "NOT INDEXED"
+    for nome, sql, parametros in consultas(random.Random(rng_seed), sementes, n):
+        sql = sql.format(idx=idx)
+        planos.setdefault(nome, " | ".join(p[3] for p in conexao.execute("EXPLAIN QUERY PLAN " + sql, parametros)))
+        inicio = time.perf_counter()
+        conexao.execute(sql, parametros).fetchall()
+        tempos.setdefault(nome, []).append(time.perf_counter() - inicio)
+    return tempos, planos
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede gravação e consultas do placar")
+    parser.add_argument('--partidas', type=int, default=300_000, help='Partidas sintéticas gravadas')
+    parser.add_argument('--sementes', type=int, default=20_000, help='Sementes distintas (labirintos)')
+    parser.add_argument('--consultas', type=int, default=200, help='Consultas de cada tipo')
+    parser.add_argument('--lote', type=int, default=1000, help='Tamanho do lote de gravação')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"🏅 Placar: {args.partidas:,} partidas, {args.sementes:,} sementes, lote {args.lote}")
+    print("=" * 78)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "placar.db")
+        amostra = min(5000, args.partidas)
+        for nome, lote in (("uma por vez", 1), (f"lotes de {args.lote}", args.lote)):
+            segundos = gravar_amostra(os.path.join(pasta, f"amostra{lote}.db"), amostra, args.sementes,
+                                      args.seed, lote)
+            print(f"✍️  {nome:<16}{amostra / segundos:>12,.0f} partidas/s ({amostra:,} partidas)")
+
+        placar = Placar(caminho, lote=args.lote)
+        segundos = preencher(placar, args.partidas, args.sementes, args.seed)
+        print(f"✍️  {'preenchimento':<16}{args.partidas / segundos:>12,.0f} partidas/s "
+              f"({args.partidas:,} partidas em {segundos:.1f}s)")
+
+        inicio = time.perf_counter()
+        tamanhos = placar.tamanhos()
+        print(f"📏 tamanhos {tamanhos} em {(time.perf_counter() - inicio) * 1000:.2f} ms")
+        print(f"💾 arquivo: {os.path.getsize(caminho) / 1e6:.1f} MB")
+        print()
+
+        conexao = sqlite3.connect(caminho)
+        print(f"   {'consulta':<22}{'índice':<8}{'média (ms)':>12}{'p95 (ms)':>10}   plano")
+        for indexado in (True, False):
+            # Sem índice cada consulta varre a tabela: poucas bastam
+            n = args.consultas if indexado else max(1, args.consultas // 20)
+            tempos, planos = medir_consultas(conexao, args.seed, args.sementes, n, indexado)
+            for nome, valores in tempos.items():
+                valores.sort()
+                media = sum(valores) / len(valores) * 1000
+                p95 = valores[min(len(valores) - 1, int(len(valores) * 0.95))] * 1000
+                print(f"   {nome:<22}{'sim' if indexado else 'não':<8}{media:>12.3f}{p95:>10.3f}   {planos[nome]}")
+        conexao.close()
+        placar.fechar()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark dos resolvedores de labirinto (BFS, A* e BFS bidirecional).
+
+Para cada tamanho gera um labirinto e resolve duas consultas:
+
+- canto: de (1, 1) até o canto oposto, o pior caso típico
+- maçã: de (1, 1) até a maçã, como no jogo
+
+Mede tempo, células expandidas (também em % das células de caminho) e o
+comprimento do caminho, que precisa ser o mesmo nos três algoritmos.
+Também mede o mapa de distâncias usado pelas dicas e o custo de uma dica
+depois dele.
+
+Como usar (a partir da pasta Match-Case/):
+    python benchmarks/resolvedores.py
+    python benchmarks/resolvedores.py --tamanhos 101 1001 --algoritmo kruskal
+"""
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from aventura_pkg import resolvedor
+from aventura_pkg.geradores import ALGORITMOS, CAMINHO
+from aventura_pkg.labirinto import gerar_labirinto_compacto
+
+def cronometrar(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - inicio, resultado
+
+def rodar(tamanhos, algoritmo, seed):
+    """
+    Resolve as consultas de cada tamanho com todos os resolvedores.
+
+    Retorna:
+        list[tuple]: (tamanho, consulta, resolvedor, segundos, expandidos, % expandido, movimentos)
+    """
+    linhas = []
+    for tamanho in tamanhos:
+        segundos, maze = cronometrar(gerar_labirinto_compacto, tamanho, tamanho, seed, algoritmo)
+        caminhos = maze.grid.count(CAMINHO)
+        print(f"🧱 {maze}: gerado em {segundos:.2f}s", flush=True)
+
+        consultas = {'canto': (maze.height - 2, maze.width - 2), 'maçã': maze.apple_pos}
+        for consulta, fim in consultas.items():
+            movimentos = set()
+            for nome, func in resolvedor.RESOLVEDORES.items():
+                segundos, sol = cronometrar(func, maze, (1, 1), fim)
+                movimentos.add(sol.movimentos)
+                linhas.append((tamanho, consulta, nome, segundos, sol.expandidos,
+                               100 * sol.expandidos / caminhos, sol.movimentos))
+                print(f"   {consulta:<6}{nome:<14}{segundos:>8.3f}s", flush=True)
+            if len(movimentos) != 1:
+                raise AssertionError(f"Resolvedores discordam em {maze} ({consulta}): {movimentos}")
+
+        segundos, dist = cronometrar(resolvedor.mapa_distancias, maze, maze.apple_pos)
+        inicio = time.perf_counter()
+        for _ in range(1000):
+            resolvedor.proximos_passos(maze, dist, (1, 1), 1)
+        dica_us = (time.perf_counter() - inicio) * 1000
+        print(f"   mapa de distâncias {segundos:.3f}s, dica {dica_us:.1f} µs", flush=True)
+        linhas.append((tamanho, 'dicas', 'mapa', segundos, caminhos, 100.0, dist[1 * maze.width + 1]))
+    return linhas
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os resolvedores de labirinto")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[101, 1001, 2001, 4001],
+                        help='Lados dos labirintos (ímpares)')
+    parser.add_argument('--algoritmo', default='backtracker', choices=list(ALGORITMOS),
+                        help='Algoritmo de geração dos labirintos')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"🧭 Resolvedores: {', '.join(resolvedor.RESOLVEDORES)} ({args.algoritmo})")
+    print("=" * 72)
+    linhas = rodar(args.tamanhos, args.algoritmo, args.seed)
+
+    print()
+    print("📊 Resultado")
+    print(f"   {'lado':>6}  {'consulta':<9}{'resolvedor':<14}{'tempo (s)':>10}"
+          f"{'expandidos':>13}{'% caminho':>11}{'movimentos':>12}")
+    for tamanho, consulta, nome, segundos, expandidos, pct, movimentos in linhas:
+        print(f"   {tamanho:>6}  {consulta:<9}{nome:<14}{segundos:>10.3f}"
+              f"{expandidos:>13,}{pct:>11.1f}{movimentos:>12,}")
+
+if __name__ == '__main__':
+    main()
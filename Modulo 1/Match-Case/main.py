@@ -1,8 +1,12 @@
 import tkinter as tk
-from tkinter import simpledialog
-from aventura_pkg.labirinto import gerar_labirinto
+from tkinter import simpledialog, ttk
+from aventura_pkg.labirinto import gerar_labirinto_compacto
+from aventura_pkg.geradores import ALGORITMOS
 from aventura_pkg.jogador import GameWindow
-from aventura_pkg.utils import imprime_instrucoes
+from aventura_pkg.pregeracao import PoolLabirintos
+from aventura_pkg.placar import ARQUIVO_PADRAO, Placar
+from aventura_pkg import audio, replay
+from aventura_pkg.utils import imprime_instrucoes, tela_placar
 import argparse
 import sys
 
@@ -38,6 +42,14 @@ def criar_parser():
         help='Cor da bolinha do jogador: vermelho/red, amarelo/yellow, azul/blue (padrão: azul)'
     )
     
+    parser.add_argument(
+        '--jogador',
+        type=str,
+        default="Você",
+        metavar='<NOME>',
+        help='Nome do jogador no placar (padrão: Você)'
+    )
+    
     parser.add_argument(
         '--dificuldade',
         type=str,
@@ -47,6 +59,83 @@ def criar_parser():
         help='Dificuldade do jogo: facil, medio, dificil (se não especificado, pergunta no início)'
     )
     
+    parser.add_argument(
+        '--tamanho',
+        type=int,
+        default=None,
+        metavar='<N>',
+        help='Tamanho do labirinto (N x N), substitui a dificuldade. Ex.: --tamanho 1001'
+    )
+    
+    parser.add_argument(
+        '--algoritmo',
+        type=str,
+        default="backtracker",
+        choices=list(ALGORITMOS),
+        metavar='<ALGORITMO>',
+        help=f'Algoritmo de geração do labirinto: {", ".join(ALGORITMOS)} (padrão: backtracker)'
+    )
+    
+    parser.add_argument(
+        '--medir-quadros',
+        action='store_true',
+        help='Mostra o tempo de cada quadro (ms) e um resumo no terminal ao final'
+    )
+    
+    parser.add_argument(
+        '--fila',
+        type=int,
+        default=2,
+        metavar='<N>',
+        help='Labirintos pré-gerados em segundo plano por dificuldade (padrão: 2)'
+    )
+    
+    parser.add_argument(
+        '--atraso-geracao',
+        type=int,
+        default=0,
+        metavar='<MS>',
+        help='Espera antes de cada geração em segundo plano, em ms (padrão: 0)'
+    )
+    
+    parser.add_argument(
+        '--sem-som',
+        action='store_true',
+        help='Desliga o som de vitória (backend de áudio nulo)'
+    )
+    
+    parser.add_argument(
+        '--placar',
+        type=str,
+        default=ARQUIVO_PADRAO,
+        metavar='<ARQUIVO>',
+        help='Banco SQLite com os melhores tempos (padrão: placar.db na pasta do jogo)'
+    )
+    
+    parser.add_argument(
+        '--gravar-replay',
+        type=str,
+        default=None,
+        metavar='<ARQUIVO>',
+        help='Grava a partida (teclas e labirinto) em um arquivo .rep'
+    )
+    
+    parser.add_argument(
+        '--replay',
+        type=str,
+        default=None,
+        metavar='<ARQUIVO>',
+        help='Assiste a uma partida gravada com --gravar-replay'
+    )
+    
+    parser.add_argument(
+        '--velocidade',
+        type=float,
+        default=1.0,
+        metavar='<X>',
+        help='Velocidade da reprodução do replay (padrão: 1.0)'
+    )
+    
     parser.add_argument(
         '--help', '-h',
         action='store_true',
@@ -117,12 +206,63 @@ def mostrar_ajuda_personalizada():
       Padrão: azul
       Exemplo: --color vermelho
       
+  --jogador <NOME>
+      Nome gravado no placar a cada vitória.
+      Padrão: Você
+      Exemplo: --jogador Rafael
+      
   --dificuldade <NIVEL>
       Inicia o jogo com a dificuldade especificada.
       Níveis: facil, medio, dificil (aceita com ou sem acento)
       Se não especificado, será perguntado no início do jogo.
       Exemplo: --dificuldade facil
       
+  --tamanho <N>
+      Gera um labirinto N x N, ignorando a dificuldade.
+      Labirintos maiores que a tela são exibidos com câmera
+      que acompanha o jogador.
+      Exemplo: --tamanho 1001
+      
+  --algoritmo <ALGORITMO>
+      Escolhe o algoritmo que gera o labirinto.
+      Algoritmos: backtracker, kruskal, prim, eller, wilson
+      Padrão: backtracker (corredores longos; os demais têm mais
+      bifurcações e becos curtos)
+      Exemplo: --algoritmo kruskal
+      
+  --medir-quadros
+      Mostra na barra de status o tempo de cada quadro (em ms) e
+      imprime média, p95 e máximo no terminal ao final da partida.
+      
+  --fila <N>
+      Quantos labirintos ficam prontos, gerados em segundo plano,
+      para cada dificuldade. "Jogar" usa um deles na hora; com a
+      fila vazia, o menu mostra uma barra de progresso.
+      Padrão: 2 (0 gera só quando "Jogar" é clicado)
+      
+  --atraso-geracao <MS>
+      Espera antes de cada geração em segundo plano, para a
+      reposição da fila não disputar a CPU com a partida.
+      Padrão: 0
+      
+  --sem-som
+      Não toca o som de vitória (útil sem placa de áudio).
+      
+  --placar <ARQUIVO>
+      Banco SQLite onde as vitórias são registradas (tempo,
+      movimentos, semente, algoritmo e tamanho do labirinto).
+      O botão "Placar" do menu mostra os melhores tempos.
+      Padrão: placar.db na pasta do jogo
+      
+  --gravar-replay <ARQUIVO>
+      Grava a partida em um arquivo .rep (labirinto e teclas com o
+      instante de cada uma) ao vencer ou sair.
+      Exemplo: --gravar-replay partida.rep
+      
+  --replay <ARQUIVO> [--velocidade <X>]
+      Assiste a uma partida gravada, na velocidade escolhida.
+      Exemplo: --replay partida.rep --velocidade 2
+      
   --help, -h
       Mostra esta mensagem de ajuda.
 
@@ -139,12 +279,16 @@ def mostrar_ajuda_personalizada():
   
   # Tudo personalizado
   python main.py --name "Desafio Extremo" --color amarelo --dificuldade dificil
+  
+  # Labirinto gerado pelo algoritmo de Wilson
+  python main.py --algoritmo wilson
 
 🎮 CONTROLES NO JOGO:
   • W, ↑       - Mover para cima
   • S, ↓       - Mover para baixo
   • A, ←       - Mover para esquerda
   • D, →       - Mover para direita
+  • H          - Dica: destaca os próximos passos até a maçã
   • Q          - Sair do jogo
 
 🎯 OBJETIVO:
@@ -159,6 +303,7 @@ def mostrar_ajuda_personalizada():
   • Use a dificuldade fácil para se familiarizar com o jogo
   • O cronômetro começa assim que o jogo inicia
   • Tente completar com o menor número de movimentos!
+  • Ao vencer, o jogo mostra o caminho ótimo para comparar
 """
     
     texto.insert("1.0", ajuda_texto)
@@ -239,7 +384,64 @@ def obter_tamanho_labirinto(dificuldade):
             return 31
 
 
-def iniciar_jogo(root, dificuldade_preset=None, cor_jogador="#40a9ff"):
+class IndicadorGeracao:
+    """
+    Barra de progresso do menu, exibida enquanto o labirinto é gerado.
+    
+    Também desativa o botão "Jogar" durante a espera, para um segundo
+    clique não abrir duas partidas.
+    """
+    
+    def __init__(self, root, botao):
+        self.botao = botao
+        self.frame = tk.Frame(root)
+        self.rotulo = tk.Label(self.frame, text="", font=("Segoe UI", 9))
+        self.barra = ttk.Progressbar(self.frame, mode="indeterminate", length=220)
+        self.rotulo.pack()
+        self.barra.pack(pady=2)
+    
+    def iniciar(self, tamanho):
+        if not self.frame.winfo_ismapped():
+            self.rotulo.config(text=f"⏳ Gerando labirinto {tamanho}x{tamanho}...")
+            self.frame.pack(pady=4)
+            self.barra.start(15)
+            self.botao.config(state="disabled")
+    
+    def parar(self):
+        self.barra.stop()
+        self.frame.pack_forget()
+        self.botao.config(state="normal")
+
+
+def esperar_labirinto(root, pool, tamanho, ao_receber, indicador=None, intervalo_ms=50):
+    """
+    Retira um labirinto do pool sem bloquear a interface.
+    
+    Se a fila estiver vazia, mostra o indicador e tenta de novo a cada
+    intervalo_ms até o processo de fundo entregar o labirinto.
+    
+    Args:
+        root (tk.Tk): Janela principal (para agendar as novas tentativas).
+        pool (PoolLabirintos): Pool de labirintos pré-gerados.
+        tamanho (int): Tamanho do labirinto.
+        ao_receber (callable): Chamado com o Labirinto quando ele estiver pronto.
+        indicador (IndicadorGeracao, optional): Barra de progresso do menu.
+        intervalo_ms (int): Intervalo entre as tentativas.
+    """
+    lab = pool.retirar(tamanho)
+    if lab is None:
+        if indicador:
+            indicador.iniciar(tamanho)
+        root.after(intervalo_ms, esperar_labirinto, root, pool, tamanho, ao_receber, indicador, intervalo_ms)
+        return
+    if indicador:
+        indicador.parar()
+    ao_receber(lab)
+
+
+def iniciar_jogo(root, dificuldade_preset=None, cor_jogador="#40a9ff", algoritmo="backtracker",
+                 medir_quadros=False, tamanho=None, replay_path=None, pool=None, indicador=None,
+                 placar=None, jogador="Você"):
     """
     Inicia uma nova partida do jogo com as configurações especificadas.
     
@@ -247,18 +449,39 @@ def iniciar_jogo(root, dificuldade_preset=None, cor_jogador="#40a9ff"):
         root (tk.Tk): Janela principal do Tkinter.
         dificuldade_preset (str, optional): Dificuldade pré-definida via CLI.
         cor_jogador (str): Código hexadecimal da cor da bolinha do jogador.
+        algoritmo (str): Algoritmo de geração do labirinto.
+        medir_quadros (bool): Exibe o tempo de quadro de cada movimento.
+        tamanho (int, optional): Tamanho do labirinto; se informado, a
+            dificuldade não é perguntada.
+        replay_path (str, optional): Arquivo onde a partida é gravada.
+        pool (PoolLabirintos, optional): Labirintos pré-gerados; sem ele, o
+            labirinto é gerado aqui mesmo, bloqueando a interface.
+        indicador (IndicadorGeracao, optional): Progresso exibido enquanto
+            o pool não tem labirinto pronto.
+        placar (Placar, optional): Placar onde a vitória é registrada.
+        jogador (str): Nome do jogador no placar.
     """
-    if dificuldade_preset:
-        dificuldade = dificuldade_preset
-    else:
-        dificuldade = escolher_dificuldade()
+    if tamanho is None:
+        if dificuldade_preset:
+            dificuldade = dificuldade_preset
+        else:
+            dificuldade = escolher_dificuldade()
+        tamanho = obter_tamanho_labirinto(dificuldade)
+    
+    # A grade compacta vai direto para o GameWindow, sem lista de listas
+    def abrir(lab):
+        GameWindow(root, lab, lab.apple_pos, victory_sound="victory.wav", player_color=cor_jogador,
+                   medir_quadros=medir_quadros, replay_path=replay_path, placar=placar, jogador=jogador)
     
-    tamanho = obter_tamanho_labirinto(dificuldade)
-    lab, apple_pos = gerar_labirinto(tamanho, tamanho)
-    GameWindow(root, lab, apple_pos, victory_sound="victory.wav", player_color=cor_jogador)
+    if pool is None:
+        abrir(gerar_labirinto_compacto(tamanho, tamanho, algoritmo=algoritmo))
+    else:
+        esperar_labirinto(root, pool, tamanho, abrir, indicador)
 
 
-def criar_menu(nome_janela="Aventura no Labirinto", dificuldade_preset=None, cor_jogador="#40a9ff"):
+def criar_menu(nome_janela="Aventura no Labirinto", dificuldade_preset=None, cor_jogador="#40a9ff",
+               algoritmo="backtracker", medir_quadros=False, tamanho=None, replay_path=None,
+               fila=2, atraso_geracao=0, arquivo_placar=ARQUIVO_PADRAO, jogador="Você"):
     """
     Cria e exibe o menu principal do jogo.
     
@@ -266,10 +489,30 @@ def criar_menu(nome_janela="Aventura no Labirinto", dificuldade_preset=None, cor
         nome_janela (str): Título da janela principal.
         dificuldade_preset (str, optional): Dificuldade pré-configurada.
         cor_jogador (str): Cor da bolinha do jogador em hexadecimal.
+        algoritmo (str): Algoritmo de geração do labirinto.
+        medir_quadros (bool): Exibe o tempo de quadro de cada movimento.
+        tamanho (int, optional): Tamanho fixo do labirinto.
+        replay_path (str, optional): Arquivo onde as partidas são gravadas.
+        fila (int): Labirintos pré-gerados por dificuldade.
+        atraso_geracao (int): Espera (ms) antes de cada geração em segundo plano.
+        arquivo_placar (str): Banco SQLite do placar.
+        jogador (str): Nome do jogador no placar.
     """
+    # O pool começa a gerar antes do Tk subir, enquanto o menu é montado
+    pool = PoolLabirintos(algoritmo, profundidade=fila, atraso=atraso_geracao / 1000)
+    if tamanho is not None:
+        pool.aquecer([tamanho])
+    elif dificuldade_preset:
+        pool.aquecer([obter_tamanho_labirinto(dificuldade_preset)])
+    else:
+        pool.aquecer(obter_tamanho_labirinto(d) for d in ("facil", "medio", "dificil"))
+    
+    placar = Placar(arquivo_placar)
+    dificuldades = {nome: obter_tamanho_labirinto(nome) for nome in ("Fácil", "Médio", "Difícil")}
+    
     root = tk.Tk()
     root.title(nome_janela)
-    root.geometry("420x280")
+    root.geometry("420x360")
     
     lbl = tk.Label(root, text="Aventura no Labirinto", font=("Segoe UI", 18, "bold"))
     lbl.pack(pady=12)
@@ -278,15 +521,42 @@ def criar_menu(nome_janela="Aventura no Labirinto", dificuldade_preset=None, cor
         root, 
         text="Jogar", 
         width=24, 
-        command=lambda: iniciar_jogo(root, dificuldade_preset, cor_jogador)
+        command=lambda: iniciar_jogo(root, dificuldade_preset, cor_jogador, algoritmo, medir_quadros, tamanho,
+                             replay_path, pool, indicador, placar, jogador)
     )
     btn_instru = tk.Button(root, text="Instruções", width=24, command=imprime_instrucoes)
+    btn_placar = tk.Button(root, text="Placar", width=24, command=lambda: tela_placar(root, placar, dificuldades))
     btn_sair = tk.Button(root, text="Sair", width=24, command=root.destroy)
 
     btn_play.pack(pady=10)
     btn_instru.pack(pady=6)
+    btn_placar.pack(pady=6)
     btn_sair.pack(pady=6)
+    indicador = IndicadorGeracao(root, btn_play)
+
+    try:
+        root.mainloop()
+    finally:
+        pool.fechar()
+        placar.fechar()
 
+
+def assistir_replay(caminho, velocidade=1.0, cor_jogador="#40a9ff"):
+    """
+    Abre uma partida gravada e a reproduz na janela do jogo.
+    
+    Args:
+        caminho (str): Arquivo .rep gravado com --gravar-replay.
+        velocidade (float): Multiplicador da velocidade de reprodução.
+        cor_jogador (str): Cor da bolinha do jogador em hexadecimal.
+    """
+    gravado = replay.carregar_replay(caminho)
+    root = tk.Tk()
+    root.withdraw()
+    janela = GameWindow(root, gravado.maze, gravado.maze.apple_pos, player_color=cor_jogador)
+    janela.window.title(f"Replay - {caminho}")
+    janela.window.protocol("WM_DELETE_WINDOW", root.destroy)
+    janela.reproduzir_replay(gravado, velocidade)
     root.mainloop()
 
 
@@ -299,13 +569,32 @@ if __name__ == "__main__":
         sys.exit(0)
     
     args = parser.parse_args()
+    if args.tamanho is not None and args.tamanho < 5:
+        parser.error("--tamanho deve ser pelo menos 5")
+    if args.fila < 0 or args.atraso_geracao < 0:
+        parser.error("--fila e --atraso-geracao não podem ser negativos")
     
     # Normaliza a cor escolhida
     cor_jogador = normalizar_cor(args.color)
     
+    # Escolhe a biblioteca de áudio e carrega o som de vitória uma vez só
+    audio.iniciar_servico("nulo" if args.sem_som else None)
+    
+    if args.replay:
+        assistir_replay(args.replay, args.velocidade, cor_jogador)
+        sys.exit(0)
+    
     # Inicia o menu com as configurações
     criar_menu(
         nome_janela=args.name,
         dificuldade_preset=args.dificuldade,
-        cor_jogador=cor_jogador
+        cor_jogador=cor_jogador,
+        algoritmo=args.algoritmo,
+        medir_quadros=args.medir_quadros,
+        tamanho=args.tamanho,
+        replay_path=args.gravar_replay,
+        fila=args.fila,
+        atraso_geracao=args.atraso_geracao,
+        arquivo_placar=args.placar,
+        jogador=args.jogador
     )
\ No newline at end of file
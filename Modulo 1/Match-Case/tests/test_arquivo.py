@@ -0,0 +1,161 @@
+"""
+Testes dos formatos binários de labirinto (.lab) e de replay (.rep).
+
+Como rodar (a partir da pasta Match-Case/):
+    python -m pytest -q tests
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from aventura_pkg import arquivo, replay
+from aventura_pkg.agentes import AgenteParede
+from aventura_pkg.geradores import gerar_eller, gerar_linhas_eller
+from aventura_pkg.labirinto import Labirinto, gerar_labirinto_compacto
+from aventura_pkg.motor import Partida
+
+# Larguras que não são múltiplas de 8: a última coluna de cada linha
+# divide o byte com os bits de preenchimento
+TAMANHOS = [(5, 7), (9, 5), (15, 9), (17, 11), (23, 21)]
+
+@pytest.mark.parametrize("width,height", TAMANHOS)
+def test_lab_ida_e_volta(tmp_path, width, height):
+    maze = gerar_labirinto_compacto(width, height, seed=7, algoritmo="kruskal")
+    caminho = str(tmp_path / "lab.lab")
+
+    tamanho = arquivo.salvar_labirinto(maze, caminho)
+    assert tamanho == arquivo.CABECALHO.size + arquivo.bytes_por_linha(width) * height
+    assert os.path.getsize(caminho) == tamanho
+
+    lido = arquivo.carregar_labirinto(caminho)
+    assert (lido.width, lido.height) == (width, height)
+    assert lido.grid == maze.grid
+    assert lido.apple_pos == maze.apple_pos
+    assert lido.seed == 7 and lido.algoritmo == "kruskal"
+
+def test_lab_sem_semente():
+    maze = Labirinto.de_lista([list("###"), list("# #"), list("###")], (1, 1))
+    lido = arquivo.desempacotar(arquivo.empacotar(maze))
+    assert lido.seed is None
+    assert lido.grid == maze.grid
+
+@pytest.mark.parametrize("width,height", TAMANHOS)
+def test_mapeado_concorda_com_a_grade(tmp_path, width, height):
+    maze = gerar_labirinto_compacto(width, height, seed=3)
+    caminho = str(tmp_path / "lab.lab")
+    arquivo.salvar_labirinto(maze, caminho)
+
+    with arquivo.abrir_labirinto(caminho) as mapeado:
+        assert (mapeado.width, mapeado.height) == (width, height)
+        assert mapeado.apple_pos == maze.apple_pos
+        # Inclui posições fora da grade
+        for r in range(-1, height + 1):
+            for c in range(-1, width + 1):
+                assert mapeado.eh_caminho(r, c) == maze.eh_caminho(r, c), (r, c)
+        for r in range(height):
+            assert mapeado.linha(r) == maze.linha(r)
+        assert mapeado.carregar().grid == maze.grid
+
+        # O labirinto mapeado basta para jogar uma partida headless
+        partida = Partida(mapeado)
+        assert partida.passo('cima') is False
+
+@pytest.mark.parametrize("width,height", [(9, 7), (21, 15), (31, 31)])
+def test_salvar_linhas_de_eller_igual_a_grade_inteira(tmp_path, width, height):
+    caminho = str(tmp_path / "eller.lab")
+    tamanho = arquivo.salvar_linhas(caminho, gerar_linhas_eller(width, height, seed=11),
+                                    width, height, (1, 1), seed=11)
+    assert os.path.getsize(caminho) == tamanho
+
+    lido = arquivo.carregar_labirinto(caminho)
+    assert lido.grid == gerar_eller(width, height, random.Random(11))
+    assert lido.seed == 11 and lido.algoritmo == "eller"
+
+def test_salvar_linhas_rejeita_altura_errada(tmp_path):
+    caminho = str(tmp_path / "curto.lab")
+    with pytest.raises(ValueError):
+        arquivo.salvar_linhas(caminho, gerar_linhas_eller(9, 7, seed=1), 9, 9, (1, 1))
+    assert not os.path.exists(caminho)
+
+def test_formato_invalido(tmp_path):
+    dados = arquivo.empacotar(gerar_labirinto_compacto(15, 9, seed=1))
+
+    with pytest.raises(arquivo.FormatoInvalido):
+        arquivo.desempacotar(b'XXXX' + dados[4:])
+    with pytest.raises(arquivo.FormatoInvalido):
+        arquivo.desempacotar(dados[:arquivo.CABECALHO.size - 1])
+    with pytest.raises(arquivo.FormatoInvalido):
+        arquivo.desempacotar(dados[:-1])
+
+    caminho = tmp_path / "truncado.lab"
+    caminho.write_bytes(dados[:-1])
+    with pytest.raises(arquivo.FormatoInvalido):
+        arquivo.abrir_labirinto(str(caminho))
+
+def _partida_gravada(maze):
+    """
+    Joga com o seguidor de parede, gravando também colisões e uma dica.
+    """
+    partida = Partida(maze)
+    gravador = replay.GravadorReplay(maze)
+    agente = AgenteParede()
+    agente.iniciar(partida)
+    for acao in ('cima', 'esquerda', 'dica'):
+        gravador.registrar(acao)
+        if acao != 'dica':
+            partida.passo(acao)
+    while not partida.venceu:
+        direcao = agente.escolher(partida)
+        gravador.registrar(direcao)
+        partida.passo(direcao)
+    return partida, gravador
+
+@pytest.mark.parametrize("embutir", [True, False], ids=["embutido", "so-semente"])
+def test_rep_ida_e_volta(tmp_path, embutir):
+    maze = gerar_labirinto_compacto(17, 13, seed=5, algoritmo="prim")
+    partida, gravador = _partida_gravada(maze)
+    caminho = str(tmp_path / "partida.rep")
+
+    tamanho = gravador.salvar(caminho, partida, embutir=embutir)
+    assert os.path.getsize(caminho) == tamanho
+
+    lido = replay.carregar_replay(caminho)
+    assert lido.maze.grid == maze.grid
+    assert lido.maze.apple_pos == maze.apple_pos
+    assert lido.eventos == gravador.eventos
+    assert lido.movimentos == partida.movimentos
+    assert lido.venceu
+
+    refeita = replay.reproduzir(lido)
+    assert refeita.colisoes == partida.colisoes
+    assert replay.verificar(lido)
+    assert replay.verificar(caminho)
+
+    # Um resultado adulterado não confere
+    assert not replay.verificar(lido._replace(movimentos=lido.movimentos + 1))
+
+def test_rep_sem_semente_precisa_embutir():
+    maze = Labirinto.de_lista([list("####"), list("#  #"), list("####")], (1, 2))
+    partida, gravador = _partida_gravada(maze)
+
+    with pytest.raises(ValueError):
+        gravador.empacotar(partida, embutir=False)
+    assert replay.verificar(replay.desempacotar(gravador.empacotar(partida)))
+
+def test_rep_formato_invalido():
+    maze = gerar_labirinto_compacto(9, 9, seed=2)
+    partida, gravador = _partida_gravada(maze)
+    dados = gravador.empacotar(partida)
+
+    with pytest.raises(arquivo.FormatoInvalido):
+        replay.desempacotar(b'LABZ' + dados[4:])
+    with pytest.raises(arquivo.FormatoInvalido):
+        replay.desempacotar(dados[:-1])
+    with pytest.raises(arquivo.FormatoInvalido):
+        replay.desempacotar(dados[:replay.CABECALHO.size - 1])
@@ -0,0 +1,59 @@
+"""
+Testes do serviço de áudio com o backend nulo (não precisa de placa de som).
+
+Como rodar (a partir da pasta Match-Case/):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import wave
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from aventura_pkg import audio
+
+@pytest.fixture
+def som(tmp_path):
+    caminho = str(tmp_path / "vitoria.wav")
+    with wave.open(caminho, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(8000)
+        f.writeframes(b"\0\0" * 800)
+    return caminho
+
+def test_servico_nulo_toca_os_sons_pedidos(som):
+    servico = audio.ServicoAudio([som], backend="nulo")
+    try:
+        assert isinstance(servico.backend, audio.BackendNulo)
+        assert servico.amostras[som] == b"\0\0" * 800
+        assert servico.segundos_inicio > 0
+
+        for _ in range(3):
+            servico.tocar(som)
+        servico.aguardar()
+
+        assert servico.backend.tocados == 3
+        assert len(servico.latencias) == 3
+        assert all(latencia >= 0 for latencia in servico.latencias)
+    finally:
+        servico.fechar()
+    assert not servico._thread.is_alive()
+
+def test_som_ausente_nao_toca(tmp_path):
+    servico = audio.ServicoAudio([], backend="nulo")
+    try:
+        servico.tocar(str(tmp_path / "nao_existe.wav"))
+        servico.aguardar()
+        assert servico.backend.tocados == 0
+        assert len(servico.latencias) == 0
+    finally:
+        servico.fechar()
+
+def test_backend_desconhecido():
+    with pytest.raises(ValueError):
+        audio.escolher_backend("gramofone")
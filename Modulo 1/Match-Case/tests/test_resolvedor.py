@@ -0,0 +1,69 @@
+"""
+Testes dos resolvedores sobre labirintos de todos os geradores registrados.
+
+Como rodar (a partir da pasta Match-Case/):
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from aventura_pkg import resolvedor
+from aventura_pkg.geradores import ALGORITMOS
+from aventura_pkg.labirinto import gerar_labirinto_compacto
+
+TAMANHOS = [(5, 5), (11, 7), (21, 15)]
+
+LABIRINTOS = [
+    pytest.param(algoritmo, width, height, seed, id=f"{algoritmo}-{width}x{height}-{seed}")
+    for algoritmo in sorted(ALGORITMOS)
+    for width, height in TAMANHOS
+    for seed in (1, 2, 3)
+]
+
+def _vizinhos(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+
+@pytest.mark.parametrize("algoritmo,width,height,seed", LABIRINTOS)
+def test_resolvedores_concordam_no_caminho_mais_curto(algoritmo, width, height, seed):
+    maze = gerar_labirinto_compacto(width, height, seed, algoritmo)
+    inicio, fim = (1, 1), maze.apple_pos
+
+    solucoes = [func(maze, inicio, fim) for func in resolvedor.RESOLVEDORES.values()]
+    movimentos = {s.algoritmo: s.movimentos for s in solucoes}
+    assert len(set(movimentos.values())) == 1, movimentos
+
+    dist = resolvedor.mapa_distancias(maze, fim)
+    assert resolvedor.distancia(maze, dist, inicio) == solucoes[0].movimentos
+
+    for solucao in solucoes:
+        caminho = solucao.caminho
+        assert caminho[0] == inicio and caminho[-1] == fim
+        assert all(maze.eh_caminho(r, c) for r, c in caminho)
+        assert all(_vizinhos(a, b) for a, b in zip(caminho, caminho[1:]))
+
+@pytest.mark.parametrize("algoritmo,width,height,seed", LABIRINTOS)
+def test_proximos_passos_segue_um_caminho_mais_curto(algoritmo, width, height, seed):
+    maze = gerar_labirinto_compacto(width, height, seed, algoritmo)
+    dist = resolvedor.mapa_distancias(maze, maze.apple_pos)
+    restantes = resolvedor.distancia(maze, dist, (1, 1))
+
+    passos = resolvedor.proximos_passos(maze, dist, (1, 1), passos=width * height)
+    assert len(passos) == restantes
+    if restantes:
+        assert passos[-1] == maze.apple_pos
+
+    anterior = (1, 1)
+    for esperado, pos in enumerate(passos, 1):
+        assert _vizinhos(anterior, pos)
+        assert resolvedor.distancia(maze, dist, pos) == restantes - esperado
+        anterior = pos
+
+    # O limite de passos corta o mesmo caminho
+    assert resolvedor.proximos_passos(maze, dist, (1, 1), passos=3) == passos[:3]
+    assert resolvedor.proximos_passos(maze, dist, maze.apple_pos) == []
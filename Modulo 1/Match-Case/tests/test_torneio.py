@@ -0,0 +1,99 @@
+"""
+Testes do motor, dos agentes e do torneio em modo headless (sem Tk).
+
+Como rodar (a partir da pasta Match-Case/):
+    python -m pytest -q tests
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from aventura_pkg import resolvedor
+from aventura_pkg.agentes import AGENTES, jogar
+from aventura_pkg.labirinto import CAMINHO, Labirinto, gerar_labirinto_compacto
+from aventura_pkg.motor import Partida
+from aventura_pkg.torneio import rodar_torneio
+
+# Corredor em L: (1,1) -> (1,3) -> (3,3), com a maçã no fim
+CORREDOR = [
+    list("#####"),
+    list("#   #"),
+    list("### #"),
+    list("### #"),
+    list("#####"),
+]
+
+def test_passo_bate_anda_e_vence():
+    partida = Partida(Labirinto.de_lista(CORREDOR, (3, 3)))
+    assert partida.posicao == (1, 1) and not partida.venceu
+
+    assert partida.passo('cima') is False
+    assert partida.passo('esquerda') is False
+    assert partida.colisoes == 2 and partida.movimentos == 0
+    assert partida.posicao == (1, 1)
+
+    for direcao in ('direita', 'direita', 'baixo'):
+        assert partida.passo(direcao) is True
+    assert partida.posicao == (2, 3) and not partida.venceu
+
+    assert partida.passo('baixo') is True
+    assert partida.venceu
+    assert partida.movimentos == 4 and partida.colisoes == 2
+
+    # Depois da vitória a partida não anda mais
+    assert partida.passo('cima') is False
+    assert partida.posicao == (3, 3) and partida.movimentos == 4
+
+    with pytest.raises(ValueError):
+        partida.passo('norte')
+
+@pytest.mark.parametrize("nome", ["parede", "bfs", "a*", "bidirecional"])
+@pytest.mark.parametrize("seed", range(5))
+def test_agentes_deterministicos_sempre_vencem(nome, seed):
+    maze = gerar_labirinto_compacto(21, 21, seed)
+    partida = Partida(maze)
+    otimo = resolvedor.bfs(maze, partida.inicio, maze.apple_pos).movimentos
+
+    jogar(AGENTES[nome](seed), partida, 50 * maze.grid.count(CAMINHO))
+
+    assert partida.venceu
+    if nome == "parede":
+        assert partida.movimentos >= otimo
+    else:
+        assert partida.movimentos == otimo
+        assert partida.colisoes == 0
+
+def test_torneio_em_um_processo():
+    agentes = list(AGENTES)
+    resultados = rodar_torneio(agentes, ['facil'], jogos=3, processos=1)
+
+    assert len(resultados) == 3 * len(agentes)
+    assert {j.agente for j in resultados} == set(agentes)
+    assert {j.seed for j in resultados} == {0, 1, 2}
+    for jogo in resultados:
+        assert jogo.dificuldade == 'facil'
+        if jogo.agente != 'aleatorio':
+            assert jogo.venceu
+        if jogo.agente in ('bfs', 'a*', 'bidirecional'):
+            assert jogo.movimentos == jogo.otimo
+
+    # Todos os agentes jogam os mesmos labirintos
+    otimos = {}
+    for jogo in resultados:
+        assert otimos.setdefault(jogo.seed, jogo.otimo) == jogo.otimo
+
+def test_torneio_nao_importa_tkinter():
+    # Em um processo novo, para não depender do que outros testes importaram
+    codigo = (
+        "import sys\n"
+        "from aventura_pkg import torneio\n"
+        "torneio.rodar_torneio(['parede', 'a*'], ['facil'], jogos=1, processos=1)\n"
+        "assert 'tkinter' not in sys.modules, 'tkinter foi importado'\n"
+    )
+    subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, check=True)
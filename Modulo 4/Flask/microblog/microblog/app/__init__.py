@@ -1,39 +1,38 @@
-import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from app import config, banco
 
 """
 Módulo de inicialização da aplicação Flask.
 
-Este módulo configura:
+As extensões são criadas aqui, sem aplicação, e create_app() monta uma
+instância configurada (application factory):
 - Instância do Flask com suporte a arquivos estáticos
-- Conexão com banco de dados SQLite
+- Configuração por perfil e variáveis de ambiente (app/config.py)
+- Conexão com banco de dados SQLite (PRAGMAs e pools em app/banco.py)
 - Flask-Login para gerenciamento de sessões
-- Criação automática das tabelas do banco
-"""
-
-# Criando instância do Flask
-app = Flask(__name__, 
-            static_folder='static',  # Pasta para CSS, JS, imagens
-            static_url_path='/static')
+- Rotas HTML (blueprint 'main') e API JSON em /api/v1 com ETag
+- Hash de senhas fora das threads de requisição (app/senhas.py)
+- Miniaturas locais das fotos de perfil (app/fotos.py)
+- Cache de páginas da timeline e fragmentos de posts
+- Contador de consultas SQL por requisição (modo debug)
+- Limite de requisições (token bucket) no login e nas rotas de escrita
+- Comandos de migração do banco (flask db upgrade)
+- Importação e exportação de posts (flask posts import/export)
 
-# Configurações da aplicação
-app.config['SECRET_KEY'] = "pd123"  # Chave secreta para sessões e formulários
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///microblog.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False  # Desabilita warnings
+O modo ASGI (app/assincrono.py) usa a mesma fábrica.
+"""
 
-# Iniciando conexão com banco de dados SQLite
-db = SQLAlchemy()
-db.init_app(app)
+# Extensões sem aplicação; create_app() chama init_app de cada uma
+db = SQLAlchemy(session_options={'class_': banco.RoutingSession})
 
-# Configurando Flask-Login ANTES de importar os models
-login = LoginManager(app)
-login.login_view = 'login'  # Define a rota de login para redirecionamento
+login = LoginManager()
+login.login_view = 'main.login'  # Define a rota de login para redirecionamento
 login.login_message = 'Por favor, faça login para acessar esta página.'
 login.login_message_category = 'info'
 
-# ✅ AGORA podemos importar models (que usa 'login')
+# ✅ AGORA podemos importar models (que usam 'db')
 from app.models import models
 
 # ✅ Configurar o user_loader DEPOIS de importar User
@@ -50,9 +49,79 @@ def load_user(id):
     """
     return db.session.get(models.User, int(id))
 
-# ✅ Importar routes e alquimias POR ÚLTIMO
-from app import routes, alquimias
-
-# Criando as tabelas no banco de dados
-with app.app_context():
-    db.create_all()
\ No newline at end of file
+def create_app(profile=None, overrides=None):
+    """
+    Cria e configura uma instância da aplicação.
+    
+    Cache, limite de requisições, hash de senhas e miniaturas são globais
+    do processo (como em um worker do gunicorn): a última aplicação criada
+    define a configuração deles.
+    
+    Args:
+        profile (str, optional): Perfil de configuração. Padrão:
+            $MICROBLOG_PROFILE ou 'development'
+        overrides (dict, optional): Chaves aplicadas por último, depois do
+            perfil e do ambiente (útil em testes e benchmarks)
+    
+    Returns:
+        Flask: Aplicação pronta para servir (WSGI)
+    
+    Example:
+        >>> app = create_app('production', {'SQLALCHEMY_DATABASE_URI': 'sqlite:////tmp/x.db'})
+    """
+    app = Flask(__name__,
+                static_folder='static',  # Pasta para CSS, JS, imagens
+                static_url_path='/static')
+    
+    # Configurações da aplicação: perfil escolhido por MICROBLOG_PROFILE,
+    # com SECRET_KEY, URI do banco e ajustes do SQLite vindos do ambiente
+    config.load_config(app, profile, overrides)
+    
+    # Iniciando conexão com banco de dados SQLite
+    db.init_app(app)
+    
+    # PRAGMAs do SQLite e pool somente leitura para os SELECTs das requisições
+    banco.init_app(app, db)
+    
+    # Cache de páginas da timeline e fragmentos de posts
+    from app.cache import cache
+    cache.init_app(app)
+    
+    # Hash de senhas em um pool de processos
+    from app import senhas
+    senhas.init_app(app)
+    
+    login.init_app(app)
+    
+    # Miniaturas das fotos de perfil, servidas em /fotos
+    from app.fotos import fotos, thumbnails
+    thumbnails.init_app(app)
+    
+    # Rotas HTML e API JSON versionada (/api/v1)
+    from app.routes import main
+    from app.api import api
+    app.register_blueprint(main)
+    app.register_blueprint(api)
+    app.register_blueprint(fotos)
+    
+    # Contador de consultas SQL por requisição (exposto em modo debug)
+    from app import instrumentacao
+    instrumentacao.init_app(app, db)
+    
+    # Limite de requisições nas rotas de login e escrita (depois do cronômetro,
+    # para que as respostas 429 também entrem nas métricas)
+    from app.limites import limiter
+    limiter.init_app(app)
+    
+    # As tabelas são criadas e atualizadas pelas migrações: flask db upgrade
+    from app import migracoes, transferencia
+    app.cli.add_command(migracoes.db_cli)
+    
+    # Importação e exportação de posts em lote: flask posts import/export
+    app.cli.add_command(transferencia.posts_cli)
+    
+    # Miniaturas de fotos antigas: flask fotos sync
+    from app.fotos import fotos_cli
+    app.cli.add_command(fotos_cli)
+    
+    return app
\ No newline at end of file
@@ -1,12 +1,38 @@
+import base64
+import heapq
 from datetime import datetime
-from sqlalchemy import select
-from app import db
-from app.models.models import User, Post
+from flask import current_app
+from markupsafe import Markup, escape
+from sqlalchemy import select, insert, delete, update, literal, tuple_, text, func, case, or_, true
+from sqlalchemy.orm import joinedload
+from app import db, senhas, assincrono
+from app.cache import cache
+from app.fotos import thumbnails, PhotoError
+from app.models.models import User, Post, FeedEntry, followers, utcnow
+
+# Tamanho padrão de página para timeline e feeds de usuário
+PAGE_SIZE = 10
+
+# Acima deste número de seguidores o post não é copiado para cada feed;
+# os seguidores leem os posts do autor direto da tabela posts (fan-out na leitura)
+FEED_FANOUT_LIMIT = 1000
+
+# Quantos posts recentes de um autor entram no feed de quem começa a segui-lo
+FEED_BACKFILL = 50
+
+# Por quanto tempo a chave antiga de uma foto trocada na origem ainda
+# redireciona para a nova (páginas já renderizadas apontam para ela)
+PHOTO_MOVED_TTL = 24 * 3600
 
 def validate_user_password(username, password):
     """
     Valida credenciais de login do usuário.
     
+    Para usuários inexistentes faz uma verificação falsa com o mesmo custo,
+    então o tempo de resposta não revela quais nomes estão cadastrados.
+    Se a senha estiver correta mas o hash usar um algoritmo ou custo
+    antigo, o hash é refeito com a configuração atual.
+    
     Args:
         username (str): Nome de usuário
         password (str): Senha em texto plano
@@ -17,10 +43,17 @@ def validate_user_password(username, password):
     res = db.session.scalars(select(User).where(User.username == username))
     user = res.first()
     
-    if user and user.check_password(password):
-        return user
-    else:
+    if user is None:
+        return senhas.dummy_verify(password) or None
+    
+    if not user.check_password(password):
         return None
+    
+    if senhas.needs_rehash(user.password_hash):
+        user.set_password(password)
+        db.session.commit()
+    
+    return user
 
 def user_exists(username):
     """
@@ -44,19 +77,26 @@ def create_user(username, password, remember=False, photo_url=None, bio=None, la
         username (str): Nome de usuário único
         password (str): Senha em texto plano (será hasheada)
         remember (bool, optional): Flag de persistência
-        photo_url (str, optional): URL da foto de perfil
+        photo_url (str, optional): URL da foto de perfil (baixada e
+            convertida em miniaturas antes de criar o usuário)
         bio (str, optional): Biografia do usuário
         last_login (datetime, optional): Data do último login
         
     Returns:
         User: Usuário recém-criado
+        
+    Raises:
+        PhotoError: Se a foto não puder ser baixada ou não for uma imagem válida
     """
+    photo_key = thumbnails.import_photo(photo_url) if photo_url else None
+    
     new_user = User(
         username=username,
         remember=remember,
         photo_url=photo_url,
+        photo_key=photo_key,
         bio=bio,
-        last_login=last_login if last_login else datetime.now()
+        last_login=last_login if last_login else utcnow()
     )
     
     new_user.set_password(password)
@@ -66,6 +106,90 @@ def create_user(username, password, remember=False, photo_url=None, bio=None, la
     
     return new_user
 
+def set_user_photo(user, photo_url):
+    """
+    Troca ou remove a foto de perfil do usuário.
+    
+    A foto é baixada e validada antes de qualquer alteração no banco;
+    se falhar, a foto atual é mantida.
+    
+    Args:
+        user (User): Usuário a ser alterado
+        photo_url (str | None): Nova URL, ou None para remover a foto
+        
+    Raises:
+        PhotoError: Se a foto não puder ser baixada ou não for uma imagem válida
+    """
+    user.photo_key = thumbnails.import_photo(photo_url) if photo_url else None
+    user.photo_url = photo_url
+    db.session.commit()
+
+def _moved_photo_key(photo_key):
+    return f'photo_moved:{photo_key}'
+
+def refresh_photo(photo_key):
+    """
+    Gera de novo as miniaturas de uma foto descartada do cache.
+    
+    A foto é baixada outra vez da URL guardada no usuário. Se a imagem na
+    origem mudou, os usuários passam a apontar para a nova chave, e a
+    antiga continua levando à nova por PHOTO_MOVED_TTL segundos (páginas
+    já renderizadas ainda usam a chave antiga).
+    
+    Args:
+        photo_key (str): Chave pedida na URL da miniatura
+        
+    Returns:
+        str | None: Chave cujas miniaturas existem agora (a pedida, ou a
+        nova se a foto mudou), ou None se a foto não puder ser servida
+    """
+    user = db.session.scalars(select(User).where(User.photo_key == photo_key)).first()
+    if not user:
+        return cache.get(_moved_photo_key(photo_key))
+    if not user.photo_url:
+        return None
+    
+    try:
+        new_key = thumbnails.import_photo(user.photo_url)
+    except PhotoError as e:
+        current_app.logger.info("Foto de %s indisponível na origem: %s", user.username, e)
+        return None
+    
+    if new_key == photo_key:
+        return photo_key
+    
+    db.session.execute(
+        update(User).where(User.photo_key == photo_key).values(photo_key=new_key)
+    )
+    db.session.commit()
+    cache.set(_moved_photo_key(photo_key), new_key, ttl=PHOTO_MOVED_TTL)
+    return new_key
+
+def sync_photos(echo=print):
+    """
+    Gera miniaturas para usuários que têm photo_url mas não photo_key.
+    
+    Usado depois da migração que criou photo_key. Fotos que não puderem
+    ser baixadas ficam sem miniatura (imagem padrão).
+    
+    Returns:
+        tuple[int, int]: Fotos processadas e fotos com erro
+    """
+    users = db.session.scalars(
+        select(User).where(User.photo_url.is_not(None), User.photo_key.is_(None))
+    ).all()
+    
+    done = failed = 0
+    for user in users:
+        try:
+            user.photo_key = thumbnails.import_photo(user.photo_url)
+            done += 1
+        except PhotoError as e:
+            failed += 1
+            echo(f"   ⚠️ {user.username}: {e}")
+    db.session.commit()
+    return done, failed
+
 def create_post(user_id, body):
     """
     Cria um novo post associado a um usuário.
@@ -90,20 +214,208 @@ def create_post(user_id, body):
     new_post = Post(
         body=body.strip(),
         user_id=user_id,
-        timestamp=datetime.utcnow()
+        timestamp=utcnow()
     )
     
     db.session.add(new_post)
+    db.session.flush()  # Gera o ID usado nas entradas do feed
+    
+    _fan_out_post(user, new_post)
+    db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            post_count=User.post_count + 1,
+            last_post_at=_latest(User.last_post_at, new_post.timestamp)
+        )
+    )
     db.session.commit()
     
+    # Só a primeira página muda: páginas com cursor listam posts mais antigos
+    cache.delete(_timeline_key(None))
+    
     return new_post
 
+def bulk_create_posts(rows):
+    """
+    Insere vários posts em uma única transação (usado na importação).
+    
+    Os posts entram com um INSERT em lote e o fan-out para os feeds é
+    feito com dois INSERT ... SELECT para o lote inteiro, em vez de uma
+    instrução por post. Ao contrário de create_post, não invalida o cache:
+    quem chama decide quando limpá-lo (uma vez, ao final da importação).
+    
+    Args:
+        rows (list[dict]): Dicionários com user_id, body e timestamp,
+            já validados
+        
+    Returns:
+        int: Número de posts inseridos
+    """
+    if not rows:
+        return 0
+    
+    ids = db.session.scalars(insert(Post).returning(Post.id), rows).all()
+    # Os IDs do lote não são necessariamente contíguos: um create_post
+    # concorrente pode ter recebido um ID no meio do intervalo
+    batch = Post.id.in_(ids)
+    
+    # Feed do próprio autor
+    db.session.execute(
+        insert(FeedEntry).from_select(
+            ['user_id', 'post_id', 'timestamp'],
+            select(Post.user_id, Post.id, Post.timestamp).where(batch)
+        )
+    )
+    # Feed dos seguidores, exceto de autores acima do limite de fan-out
+    db.session.execute(
+        insert(FeedEntry).from_select(
+            ['user_id', 'post_id', 'timestamp'],
+            select(followers.c.follower_id, Post.id, Post.timestamp)
+            .join(followers, followers.c.followed_id == Post.user_id)
+            .join(User, User.id == Post.user_id)
+            .where(batch, User.follower_count <= _fanout_limit())
+        )
+    )
+    # Contadores dos autores do lote, com um único UPDATE
+    batch_count = (
+        select(func.count()).where(Post.user_id == User.id, batch).scalar_subquery()
+    )
+    batch_latest = (
+        select(func.max(Post.timestamp)).where(Post.user_id == User.id, batch).scalar_subquery()
+    )
+    db.session.execute(
+        update(User)
+        .where(User.id.in_({row['user_id'] for row in rows}))
+        .values(
+            post_count=User.post_count + batch_count,
+            last_post_at=_latest(User.last_post_at, batch_latest)
+        ),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.commit()
+    
+    return len(ids)
+
+def _latest(current, candidate):
+    # max() escalar do SQLite devolve NULL se um dos lados for NULL
+    return case(
+        (or_(current.is_(None), current < candidate), candidate),
+        else_=current
+    )
+
+def _encode_raw_cursor(raw):
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def _decode_raw_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode()).decode()
+
+def encode_cursor(post):
+    """
+    Gera o cursor opaco que aponta para o último post de uma página.
+    
+    O cursor carrega o par (timestamp, id), que é exatamente a ordem do
+    índice ix_posts_timestamp_id, então a próxima página começa por uma
+    busca no índice em vez de pular linhas com OFFSET.
+    
+    Args:
+        post (Post): Último post exibido na página atual
+        
+    Returns:
+        str: Cursor codificado em base64 seguro para URLs
+    """
+    return _encode_raw_cursor(f'{post.timestamp.isoformat()}|{post.id}')
+
+def decode_cursor(cursor):
+    """
+    Decodifica um cursor gerado por encode_cursor().
+    
+    Args:
+        cursor (str): Cursor recebido na query string
+        
+    Returns:
+        tuple[datetime, int]: Par (timestamp, id) do último post visto
+        
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    try:
+        timestamp, post_id = _decode_raw_cursor(cursor).rsplit('|', 1)
+        return datetime.fromisoformat(timestamp), int(post_id)
+    except (ValueError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Cursor inválido: {cursor!r}") from e
+
+def _paginate(stmt, cursor=None, limit=PAGE_SIZE):
+    """
+    Aplica paginação por keyset (timestamp, id) a uma consulta de posts.
+    
+    Busca limit + 1 linhas só para saber se existe uma próxima página,
+    sem precisar de COUNT(*). O autor de cada post vem no mesmo SELECT
+    (JOIN), então renderizar a página não dispara uma consulta por post.
+    
+    Args:
+        stmt (Select): Consulta base sobre Post
+        cursor (str, optional): Cursor da página anterior
+        limit (int, optional): Número de posts por página
+        
+    Returns:
+        tuple[list[Post], str | None]: Posts da página e cursor da próxima
+    """
+    posts = db.session.scalars(_page_query(stmt, cursor, limit)).all()
+    return _page_result(posts, limit)
+
+def _page_query(stmt, cursor, limit):
+    # Compartilhada por _paginate e _paginate_async
+    if cursor:
+        timestamp, post_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Post.timestamp, Post.id) < (timestamp, post_id))
+    
+    return (
+        stmt
+        .options(joinedload(Post.author))
+        .order_by(Post.timestamp.desc(), Post.id.desc())
+        .limit(limit + 1)
+    )
+
+def _page_result(posts, limit):
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1])
+    
+    return posts, next_cursor
+
+def get_timeline_page(cursor=None, limit=PAGE_SIZE):
+    """
+    Retorna uma página da timeline global usando paginação por cursor.
+    
+    O custo de qualquer página é o mesmo da primeira: o cursor vira uma
+    condição (timestamp, id) < (?, ?) resolvida pelo índice composto.
+    
+    Args:
+        cursor (str, optional): Cursor devolvido pela página anterior
+        limit (int, optional): Número de posts por página. Padrão: PAGE_SIZE
+        
+    Returns:
+        tuple[list[Post], str | None]: Posts da página e cursor da próxima
+        (None quando não há mais posts)
+        
+    Raises:
+        ValueError: Se o cursor estiver malformado
+        
+    Example:
+        >>> posts, cursor = get_timeline_page()
+        >>> mais_antigos, _ = get_timeline_page(cursor)
+    """
+    return _paginate(select(Post), cursor, limit)
+
 def get_timeline(limit=5):
     """
     Retorna os posts mais recentes de todos os usuários.
     
-    Utiliza o relacionamento 'author' do Post para acessar dados do usuário
-    sem necessidade de JOIN manual.
+    O relacionamento 'author' já vem carregado (joinedload), então acessar
+    post.author não gera consultas extras.
     
     Args:
         limit (int, optional): Número máximo de posts a retornar. Padrão: 5
@@ -116,18 +428,35 @@ def get_timeline(limit=5):
         >>> for post in posts:
         ...     print(f'{post.author.username}: {post.body}')
     """
-    posts = db.session.scalars(
-        select(Post)
-        .order_by(Post.timestamp.desc())
-        .limit(limit)
-    ).all()
-    
+    posts, _ = get_timeline_page(limit=limit)
     return posts
 
+def get_user_posts_page(user_id, cursor=None, limit=PAGE_SIZE):
+    """
+    Retorna uma página dos posts de um usuário usando paginação por cursor.
+    
+    Usa o índice ix_posts_user_id_timestamp, então o custo não depende
+    de quantos posts o usuário (ou o sistema) já tem.
+    
+    Args:
+        user_id (int): ID do usuário
+        cursor (str, optional): Cursor devolvido pela página anterior
+        limit (int, optional): Número de posts por página. Padrão: PAGE_SIZE
+        
+    Returns:
+        tuple[list[Post], str | None]: Posts da página e cursor da próxima
+        
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    return _paginate(select(Post).where(Post.user_id == user_id), cursor, limit)
+
 def get_user_posts(user_id):
     """
     Retorna todos os posts de um usuário específico.
     
+    Para exibir em páginas, use get_user_posts_page().
+    
     Args:
         user_id (int): ID do usuário
         
@@ -136,8 +465,9 @@ def get_user_posts(user_id):
     """
     posts = db.session.scalars(
         select(Post)
+        .options(joinedload(Post.author))
         .where(Post.user_id == user_id)
-        .order_by(Post.timestamp.desc())
+        .order_by(Post.timestamp.desc(), Post.id.desc())
     ).all()
     
     return posts
@@ -146,16 +476,190 @@ def get_all_posts():
     """
     Retorna todos os posts do sistema.
     
+    Carrega a tabela inteira; para exibir em páginas, use get_timeline_page().
+    
     Returns:
         list[Post]: Lista de todos os posts ordenados por data
     """
     posts = db.session.scalars(
         select(Post)
-        .order_by(Post.timestamp.desc())
+        .options(joinedload(Post.author))
+        .order_by(Post.timestamp.desc(), Post.id.desc())
     ).all()
     
     return posts
 
+def _timeline_key(cursor):
+    return f'timeline:{PAGE_SIZE}:{cursor or "first"}'
+
+def _post_key(post_id):
+    return f'post:{post_id}'
+
+def fragment_key(post_id, is_owner):
+    """
+    Chave do fragmento HTML renderizado de um post.
+    
+    O fragmento muda conforme quem está vendo (os botões de editar e
+    deletar só aparecem para o autor), por isso existem duas variantes.
+    
+    Args:
+        post_id (int): ID do post
+        is_owner (bool): Se quem está vendo é o autor do post
+        
+    Returns:
+        str: Chave usada no cache
+    """
+    return f'fragment:{post_id}:{int(is_owner)}'
+
+def serialize_post(post):
+    """
+    Converte um Post (com autor carregado) em um dicionário simples.
+    
+    O dicionário não depende da sessão do SQLAlchemy, então pode ser
+    guardado no cache e lido por outras requisições ou processos. Nos
+    templates, post.author.username funciona igual ao objeto ORM.
+    
+    Args:
+        post (Post): Post com o relacionamento author carregado
+        
+    Returns:
+        dict: Campos do post e do autor
+    """
+    return {
+        'id': post.id,
+        'body': post.body,
+        'timestamp': post.timestamp,
+        'edited_at': post.edited_at,
+        'user_id': post.user_id,
+        'author': {'id': post.author.id, 'username': post.author.username},
+    }
+
+def _load_serialized_posts(post_ids):
+    """
+    Busca posts por ID em uma única consulta e grava cada um no cache.
+    
+    Returns:
+        dict[int, dict]: Posts serializados encontrados, por ID
+    """
+    posts = db.session.scalars(_posts_by_id_query(post_ids)).all()
+    return _cache_serialized(posts)
+
+def _posts_by_id_query(post_ids):
+    return select(Post).options(joinedload(Post.author)).where(Post.id.in_(post_ids))
+
+def _cache_serialized(posts):
+    loaded = {}
+    for post in posts:
+        loaded[post.id] = serialize_post(post)
+        cache.set(_post_key(post.id), loaded[post.id])
+    return loaded
+
+def get_posts_cached(post_ids):
+    """
+    Busca vários posts por ID, lendo primeiro do cache.
+    
+    Os que faltam no cache vêm do banco em uma única consulta. IDs
+    inexistentes são simplesmente omitidos.
+    
+    Args:
+        post_ids (list[int]): IDs procurados
+        
+    Returns:
+        list[dict]: Posts serializados, na ordem dos IDs pedidos
+    """
+    by_id, missing = _cached_posts(post_ids)
+    if missing:
+        by_id.update(_load_serialized_posts(missing))
+    return [by_id[post_id] for post_id in post_ids if post_id in by_id]
+
+def _cached_posts(post_ids):
+    """
+    Lê do cache os posts pedidos.
+    
+    Returns:
+        tuple[dict[int, dict], list[int]]: Posts encontrados e IDs ausentes
+    """
+    found = cache.get_many([_post_key(post_id) for post_id in post_ids])
+    by_id = {item['id']: item for item in found.values()}
+    return by_id, [post_id for post_id in post_ids if post_id not in by_id]
+    
+def get_users_by_username(usernames):
+    """
+    Busca vários usuários pelo nome em uma única consulta.
+    
+    Args:
+        usernames (list[str]): Nomes procurados
+        
+    Returns:
+        list[User]: Usuários encontrados, na ordem dos nomes pedidos
+    """
+    users = db.session.scalars(select(User).where(User.username.in_(usernames))).all()
+    by_name = {user.username: user for user in users}
+    return [by_name[name] for name in usernames if name in by_name]
+
+def get_timeline_cached(cursor=None):
+    """
+    Versão read-through de get_timeline_page(), usada pela home.
+    
+    Cada página é guardada apenas como lista de IDs mais o próximo cursor;
+    o conteúdo de cada post fica em uma entrada própria. Assim, editar um
+    post invalida uma única chave e nenhuma página. Se uma página aponta
+    para um post que foi deletado, ela é descartada e recalculada.
+    
+    Args:
+        cursor (str, optional): Cursor devolvido pela página anterior
+        
+    Returns:
+        tuple[list[dict], str | None]: Posts serializados e próximo cursor
+        
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    key = _timeline_key(cursor)
+    page = cache.get(key)
+    
+    if page is None:
+        posts, next_cursor = get_timeline_page(cursor)
+        return _cache_timeline_page(key, posts, next_cursor)
+    
+    by_id, missing = _cached_posts(page['ids'])
+    
+    if missing:
+        loaded = _load_serialized_posts(missing)
+        if len(loaded) < len(missing):
+            # Algum post da página foi deletado: recalcula a página
+            cache.delete(key)
+            return get_timeline_cached(cursor)
+        by_id.update(loaded)
+    
+    return [by_id[post_id] for post_id in page['ids']], page['next_cursor']
+
+def _cache_timeline_page(key, posts, next_cursor):
+    """
+    Grava uma página da timeline (só IDs) e cada post serializado no cache.
+    
+    Returns:
+        tuple[list[dict], str | None]: Posts serializados e próximo cursor
+    """
+    serialized = [serialize_post(post) for post in posts]
+    for item in serialized:
+        cache.set(_post_key(item['id']), item)
+    cache.set(key, {'ids': [item['id'] for item in serialized], 'next_cursor': next_cursor})
+    return serialized, next_cursor
+
+def invalidate_post(post_id):
+    """
+    Remove do cache o post e seus fragmentos renderizados.
+    
+    Args:
+        post_id (int): ID do post alterado ou deletado
+    """
+    cache.delete(
+        _post_key(post_id),
+        fragment_key(post_id, True),
+        fragment_key(post_id, False)
+    )
+
 def update_post(post_id, new_body):
     """
     Atualiza o conteúdo de um post existente e registra data de edição.
@@ -184,9 +688,12 @@ def update_post(post_id, new_body):
         raise ValueError(f"Post com ID {post_id} não encontrado")
     
     post.body = new_body.strip()
-    post.edited_at = datetime.now()  # Registra data da edição
+    post.edited_at = utcnow()  # Registra data da edição (UTC, como o timestamp)
     db.session.commit()
     
+    # As páginas guardam só IDs, então basta invalidar o próprio post
+    invalidate_post(post_id)
+    
     return post
 
 def delete_post(post_id):
@@ -206,7 +713,503 @@ def delete_post(post_id):
     if not post:
         raise ValueError(f"Post com ID {post_id} não encontrado")
     
+    user_id = post.user_id
+    db.session.execute(delete(FeedEntry).where(FeedEntry.post_id == post_id))
     db.session.delete(post)
+    db.session.flush()
+    
+    # O post mais recente restante vem do índice (user_id, timestamp)
+    db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            post_count=User.post_count - 1,
+            last_post_at=select(func.max(Post.timestamp)).where(Post.user_id == user_id).scalar_subquery()
+        )
+    )
+    db.session.commit()
+    
+    # Páginas que ainda listam este ID são recalculadas na próxima leitura
+    invalidate_post(post_id)
+    
+    return True
+
+def reconcile_user_counters(batch_size=1000, dry_run=False, echo=print):
+    """
+    Recalcula post_count e last_post_at e corrige os que divergirem.
+    
+    Percorre os usuários em lotes de IDs, com um commit por lote, então
+    pode rodar com a aplicação no ar. Cada lote faz uma consulta agrupada
+    em posts (pelo índice user_id, timestamp) e só grava os usuários cujos
+    valores estão errados.
+    
+    Args:
+        batch_size (int, optional): Usuários por lote
+        dry_run (bool, optional): Apenas conta as divergências
+        echo (Callable[[str], None], optional): Função de saída das mensagens
+        
+    Returns:
+        dict: Contadores checked, fixed e batches
+    """
+    checked = fixed = batches = 0
+    last_id = 0
+    
+    while True:
+        stored = db.session.execute(
+            select(User.id, User.post_count, User.last_post_at)
+            .where(User.id > last_id)
+            .order_by(User.id)
+            .limit(batch_size)
+        ).all()
+        if not stored:
+            break
+        
+        first_id, last_id = stored[0].id, stored[-1].id
+        actual = {
+            user_id: (count, latest)
+            for user_id, count, latest in db.session.execute(
+                select(Post.user_id, func.count(), func.max(Post.timestamp))
+                .where(Post.user_id.between(first_id, last_id))
+                .group_by(Post.user_id)
+            )
+        }
+        
+        drift = [
+            user_id for user_id, post_count, last_post_at in stored
+            if (post_count, last_post_at) != actual.get(user_id, (0, None))
+        ]
+        
+        if drift and not dry_run:
+            # Recalcula no próprio UPDATE: um post criado entre a leitura
+            # acima e esta escrita não é perdido
+            db.session.execute(
+                update(User)
+                .where(User.id.in_(drift))
+                .values(
+                    post_count=select(func.count()).where(Post.user_id == User.id).scalar_subquery(),
+                    last_post_at=select(func.max(Post.timestamp)).where(Post.user_id == User.id).scalar_subquery()
+                ),
+                execution_options={'synchronize_session': False}
+            )
+        db.session.commit()
+        
+        checked += len(stored)
+        fixed += len(drift)
+        batches += 1
+        if drift:
+            echo(f"   🔧 Lote {batches} (ids {first_id}-{last_id}): {len(drift)} usuários divergentes")
+    
+    return {'checked': checked, 'fixed': fixed, 'batches': batches}
+
+def _fanout_limit():
+    return current_app.config.get('FEED_FANOUT_LIMIT', FEED_FANOUT_LIMIT)
+
+def _fan_out_post(author, post):
+    """
+    Copia um post recém-criado para o feed do autor e de seus seguidores.
+    
+    Usa um único INSERT ... SELECT sobre a tabela followers, então o custo
+    é uma instrução independente do número de seguidores. Autores com mais
+    seguidores que FEED_FANOUT_LIMIT só recebem a entrada no próprio feed;
+    seus posts são mesclados na leitura por get_home_feed_page().
+    
+    Args:
+        author (User): Autor do post
+        post (Post): Post já com ID gerado (após flush)
+    """
+    db.session.add(FeedEntry(user_id=author.id, post_id=post.id, timestamp=post.timestamp))
+    
+    if author.follower_count > _fanout_limit():
+        return
+    
+    db.session.execute(
+        insert(FeedEntry).from_select(
+            ['user_id', 'post_id', 'timestamp'],
+            select(followers.c.follower_id, literal(post.id), literal(post.timestamp))
+            .where(followers.c.followed_id == author.id)
+        )
+    )
+
+def is_following(follower_id, followed_id):
+    """
+    Verifica se um usuário segue outro.
+    
+    Args:
+        follower_id (int): ID de quem segue
+        followed_id (int): ID de quem é seguido
+        
+    Returns:
+        bool: True se a relação existir
+    """
+    row = db.session.execute(
+        select(followers.c.follower_id)
+        .where(followers.c.follower_id == follower_id, followers.c.followed_id == followed_id)
+    ).first()
+    return row is not None
+
+def follow_user(follower_id, followed_id):
+    """
+    Faz um usuário seguir outro e preenche o feed com posts recentes.
+    
+    Os FEED_BACKFILL posts mais recentes do autor seguido entram no feed
+    de quem passou a segui-lo, para a home não começar vazia.
+    
+    Args:
+        follower_id (int): ID de quem passa a seguir
+        followed_id (int): ID de quem será seguido
+        
+    Returns:
+        bool: True se a relação foi criada, False se já existia
+        
+    Raises:
+        ValueError: Se algum usuário não existir ou se tentar seguir a si mesmo
+    """
+    if follower_id == followed_id:
+        raise ValueError("Você não pode seguir a si mesmo")
+    
+    followed = db.session.get(User, followed_id)
+    if not followed or not db.session.get(User, follower_id):
+        raise ValueError("Usuário não encontrado")
+    
+    if is_following(follower_id, followed_id):
+        return False
+    
+    before = followed.follower_count
+    db.session.execute(insert(followers).values(follower_id=follower_id, followed_id=followed_id))
+    db.session.execute(
+        update(User)
+        .where(User.id == followed_id)
+        .values(follower_count=User.follower_count + 1)
+    )
+    
+    if before < _fanout_limit():
+        recent = (
+            select(literal(follower_id), Post.id, Post.timestamp)
+            .where(Post.user_id == followed_id)
+            .order_by(Post.timestamp.desc(), Post.id.desc())
+            .limit(FEED_BACKFILL)
+        )
+        db.session.execute(
+            insert(FeedEntry)
+            .from_select(['user_id', 'post_id', 'timestamp'], recent)
+            .prefix_with('OR IGNORE')
+        )
+    
+    db.session.commit()
+    
+    cache.delete(_large_authors_key(follower_id))
+    if before == _fanout_limit():
+        # O autor passou do limite: os seguidores passam a ler seus posts novos direto de posts
+        _invalidate_large_authors(followed_id)
+    return True
+
+def unfollow_user(follower_id, followed_id):
+    """
+    Desfaz a relação de seguidor e remove os posts do autor do feed.
+    
+    Se o autor voltar ao limite de fan-out, os posts que ele fez enquanto
+    estava acima (que só existiam na leitura) são copiados para o feed dos
+    seguidores restantes, como em follow_user().
+    
+    Args:
+        follower_id (int): ID de quem deixa de seguir
+        followed_id (int): ID de quem era seguido
+        
+    Returns:
+        bool: True se a relação foi removida, False se não existia
+    """
+    result = db.session.execute(
+        delete(followers)
+        .where(followers.c.follower_id == follower_id, followers.c.followed_id == followed_id)
+    )
+    if result.rowcount == 0:
+        return False
+    
+    before = db.session.scalar(select(User.follower_count).where(User.id == followed_id))
+    db.session.execute(
+        update(User)
+        .where(User.id == followed_id)
+        .values(follower_count=User.follower_count - 1)
+    )
+    db.session.execute(
+        delete(FeedEntry)
+        .where(
+            FeedEntry.user_id == follower_id,
+            FeedEntry.post_id.in_(select(Post.id).where(Post.user_id == followed_id))
+        )
+    )
+    
+    crossed = before == _fanout_limit() + 1
+    if crossed:
+        recent = (
+            select(Post.id, Post.timestamp)
+            .where(Post.user_id == followed_id)
+            .order_by(Post.timestamp.desc(), Post.id.desc())
+            .limit(FEED_BACKFILL)
+            .subquery()
+        )
+        db.session.execute(
+            insert(FeedEntry)
+            .from_select(
+                ['user_id', 'post_id', 'timestamp'],
+                select(followers.c.follower_id, recent.c.id, recent.c.timestamp)
+                .join(recent, true())
+                .where(followers.c.followed_id == followed_id)
+            )
+            .prefix_with('OR IGNORE')
+        )
+    
     db.session.commit()
     
-    return True
\ No newline at end of file
+    cache.delete(_large_authors_key(follower_id))
+    if crossed:
+        _invalidate_large_authors(followed_id)
+    return True
+
+def _large_authors_key(user_id):
+    return f'feed:large_authors:{user_id}'
+
+def _invalidate_large_authors(author_id):
+    # O autor cruzou o limite de fan-out: a lista de autores grandes de
+    # cada seguidor mudou
+    follower_ids = db.session.scalars(
+        select(followers.c.follower_id).where(followers.c.followed_id == author_id)
+    ).all()
+    if follower_ids:
+        cache.delete(*[_large_authors_key(user_id) for user_id in follower_ids])
+
+def _followed_large_authors(user_id):
+    """
+    IDs dos autores seguidos pelo usuário que estão acima do limite de fan-out.
+    
+    A lista fica no cache e só muda quando o usuário segue ou deixa de
+    seguir alguém, ou quando um autor seguido cruza o limite; follow_user()
+    e unfollow_user() invalidam a chave nesses casos.
+    """
+    return cache.get_or_set(
+        _large_authors_key(user_id),
+        lambda: db.session.scalars(
+            select(User.id)
+            .join(followers, followers.c.followed_id == User.id)
+            .where(followers.c.follower_id == user_id, User.follower_count > _fanout_limit())
+        ).all()
+    )
+
+def get_home_feed_page(user_id, cursor=None, limit=PAGE_SIZE):
+    """
+    Retorna uma página do feed pessoal (posts próprios e de quem o usuário segue).
+    
+    A leitura principal é uma busca por intervalo em feed_entries pelo
+    índice (user_id, timestamp, post_id). Posts de autores com muitos
+    seguidores, que não são copiados para os feeds, vêm de uma segunda
+    busca em posts por (user_id, timestamp) e são mesclados em ordem; a
+    lista desses autores vem do cache, então quem não segue nenhum deles
+    faz uma única consulta.
+    
+    Args:
+        user_id (int): Dono do feed
+        cursor (str, optional): Cursor devolvido pela página anterior
+        limit (int, optional): Número de posts por página. Padrão: PAGE_SIZE
+        
+    Returns:
+        tuple[list[Post], str | None]: Posts da página e cursor da próxima
+        
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    stmt = (
+        select(Post)
+        .join(FeedEntry, FeedEntry.post_id == Post.id)
+        .options(joinedload(Post.author))
+        .where(FeedEntry.user_id == user_id)
+    )
+    if cursor:
+        timestamp, post_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(FeedEntry.timestamp, FeedEntry.post_id) < (timestamp, post_id))
+    
+    posts = db.session.scalars(
+        stmt
+        .order_by(FeedEntry.timestamp.desc(), FeedEntry.post_id.desc())
+        .limit(limit + 1)
+    ).all()
+    
+    large_authors = _followed_large_authors(user_id)
+    
+    if large_authors:
+        pulled, _ = _paginate(select(Post).where(Post.user_id.in_(large_authors)), cursor, limit)
+        seen = {post.id for post in posts}
+        extra = [post for post in pulled if post.id not in seen]
+        key = lambda post: (post.timestamp, post.id)
+        posts = list(heapq.merge(posts, extra, key=key, reverse=True))
+    
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1])
+    
+    return posts, next_cursor
+
+# Marcadores usados pelo snippet() do FTS5; trocados por <mark> depois do escape
+_MARK_START, _MARK_END = '\x02', '\x03'
+
+def _fts_query(query):
+    """
+    Converte o texto digitado pelo usuário em uma consulta FTS5 segura.
+    
+    Cada palavra vira um termo entre aspas com busca por prefixo, então
+    caracteres especiais da sintaxe FTS5 não causam erro. Os termos são
+    combinados com AND implícito.
+    
+    Args:
+        query (str): Texto de busca
+        
+    Returns:
+        str: Expressão MATCH (vazia se não houver termos)
+    """
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"*' for term in terms if term)
+
+def _highlight(snippet):
+    """
+    Escapa o trecho retornado pelo FTS5 e destaca os termos com <mark>.
+    """
+    safe = str(escape(snippet))
+    return Markup(safe.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>'))
+
+def search_posts(query, cursor=None, limit=PAGE_SIZE):
+    """
+    Busca posts pelo conteúdo usando o índice FTS5 posts_fts.
+    
+    Os resultados vêm ordenados por relevância (bm25) e paginados por
+    cursor (rank, id). Cada resultado traz um trecho do post com os
+    termos encontrados destacados.
+    
+    Args:
+        query (str): Texto de busca (palavras separadas por espaço)
+        cursor (str, optional): Cursor devolvido pela página anterior
+        limit (int, optional): Número de resultados por página. Padrão: PAGE_SIZE
+        
+    Returns:
+        tuple[list[tuple[Post, Markup]], str | None]: Pares (post, trecho
+        destacado) e cursor da próxima página
+        
+    Raises:
+        ValueError: Se o cursor estiver malformado
+        
+    Example:
+        >>> results, cursor = search_posts('flask sqlalchemy')
+        >>> for post, snippet in results:
+        ...     print(post.author.username, snippet)
+    """
+    match = _fts_query(query or '')
+    if not match:
+        return [], None
+    
+    params = {'match': match, 'limit': limit + 1}
+    after = ''
+    if cursor:
+        try:
+            rank, post_id = _decode_raw_cursor(cursor).rsplit('|', 1)
+            params['rank'], params['post_id'] = float(rank), int(post_id)
+        except (ValueError, TypeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Cursor inválido: {cursor!r}") from e
+        after = 'AND (rank, rowid) > (:rank, :post_id)'
+    
+    rows = db.session.execute(text(f"""
+        SELECT rowid, rank,
+               snippet(posts_fts, 0, '{_MARK_START}', '{_MARK_END}', '…', 16)
+        FROM posts_fts
+        WHERE posts_fts MATCH :match {after}
+        ORDER BY rank, rowid
+        LIMIT :limit
+    """), params).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_raw_cursor(f'{rows[-1][1]!r}|{rows[-1][0]}')
+    
+    posts = db.session.scalars(
+        select(Post)
+        .options(joinedload(Post.author))
+        .where(Post.id.in_([row[0] for row in rows]))
+    ).all()
+    by_id = {post.id: post for post in posts}
+    
+    results = [(by_id[row[0]], _highlight(row[2])) for row in rows if row[0] in by_id]
+    return results, next_cursor
+
+
+# Versões assíncronas das leituras, usadas pelo modo ASGI (app/assincrono.py).
+# Montam as mesmas consultas das versões síncronas, mas executam no event
+# loop com o driver aiosqlite, e leem e gravam o mesmo cache.
+
+async def _paginate_async(stmt, cursor=None, limit=PAGE_SIZE):
+    query = _page_query(stmt, cursor, limit)
+    async with assincrono.adb.session() as session:
+        posts = (await session.scalars(query)).all()
+    return _page_result(posts, limit)
+
+async def get_timeline_page_async(cursor=None, limit=PAGE_SIZE):
+    """
+    Versão assíncrona de get_timeline_page().
+    
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    return await _paginate_async(select(Post), cursor, limit)
+
+async def get_user_posts_page_async(user_id, cursor=None, limit=PAGE_SIZE):
+    """
+    Versão assíncrona de get_user_posts_page().
+    
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    return await _paginate_async(select(Post).where(Post.user_id == user_id), cursor, limit)
+
+async def user_exists_async(username):
+    """
+    Versão assíncrona de user_exists().
+    """
+    async with assincrono.adb.session() as session:
+        return (await session.scalars(select(User).where(User.username == username))).first()
+
+async def _load_serialized_posts_async(post_ids):
+    async with assincrono.adb.session() as session:
+        posts = (await session.scalars(_posts_by_id_query(post_ids))).all()
+    return _cache_serialized(posts)
+
+async def get_posts_cached_async(post_ids):
+    """
+    Versão assíncrona de get_posts_cached().
+    """
+    by_id, missing = _cached_posts(post_ids)
+    if missing:
+        by_id.update(await _load_serialized_posts_async(missing))
+    return [by_id[post_id] for post_id in post_ids if post_id in by_id]
+
+async def get_timeline_cached_async(cursor=None):
+    """
+    Versão assíncrona de get_timeline_cached().
+    
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    key = _timeline_key(cursor)
+    page = cache.get(key)
+    
+    if page is None:
+        posts, next_cursor = await get_timeline_page_async(cursor)
+        return _cache_timeline_page(key, posts, next_cursor)
+    
+    by_id, missing = _cached_posts(page['ids'])
+    
+    if missing:
+        loaded = await _load_serialized_posts_async(missing)
+        if len(loaded) < len(missing):
+            cache.delete(key)
+            return await get_timeline_cached_async(cursor)
+        by_id.update(loaded)
+    
+    return [by_id[post_id] for post_id in page['ids']], page['next_cursor']
\ No newline at end of file
@@ -0,0 +1,434 @@
+"""
+API JSON da aplicação Microblog (/api/v1).
+
+Expõe timeline, posts de um usuário e CRUD de posts para clientes que
+não usam as páginas HTML (apps móveis, integrações). A autenticação usa a
+mesma sessão do Flask-Login, iniciada por POST /api/v1/session.
+
+Respostas de leitura têm ETag forte e Last-Modified, calculados a partir
+de Post.timestamp e Post.edited_at. Um cliente que repete a requisição
+com If-None-Match (ou If-Modified-Since) recebe 304 sem corpo; a timeline
+e os posts individuais vêm do cache, então essa verificação normalmente
+não executa nenhuma consulta SQL. PATCH e DELETE aceitam If-Match para
+evitar sobrescrever uma edição feita por outro cliente (412).
+"""
+
+import hashlib
+from functools import wraps
+
+from flask import Blueprint, Response, jsonify, request, url_for
+from flask_login import current_user, login_user, logout_user
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import is_resource_modified
+
+from app import alquimias
+from app.fotos import thumbnails
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+
+# Máximo de IDs ou nomes em uma requisição em lote
+MAX_BATCH = 100
+MAX_LIMIT = 100
+
+@api.errorhandler(HTTPException)
+def _json_error(error):
+    """
+    Erros da API em JSON, em vez das páginas HTML padrão.
+    """
+    response = jsonify(error=error.description, status=error.code)
+    response.status_code = error.code
+    # Mantém cabeçalhos do erro, como o Retry-After do 429
+    for name, value in error.get_headers():
+        if name.lower() != 'content-type':
+            response.headers[name] = value
+    return response
+
+@api.app_errorhandler(404)
+@api.app_errorhandler(405)
+def _json_routing_error(error):
+    """
+    URLs inexistentes sob /api/v1 também respondem em JSON.
+
+    Erros de roteamento acontecem antes de escolher o blueprint, por isso
+    este handler é da aplicação e devolve o erro original fora da API.
+    """
+    if request.path.startswith(api.url_prefix + '/'):
+        return _json_error(error)
+    return error
+
+def _error(status, message):
+    response = jsonify(error=message, status=status)
+    response.status_code = status
+    return response
+
+def api_login_required(view):
+    """
+    Como login_required, mas responde 401 em JSON em vez de redirecionar.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return _error(401, 'Autenticação necessária')
+        return view(*args, **kwargs)
+    return wrapper
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+def post_json(post):
+    """
+    Representação JSON de um post serializado (ver alquimias.serialize_post).
+    """
+    return {
+        'id': post['id'],
+        'body': post['body'],
+        'timestamp': _isoformat(post['timestamp']),
+        'edited_at': _isoformat(post['edited_at']),
+        'author': post['author'],
+        'url': url_for('api.get_post', post_id=post['id'], _external=True),
+    }
+
+def user_json(user):
+    """
+    Representação JSON pública de um usuário.
+    """
+    return {
+        'id': user.id,
+        'username': user.username,
+        'bio': user.bio,
+        'photo_url': user.photo_url,
+        'photo_thumbnail_url': (
+            url_for('fotos.thumbnail', size=thumbnails.sizes[0], key=user.photo_key, _external=True)
+            if user.photo_key and thumbnails.sizes else None
+        ),
+        'follower_count': user.follower_count,
+        'post_count': user.post_count,
+        'last_post_at': _isoformat(user.last_post_at),
+        'posts_url': url_for('api.user_posts', username=user.username, _external=True),
+    }
+
+def _validators(posts, *extra):
+    """
+    Calcula ETag e Last-Modified de uma lista de posts serializados.
+
+    O ETag cobre ID e datas de cada post (e os valores extras, como o
+    próximo cursor), então muda quando um post é criado, editado ou
+    removido da lista.
+
+    Returns:
+        tuple[str, datetime | None]: ETag e data da última alteração
+    """
+    digest = hashlib.sha1()
+    last_modified = None
+    for post in posts:
+        changed = max(post['timestamp'], post['edited_at'] or post['timestamp'])
+        if last_modified is None or changed > last_modified:
+            last_modified = changed
+        digest.update(f"{post['id']}:{post['timestamp']}:{post['edited_at']}|".encode())
+    for value in extra:
+        digest.update(f"{value}|".encode())
+    return digest.hexdigest(), last_modified
+
+def _conditional(etag, last_modified, build):
+    """
+    Responde 304 se o cliente já tem a versão atual, senão chama build().
+
+    O corpo só é montado quando a representação mudou.
+
+    Args:
+        etag (str): ETag forte da representação
+        last_modified (datetime | None): Última alteração (UTC)
+        build (Callable[[], dict]): Monta o corpo JSON
+    """
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # Sempre revalidar: barato graças ao ETag, e nunca serve dado velho
+    response.cache_control.no_cache = True
+    response.cache_control.private = True
+    return response
+
+def _page_response(posts, next_cursor, endpoint, **values):
+    etag, last_modified = _validators(posts, next_cursor)
+
+    def build():
+        next_url = None
+        if next_cursor:
+            next_url = url_for(endpoint, cursor=next_cursor, _external=True, **values)
+        return {
+            'posts': [post_json(post) for post in posts],
+            'next_cursor': next_cursor,
+            'next': next_url,
+        }
+
+    return _conditional(etag, last_modified, build)
+
+def _limit():
+    limit = request.args.get('limit', alquimias.PAGE_SIZE, type=int)
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit deve estar entre 1 e {MAX_LIMIT}")
+    return limit
+
+def _check_if_match(post):
+    """
+    Retorna uma resposta 412 se If-Match não bater com o ETag atual do post.
+    """
+    if request.if_match and not request.if_match.contains(_validators([post])[0]):
+        return _error(412, 'O post foi alterado por outra requisição')
+    return None
+
+def _own_post(post_id):
+    """
+    Busca o post e confere se pertence ao usuário logado.
+
+    Returns:
+        tuple[dict | None, Response | None]: Post serializado ou resposta de erro
+    """
+    posts = alquimias.get_posts_cached([post_id])
+    if not posts:
+        return None, _error(404, 'Post não encontrado')
+    if posts[0]['user_id'] != current_user.id:
+        return None, _error(403, 'Você só pode alterar seus próprios posts')
+    return posts[0], None
+
+def _json_body():
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else {}
+
+def _post_body():
+    # Ausente vira None e cai na validação de create_post/update_post
+    body = _json_body().get('body')
+    if body is not None and not isinstance(body, str):
+        raise ValueError('body deve ser um texto')
+    return body
+
+def _csv_arg(name):
+    return [item for item in request.args.get(name, '').split(',') if item.strip()]
+
+@api.route('/session', methods=['POST'])
+def create_session():
+    """
+    Login: {"username": ..., "password": ...} -> usuário logado.
+    """
+    data = _json_body()
+    username = str(data.get('username', '')).lower()
+    user = alquimias.validate_user_password(username, str(data.get('password', '')))
+    if not user:
+        return _error(401, 'Usuário ou senha inválidos')
+    login_user(user, remember=user.remember)
+    return jsonify(user_json(user))
+
+@api.route('/session', methods=['DELETE'])
+def delete_session():
+    """
+    Logout.
+    """
+    logout_user()
+    return Response(status=204)
+
+@api.route('/timeline')
+def timeline():
+    """
+    Timeline global paginada por cursor (?cursor=, ?limit=).
+
+    Com o limite padrão a página vem do mesmo cache usado pela home.
+    """
+    cursor = request.args.get('cursor')
+    try:
+        limit = _limit()
+        if limit == alquimias.PAGE_SIZE:
+            posts, next_cursor = alquimias.get_timeline_cached(cursor)
+        else:
+            page, next_cursor = alquimias.get_timeline_page(cursor, limit)
+            posts = [alquimias.serialize_post(post) for post in page]
+    except ValueError as e:
+        return _error(400, str(e))
+
+    values = {'limit': limit} if limit != alquimias.PAGE_SIZE else {}
+    return _page_response(posts, next_cursor, 'api.timeline', **values)
+
+@api.route('/users/<username>/posts')
+def user_posts(username):
+    """
+    Posts de um usuário, do mais recente ao mais antigo (?cursor=, ?limit=).
+    """
+    user = alquimias.user_exists(username.lower())
+    if not user:
+        return _error(404, 'Usuário não encontrado')
+
+    try:
+        limit = _limit()
+        page, next_cursor = alquimias.get_user_posts_page(user.id, request.args.get('cursor'), limit)
+    except ValueError as e:
+        return _error(400, str(e))
+
+    posts = [alquimias.serialize_post(post) for post in page]
+    values = {'limit': limit} if limit != alquimias.PAGE_SIZE else {}
+    return _page_response(posts, next_cursor, 'api.user_posts', username=user.username, **values)
+
+@api.route('/users/<username>')
+def get_user(username):
+    """
+    Perfil público de um usuário.
+    """
+    user = alquimias.user_exists(username.lower())
+    if not user:
+        return _error(404, 'Usuário não encontrado')
+    return jsonify(user_json(user))
+
+@api.route('/users')
+def get_users():
+    """
+    Vários usuários em uma requisição: ?usernames=ana,bia (até MAX_BATCH).
+    """
+    usernames = [name.strip().lower() for name in _csv_arg('usernames')]
+    if not usernames or len(usernames) > MAX_BATCH:
+        return _error(400, f"Informe de 1 a {MAX_BATCH} nomes em ?usernames=")
+    users = alquimias.get_users_by_username(usernames)
+    found = {user.username for user in users}
+    return jsonify(
+        users=[user_json(user) for user in users],
+        missing=[name for name in usernames if name not in found]
+    )
+
+@api.route('/posts/<int:post_id>')
+def get_post(post_id):
+    """
+    Um post, com ETag e Last-Modified próprios.
+    """
+    posts = alquimias.get_posts_cached([post_id])
+    if not posts:
+        return _error(404, 'Post não encontrado')
+    etag, last_modified = _validators(posts)
+    return _conditional(etag, last_modified, lambda: post_json(posts[0]))
+
+@api.route('/posts')
+def get_posts():
+    """
+    Vários posts em uma requisição: ?ids=1,2,3 (até MAX_BATCH).
+
+    IDs inexistentes aparecem em "missing". O ETag cobre o conjunto todo.
+    """
+    try:
+        post_ids = list(dict.fromkeys(int(item) for item in _csv_arg('ids')))
+    except ValueError:
+        return _error(400, 'ids deve ser uma lista de inteiros separados por vírgula')
+    if not post_ids or len(post_ids) > MAX_BATCH:
+        return _error(400, f"Informe de 1 a {MAX_BATCH} IDs em ?ids=")
+
+    posts = alquimias.get_posts_cached(post_ids)
+    found = {post['id'] for post in posts}
+    missing = [post_id for post_id in post_ids if post_id not in found]
+    etag, last_modified = _validators(posts, missing)
+    return _conditional(etag, last_modified, lambda: {
+        'posts': [post_json(post) for post in posts],
+        'missing': missing,
+    })
+
+@api.route('/posts', methods=['POST'])
+@api_login_required
+def create_post():
+    """
+    Cria um post: {"body": ...} -> 201 com Location e ETag.
+    """
+    try:
+        post = alquimias.create_post(current_user.id, _post_body())
+    except ValueError as e:
+        return _error(400, str(e))
+
+    serialized = alquimias.serialize_post(post)
+    response = jsonify(post_json(serialized))
+    response.status_code = 201
+    response.headers['Location'] = url_for('api.get_post', post_id=post.id, _external=True)
+    response.set_etag(_validators([serialized])[0])
+    return response
+
+@api.route('/posts/<int:post_id>', methods=['PATCH', 'PUT'])
+@api_login_required
+def update_post(post_id):
+    """
+    Edita o corpo de um post próprio: {"body": ...}. Aceita If-Match.
+    """
+    post, error = _own_post(post_id)
+    if error:
+        return error
+    precondition = _check_if_match(post)
+    if precondition:
+        return precondition
+
+    try:
+        updated = alquimias.update_post(post_id, _post_body())
+    except ValueError as e:
+        return _error(400, str(e))
+
+    serialized = alquimias.serialize_post(updated)
+    response = jsonify(post_json(serialized))
+    response.set_etag(_validators([serialized])[0])
+    return response
+
+@api.route('/posts/<int:post_id>', methods=['DELETE'])
+@api_login_required
+def delete_post(post_id):
+    """
+    Remove um post próprio. Aceita If-Match.
+    """
+    post, error = _own_post(post_id)
+    if error:
+        return error
+    precondition = _check_if_match(post)
+    if precondition:
+        return precondition
+
+    alquimias.delete_post(post_id)
+    return Response(status=204)
+
+
+# Versões assíncronas das leituras mais frequentes, usadas apenas no modo
+# ASGI (app/assincrono.py). No modo WSGI as rotas acima atendem os mesmos
+# endpoints.
+
+async def timeline_async():
+    """
+    Como timeline(), consultando o banco pelo driver assíncrono.
+    """
+    cursor = request.args.get('cursor')
+    try:
+        limit = _limit()
+        if limit == alquimias.PAGE_SIZE:
+            posts, next_cursor = await alquimias.get_timeline_cached_async(cursor)
+        else:
+            page, next_cursor = await alquimias.get_timeline_page_async(cursor, limit)
+            posts = [alquimias.serialize_post(post) for post in page]
+    except ValueError as e:
+        return _error(400, str(e))
+
+    values = {'limit': limit} if limit != alquimias.PAGE_SIZE else {}
+    return _page_response(posts, next_cursor, 'api.timeline', **values)
+
+async def user_posts_async(username):
+    """
+    Como user_posts(), consultando o banco pelo driver assíncrono.
+    """
+    user = await alquimias.user_exists_async(username.lower())
+    if not user:
+        return _error(404, 'Usuário não encontrado')
+
+    try:
+        limit = _limit()
+        page, next_cursor = await alquimias.get_user_posts_page_async(user.id, request.args.get('cursor'), limit)
+    except ValueError as e:
+        return _error(400, str(e))
+
+    posts = [alquimias.serialize_post(post) for post in page]
+    values = {'limit': limit} if limit != alquimias.PAGE_SIZE else {}
+    return _page_response(posts, next_cursor, 'api.user_posts', username=user.username, **values)
+
+# Endpoint -> view assíncrona
+ASYNC_VIEWS = {
+    'api.timeline': timeline_async,
+    'api.user_posts': user_posts_async,
+}
@@ -0,0 +1,297 @@
+"""
+Modo de execução ASGI.
+
+O Flask é um framework WSGI: cada requisição ocupa uma thread do servidor
+enquanto espera o SQLite. Neste modo a aplicação é servida por um servidor
+ASGI (uvicorn, hypercorn) e as leituras mais frequentes da API rodam no
+event loop, com o driver assíncrono aiosqlite:
+
+    GET /api/v1/timeline
+    GET /api/v1/users/<username>/posts
+
+As demais rotas (páginas HTML, escritas, login) continuam sendo as views
+síncronas de sempre, executadas em um pool de threads limitado
+(ASGI_WSGI_THREADS). As duas formas usam a mesma aplicação criada por
+create_app(): before_request, after_request, limite de requisições,
+métricas e cache valem para todas as rotas, e as views assíncronas usam as
+versões *_async das funções de app/alquimias.py, que montam as mesmas
+consultas das versões síncronas.
+
+Uso:
+    uvicorn asgi:application --workers 4
+
+Dependências opcionais: aiosqlite e um servidor ASGI (ver requirements.txt).
+"""
+
+import asyncio
+import io
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from app import banco
+
+logger = logging.getLogger('microblog.asgi')
+
+READ_METHODS = ('GET', 'HEAD')
+
+class AsyncDatabase:
+    """
+    Engine assíncrono (aiosqlite) apontando para o mesmo banco da aplicação.
+
+    As conexões são somente leitura e recebem os mesmos PRAGMAs do engine
+    síncrono; as escritas continuam passando por db.session.
+
+    Attributes:
+        engine (AsyncEngine): Engine assíncrono, ou None antes de init_app
+    """
+
+    def __init__(self):
+        self.engine = None
+        self._sessionmaker = None
+
+    def init_app(self, app, db):
+        """
+        Cria o engine assíncrono a partir da URI do banco da aplicação.
+
+        Configurações:
+            ASYNC_POOL_SIZE (int): Conexões aiosqlite. Padrão: 10
+
+        Args:
+            app (Flask): Aplicação já configurada por create_app()
+            db (SQLAlchemy): Extensão do banco da aplicação
+
+        Raises:
+            ValueError: Se o banco não for SQLite
+        """
+        # Dependência opcional: só é exigida no modo ASGI
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        with app.app_context():
+            url = db.engine.url
+        if url.get_backend_name() != 'sqlite':
+            raise ValueError(f"O modo ASGI suporta apenas SQLite, não {url.get_backend_name()!r}")
+
+        options = {}
+        if url.database and url.database != ':memory:':
+            options = {
+                'pool_size': app.config.get('ASYNC_POOL_SIZE', 10),
+                'max_overflow': 0,
+                'pool_timeout': app.config['SQLALCHEMY_ENGINE_OPTIONS'].get('pool_timeout', 30),
+            }
+        self.engine = create_async_engine(url.set(drivername='sqlite+aiosqlite'), **options)
+        event.listen(
+            self.engine.sync_engine, 'connect',
+            banco._pragma_listener(app.config.get('SQLITE_PRAGMAS', {}), query_only=True)
+        )
+        self._sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+        app.extensions['async_db'] = self
+
+    def session(self):
+        """
+        Nova sessão assíncrona, para uso com 'async with'.
+
+        Raises:
+            RuntimeError: Se init_app ainda não foi chamado
+        """
+        if self._sessionmaker is None:
+            raise RuntimeError("Banco assíncrono não configurado: use create_asgi_app()")
+        return self._sessionmaker()
+
+    async def dispose(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+# Instância global, no mesmo estilo de db e cache
+adb = AsyncDatabase()
+
+def build_environ(scope, body):
+    """
+    Monta o environ WSGI de uma requisição HTTP do ASGI.
+
+    Args:
+        scope (dict): Escopo 'http' do ASGI
+        body (bytes): Corpo completo da requisição
+
+    Returns:
+        dict: environ no formato da PEP 3333
+    """
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').lower()
+        value = value.decode('latin-1')
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        elif name == 'content-length':
+            environ['CONTENT_LENGTH'] = value
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+class MicroblogASGI:
+    """
+    Aplicação ASGI que divide as requisições entre o event loop e as threads.
+
+    As URLs são resolvidas pelo próprio url_map do Flask. Se o endpoint
+    tiver uma versão assíncrona (api.ASYNC_VIEWS) e o método for GET/HEAD,
+    a view roda no event loop; caso contrário a requisição é entregue à
+    aplicação WSGI em uma thread do pool.
+
+    Attributes:
+        flask_app (Flask): Aplicação criada por create_app()
+        async_views (dict): Endpoint -> view assíncrona
+    """
+
+    def __init__(self, flask_app, async_views, threads=32):
+        self.flask_app = flask_app
+        self.async_views = async_views
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f"Tipo de conexão não suportado: {scope['type']!r}")
+
+        body = await self._read_body(receive)
+        environ = build_environ(scope, body)
+
+        view, values = self._match_async(environ)
+        if view is not None:
+            response = await self._dispatch_async(environ, view, values)
+            status, headers = response.status_code, response.headers.to_wsgi_list()
+            payload = b'' if scope['method'] == 'HEAD' else response.get_data()
+        else:
+            loop = asyncio.get_running_loop()
+            status, headers, payload = await loop.run_in_executor(self.executor, self._call_wsgi, environ)
+
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+        await send({'type': 'http.response.body', 'body': payload})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await adb.dispose()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    def _match_async(self, environ):
+        if environ['REQUEST_METHOD'] not in READ_METHODS:
+            return None, None
+        adapter = self.flask_app.url_map.bind_to_environ(environ)
+        try:
+            endpoint, values = adapter.match()
+        except Exception:
+            # 404, 405 e redirecionamentos ficam com o Flask
+            return None, None
+        return self.async_views.get(endpoint), values
+
+    async def _dispatch_async(self, environ, view, values):
+        """
+        Executa uma view assíncrona com o mesmo ciclo de uma requisição WSGI.
+
+        Os hooks (before_request, after_request, teardown) e os handlers de
+        erro do Flask são os mesmos; só a chamada da view é aguardada no
+        event loop em vez de bloquear uma thread.
+        """
+        app = self.flask_app
+        with app.request_context(environ):
+            try:
+                try:
+                    rv = app.preprocess_request()
+                    if rv is None:
+                        rv = await view(**values)
+                except Exception as e:
+                    rv = app.handle_user_exception(e)
+                return app.finalize_request(rv)
+            except Exception as e:
+                return app.handle_exception(e)
+
+    def _call_wsgi(self, environ):
+        """
+        Chama a aplicação WSGI em uma thread do pool e lê a resposta inteira.
+
+        Returns:
+            tuple[int, list, bytes]: Status, cabeçalhos e corpo
+        """
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = headers
+
+        result = self.flask_app.wsgi_app(environ, start_response)
+        try:
+            payload = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return started['status'], started['headers'], payload
+
+def create_asgi_app(profile=None, overrides=None):
+    """
+    Cria a aplicação no modo ASGI.
+
+    Args:
+        profile (str, optional): Perfil de configuração (ver create_app)
+        overrides (dict, optional): Chaves aplicadas por último
+
+    Returns:
+        MicroblogASGI: Aplicação ASGI pronta para o uvicorn
+    """
+    from app import create_app, db
+    from app.api import ASYNC_VIEWS
+
+    flask_app = create_app(profile, overrides)
+    adb.init_app(flask_app, db)
+    logger.info("Modo ASGI: %d rotas assíncronas", len(ASYNC_VIEWS))
+    return MicroblogASGI(flask_app, ASYNC_VIEWS, flask_app.config.get('ASGI_WSGI_THREADS', 32))
@@ -0,0 +1,106 @@
+"""
+Ajustes de conexão com o SQLite.
+
+Este módulo aplica os PRAGMAs configurados (SQLITE_PRAGMAS) em cada
+conexão nova e mantém um segundo pool, somente leitura, usado pelos
+SELECTs feitos durante as requisições. Com o banco em modo WAL, leitores
+não bloqueiam o escritor, então separar os pools evita que páginas de
+leitura disputem conexões com as rotas que gravam.
+"""
+
+from flask import has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import CompoundSelect, Select, TextClause, create_engine, event
+
+def _pragma_listener(pragmas, query_only=False):
+    """
+    Cria o listener 'connect' que executa os PRAGMAs em cada conexão.
+    """
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        if query_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+    return _set_pragmas
+
+def is_read(clause):
+    """
+    Verifica se a instrução só lê: SELECT do ORM/Core ou text() iniciado por SELECT.
+
+    Qualquer outra coisa (INSERT/UPDATE/DELETE, PRAGMA, WITH ... que pode
+    terminar em escrita) é tratada como escrita.
+    """
+    if isinstance(clause, (Select, CompoundSelect)):
+        return True
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip().upper().startswith('SELECT')
+    return False
+
+class RoutingSession(Session):
+    """
+    Sessão que envia as leituras feitas em requisições ao pool somente leitura.
+
+    A escolha é pelo tipo de instrução, não pelo método HTTP: escritas
+    (flush do ORM, INSERT/UPDATE/DELETE, inclusive via text()) sempre usam
+    o engine principal, mesmo dentro de um GET. Depois que a transação
+    abriu uma conexão no engine principal, as leituras seguintes também
+    vão para ele, para enxergarem o que a própria transação gravou.
+    """
+
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        self._primary_begun = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not self._primary_begun
+            and is_read(clause)
+            and has_request_context()
+        ):
+            engine = self._db.readonly_engine
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+@event.listens_for(RoutingSession, 'after_begin')
+def _track_primary(session, transaction, connection):
+    if connection.engine is not session._db.readonly_engine:
+        session._primary_begun = True
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _reset_primary(session, transaction):
+    if transaction.parent is None:
+        session._primary_begun = False
+
+def init_app(app, db):
+    """
+    Configura PRAGMAs e o pool somente leitura para o engine da aplicação.
+
+    Args:
+        app (Flask): Aplicação com SQLITE_PRAGMAS e READONLY_POOL_SIZE
+        db (SQLAlchemy): Extensão criada com session_options={'class_': RoutingSession}
+    """
+    db.readonly_engine = None
+    pragmas = app.config.get('SQLITE_PRAGMAS', {})
+
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name != 'sqlite':
+            return
+
+        event.listen(engine, 'connect', _pragma_listener(pragmas))
+
+        pool_size = app.config.get('READONLY_POOL_SIZE', 0)
+        database = engine.url.database
+        if pool_size and database and database != ':memory:':
+            db.readonly_engine = create_engine(
+                engine.url,
+                pool_size=pool_size,
+                max_overflow=0,
+                pool_timeout=app.config['SQLALCHEMY_ENGINE_OPTIONS'].get('pool_timeout', 30),
+            )
+            event.listen(db.readonly_engine, 'connect', _pragma_listener(pragmas, query_only=True))
@@ -0,0 +1,367 @@
+"""
+Camada de cache da aplicação.
+
+Guarda páginas da timeline e fragmentos HTML de posts já renderizados,
+evitando recalcular a mesma consulta a cada acesso à home. O backend é
+plugável e escolhido pela configuração CACHE_BACKEND:
+
+- 'memory': LRU em processo, com TTL e limite de itens (padrão)
+- 'shared': cache compartilhado entre workers, via cliente no estilo
+  redis-py (get/mget/set/delete/scan_iter). Em testes o cliente pode ser trocado
+  por LocalClient, que imita a mesma API em memória.
+- 'null': desliga o cache (toda leitura é um miss)
+
+Contadores de hits, misses e evicções ficam disponíveis em cache.stats().
+"""
+
+import fnmatch
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+# Chaves apagadas por comando DELETE em SharedBackend.clear()
+CLEAR_BATCH = 500
+
+class MemoryBackend:
+    """
+    Cache LRU em processo com expiração por TTL e limite de tamanho.
+
+    Attributes:
+        max_items (int): Número máximo de entradas antes de evictar
+        evictions (int): Entradas removidas por falta de espaço
+        expirations (int): Entradas descartadas por TTL vencido
+    """
+
+    def __init__(self, max_items=1024):
+        self.max_items = max_items
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()  # key -> (expira_em, valor)
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """
+        Busca várias chaves de uma vez, ignorando as ausentes ou vencidas.
+
+        Args:
+            keys (list[str]): Chaves procuradas
+
+        Returns:
+            dict: Mapeamento chave -> valor apenas das chaves encontradas
+        """
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at is not None and expires_at <= now:
+                    del self._data[key]
+                    self.expirations += 1
+                    continue
+                self._data.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set(self, key, value, ttl=None):
+        """
+        Armazena um valor, evictando as entradas menos usadas se necessário.
+
+        Args:
+            key (str): Chave
+            value (Any): Valor (guardado por referência, não é copiado)
+            ttl (float, optional): Segundos até expirar. None = sem expiração
+        """
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys):
+        """
+        Remove as chaves informadas (as ausentes são ignoradas).
+        """
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Esvazia o cache.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class LocalClient:
+    """
+    Substituto local de um cliente redis-py, para testes e desenvolvimento.
+
+    Implementa apenas o subconjunto usado por SharedBackend.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, name):
+        with self._lock:
+            return self._alive(name, time.monotonic())
+
+    def mget(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return [self._alive(key, now) for key in keys]
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = (time.monotonic() + ex if ex else None, value)
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match=None, count=None):
+        now = time.monotonic()
+        with self._lock:
+            names = [name for name in list(self._data) if self._alive(name, now) is not None]
+        return iter([name for name in names if match is None or fnmatch.fnmatchcase(name, match)])
+
+
+class SharedBackend:
+    """
+    Cache compartilhado entre processos, usando um cliente no estilo redis-py.
+
+    Os valores são serializados com pickle. A política de evicção fica a
+    cargo do servidor, por isso as evicções não são contadas aqui.
+
+    Attributes:
+        client: Objeto com os métodos mget, set, delete e scan_iter
+        prefix (str): Prefixo aplicado a todas as chaves
+    """
+
+    evictions = 0
+    expirations = 0
+
+    def __init__(self, client, prefix='microblog:cache:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get_many(self, keys):
+        if not keys:
+            return {}
+        raw = self.client.mget([self.prefix + key for key in keys])
+        return {key: pickle.loads(value) for key, value in zip(keys, raw) if value is not None}
+
+    def set(self, key, value, ttl=None):
+        ex = int(ttl) if ttl else None
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ex)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        # Só as chaves deste prefixo: o mesmo servidor pode guardar dados de
+        # outras aplicações e os baldes do limite de requisições
+        batch = []
+        for name in self.client.scan_iter(match=self.prefix + '*', count=CLEAR_BATCH):
+            batch.append(name)
+            if len(batch) >= CLEAR_BATCH:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+
+class NullBackend:
+    """
+    Backend que não guarda nada. Útil para desligar o cache.
+    """
+
+    evictions = 0
+    expirations = 0
+
+    def get_many(self, keys):
+        return {}
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+
+class Cache:
+    """
+    Fachada do cache usada pelo restante da aplicação.
+
+    Segue o padrão das extensões Flask: a instância é criada no import e
+    configurada depois com init_app(app).
+
+    Attributes:
+        backend: Backend ativo (MemoryBackend, SharedBackend ou NullBackend)
+        default_ttl (float): TTL padrão em segundos
+    """
+
+    def __init__(self):
+        self.backend = MemoryBackend()
+        self.default_ttl = 60
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app, client=None):
+        """
+        Configura o backend a partir de app.config.
+
+        Configurações:
+            CACHE_BACKEND (str): 'memory', 'shared' ou 'null'. Padrão: 'memory'
+            CACHE_MAX_ITEMS (int): Limite do LRU em memória. Padrão: 1024
+            CACHE_DEFAULT_TTL (float): TTL padrão em segundos. Padrão: 60
+            CACHE_SHARED_URL (str): URL do servidor para o backend 'shared'
+            CACHE_KEY_PREFIX (str): Prefixo das chaves. Padrão: 'microblog:cache:'
+                (separado de 'microblog:ratelimit:', que clear() não apaga)
+
+        Args:
+            app (Flask): Aplicação Flask
+            client (optional): Cliente já construído para o backend 'shared'
+                (por exemplo, LocalClient em testes)
+        """
+        kind = app.config.get('CACHE_BACKEND', 'memory')
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', 60)
+
+        if kind == 'memory':
+            self.backend = MemoryBackend(app.config.get('CACHE_MAX_ITEMS', 1024))
+        elif kind == 'shared':
+            if client is None:
+                # Dependência opcional: só é exigida quando o backend é usado
+                import redis
+                client = redis.Redis.from_url(app.config['CACHE_SHARED_URL'])
+            self.backend = SharedBackend(client, app.config.get('CACHE_KEY_PREFIX', 'microblog:cache:'))
+        elif kind == 'null':
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f"CACHE_BACKEND desconhecido: {kind!r}")
+
+        app.extensions['cache'] = self
+
+    def _count(self, hits, misses):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def get(self, key):
+        """
+        Lê uma chave do cache.
+
+        Returns:
+            Any | None: Valor armazenado ou None em caso de miss
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """
+        Lê várias chaves de uma vez, contabilizando hits e misses.
+
+        Returns:
+            dict: Mapeamento chave -> valor apenas das chaves encontradas
+        """
+        found = self.backend.get_many(keys)
+        self._count(len(found), len(keys) - len(found))
+        return found
+
+    def set(self, key, value, ttl=None):
+        """
+        Grava um valor usando o TTL padrão se nenhum for informado.
+        """
+        self.backend.set(key, value, ttl if ttl is not None else self.default_ttl)
+
+    def get_or_set(self, key, loader, ttl=None):
+        """
+        Leitura read-through: devolve o valor em cache ou chama loader().
+
+        Args:
+            key (str): Chave
+            loader (Callable[[], Any]): Função que calcula o valor em um miss
+            ttl (float, optional): TTL em segundos
+
+        Returns:
+            Any: Valor em cache ou recém-calculado
+        """
+        found = self.get_many([key])
+        if key in found:
+            return found[key]
+        value = loader()
+        self.set(key, value, ttl)
+        return value
+
+    def delete(self, *keys):
+        """
+        Invalida as chaves informadas.
+        """
+        with self._lock:
+            self.invalidations += len(keys)
+        self.backend.delete(*keys)
+
+    def clear(self):
+        """
+        Esvazia o cache inteiro.
+        """
+        self.backend.clear()
+
+    def stats(self):
+        """
+        Retorna os contadores do cache para dimensionamento.
+
+        Returns:
+            dict: hits, misses, hit_ratio, evictions, expirations,
+            invalidations e size (apenas no backend em memória)
+        """
+        total = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            'evictions': self.backend.evictions,
+            'expirations': self.backend.expirations,
+            'invalidations': self.invalidations,
+            'size': len(self.backend) if isinstance(self.backend, MemoryBackend) else None,
+        }
+
+    def reset_stats(self):
+        """
+        Zera os contadores (útil entre medições).
+        """
+        self.hits = self.misses = self.invalidations = 0
+        self.backend.evictions = 0
+        self.backend.expirations = 0
+
+
+# Instância global, no mesmo estilo de db e login
+cache = Cache()
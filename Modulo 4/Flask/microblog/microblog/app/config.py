@@ -0,0 +1,162 @@
+"""
+Perfis de configuração da aplicação.
+
+O perfil é escolhido pela variável de ambiente MICROBLOG_PROFILE
+('development' por padrão, ou 'production'). Depois de carregar o perfil,
+qualquer chave pode ser sobrescrita por variáveis com prefixo FLASK_,
+usando __ para chaves aninhadas:
+
+    export MICROBLOG_PROFILE=production
+    export FLASK_SECRET_KEY=sua_chave_secreta
+    export FLASK_SQLALCHEMY_DATABASE_URI=sqlite:////srv/microblog/microblog.db
+    export FLASK_SQLITE_PRAGMAS__busy_timeout=10000
+    export FLASK_SQLALCHEMY_ENGINE_OPTIONS__pool_size=20
+    export FLASK_READONLY_POOL_SIZE=20
+    export FLASK_PASSWORD_HASH_METHOD=pbkdf2:sha256:600000
+    export FLASK_INSTRUMENTATION=true
+    export FLASK_PROFILE_SAMPLE_RATE=0.01
+    export FLASK_RATE_LIMITS__login__rate=10
+
+Valores são interpretados como JSON quando possível (números, true/false),
+exceto as chaves em RAW_STRING_KEYS, lidas como texto: FLASK_CACHE_BACKEND=null
+é o backend 'null', e não None.
+"""
+
+import os
+
+class Config:
+    """
+    Configuração base, usada em desenvolvimento.
+
+    Mantém o comportamento padrão do SQLite (journal em modo DELETE e pool
+    padrão do SQLAlchemy), que é suficiente para um único processo.
+    """
+    # Em produção a chave precisa vir do ambiente (FLASK_SECRET_KEY)
+    SECRET_KEY = 'dev'
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///microblog.db'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False  # Desabilita warnings
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+
+    # PRAGMAs aplicados em cada nova conexão SQLite
+    SQLITE_PRAGMAS = {}
+
+    # Pool separado, somente leitura, para os SELECTs das requisições (0 = desligado)
+    READONLY_POOL_SIZE = 0
+
+    # Modo ASGI (ver app/assincrono.py)
+    ASYNC_POOL_SIZE = 10       # Conexões aiosqlite das rotas assíncronas
+    ASGI_WSGI_THREADS = 32     # Threads que executam as demais rotas (Flask/WSGI)
+
+    # Cache (ver app/cache.py)
+    CACHE_BACKEND = 'memory'  # 'memory', 'shared' ou 'null'
+    CACHE_MAX_ITEMS = 1024
+    CACHE_DEFAULT_TTL = 60  # Segundos
+
+    # Feeds (ver alquimias.FEED_FANOUT_LIMIT)
+    FEED_FANOUT_LIMIT = 1000
+
+    # Hash de senhas (ver app/senhas.py)
+    PASSWORD_HASH_METHOD = 'scrypt'  # Ex.: 'scrypt:32768:8:1', 'pbkdf2:sha256:600000'
+    PASSWORD_HASH_WORKERS = 1  # Por processo do servidor; 0 = calcula na thread da requisição
+
+    # Fotos de perfil (ver app/fotos.py)
+    PHOTO_THUMB_SIZES = [150, 300]         # Lados das miniaturas (1x e 2x do perfil)
+    PHOTO_MAX_BYTES = 5 * 1024 * 1024      # Tamanho máximo da imagem original
+    PHOTO_MAX_PIXELS = 25_000_000          # Largura x altura máxima da original
+    PHOTO_FETCH_TIMEOUT = 5                # Segundos esperando o servidor de origem
+    PHOTO_CACHE_DIR = None                 # Padrão: instance/fotos
+    PHOTO_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    PHOTO_ALLOW_PRIVATE_HOSTS = False      # True só em testes com servidor local
+
+    # Instrumentação (ver app/instrumentacao.py)
+    INSTRUMENTATION = False    # Tempo de SQL/templates, consultas lentas e /_metrics
+    SLOW_QUERY_MS = 100        # Consultas mais lentas que isso vão para o log
+    PROFILE_SAMPLE_RATE = 0.0  # Fração das requisições perfiladas com cProfile
+    LOG_LEVEL = 'INFO'
+
+    # Limite de requisições por token bucket (ver app/limites.py)
+    RATE_LIMIT_ENABLED = True
+    RATE_LIMIT_BACKEND = 'memory'  # 'memory' ou 'shared'
+    RATE_LIMITS = {
+        # Cada tentativa de login calcula um hash de senha
+        'login': {
+            'endpoints': ['main.login', 'api.create_session'],
+            'rate': 5, 'per': 60, 'burst': 10, 'key': 'ip',
+        },
+        'cadastro': {
+            'endpoints': ['main.register'],
+            'rate': 5, 'per': 3600, 'burst': 5, 'key': 'ip',
+        },
+        # Rotas que gravam no SQLite (um único escritor por vez)
+        'escrita': {
+            'endpoints': [
+                'main.post', 'main.edit_post', 'main.delete_post', 'main.follow',
+                'main.unfollow', 'main.update_photo', 'main.update_bio',
+                'api.create_post', 'api.update_post', 'api.delete_post',
+            ],
+            'rate': 30, 'per': 60, 'burst': 20, 'key': 'user',
+        },
+    }
+
+
+class ProductionConfig(Config):
+    """
+    Perfil para vários workers concorrentes (por exemplo, gunicorn).
+
+    O modo WAL permite leitores simultâneos a um escritor, e o busy_timeout
+    faz o SQLite esperar pelo lock em vez de falhar com 'database is locked'.
+    """
+    SECRET_KEY = None
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',   # Seguro com WAL; fsync só no checkpoint
+        'busy_timeout': 5000,      # Milissegundos esperando pelo lock
+        'cache_size': -64000,      # Negativo = KiB (64 MB por conexão)
+        'mmap_size': 268435456,    # 256 MB de leitura via mmap
+        'temp_store': 'MEMORY',
+    }
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 5,
+        'max_overflow': 0,     # SQLite tem um único escritor; mais conexões só esperam
+        'pool_timeout': 10,
+    }
+    READONLY_POOL_SIZE = 10
+
+
+PROFILES = {
+    'development': Config,
+    'production': ProductionConfig,
+}
+
+# Chaves cujo valor no ambiente é usado como texto, sem decodificar JSON
+RAW_STRING_KEYS = ('CACHE_BACKEND', 'RATE_LIMIT_BACKEND')
+
+def load_config(app, profile=None, overrides=None):
+    """
+    Carrega o perfil escolhido e as sobrescritas do ambiente.
+
+    Args:
+        app (Flask): Aplicação a ser configurada
+        profile (str, optional): Nome do perfil. Padrão: $MICROBLOG_PROFILE
+            ou 'development'
+        overrides (dict, optional): Chaves aplicadas depois do ambiente
+
+    Raises:
+        ValueError: Se o perfil não existir
+        RuntimeError: Se o perfil exigir SECRET_KEY e ela não for informada
+    """
+    profile = profile or os.environ.get('MICROBLOG_PROFILE', 'development')
+    if profile not in PROFILES:
+        raise ValueError(f"Perfil desconhecido: {profile!r} (use {', '.join(PROFILES)})")
+
+    app.config.from_object(PROFILES[profile])
+    app.config.from_prefixed_env()
+    for key in RAW_STRING_KEYS:
+        if f'FLASK_{key}' in os.environ:
+            app.config[key] = os.environ[f'FLASK_{key}']
+    if overrides:
+        app.config.update(overrides)
+    app.config['PROFILE'] = profile
+
+    if not app.config.get('SECRET_KEY'):
+        raise RuntimeError(f"Defina FLASK_SECRET_KEY no ambiente para o perfil {profile!r}")
@@ -0,0 +1,446 @@
+"""
+Fotos de perfil servidas pela própria aplicação.
+
+Quando o usuário informa a URL de uma foto, a imagem é baixada uma única
+vez, validada (tamanho, tipo e dimensões) e convertida em miniaturas de
+tamanho fixo (PHOTO_THUMB_SIZES). As miniaturas são gravadas em disco com
+nome derivado do hash do conteúdo original:
+
+    instance/fotos/<sha256>-150.jpg
+    instance/fotos/<sha256>-300.jpg
+
+e servidas em /fotos/<tamanho>/<chave> com cache de um ano (immutable):
+como o nome muda junto com o conteúdo, o navegador nunca precisa
+revalidar. Assim as páginas não fazem o navegador buscar imagens
+grandes em hosts arbitrários.
+
+O diretório é um cache LRU limitado por PHOTO_CACHE_MAX_BYTES. Se uma
+miniatura descartada for pedida de novo, ela é gerada outra vez a partir
+de users.photo_url.
+
+Com Pillow instalado as miniaturas são recortadas e redimensionadas; sem
+ele a imagem validada é guardada como veio (o CSS ajusta o tamanho).
+
+Uso:
+    flask fotos sync    # gera miniaturas para fotos antigas (sem photo_key)
+"""
+
+import hashlib
+import io
+import ipaddress
+import logging
+import os
+import re
+import socket
+import threading
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import click
+from flask import Blueprint, abort, redirect, send_from_directory, url_for
+from flask.cli import AppGroup
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow é opcional
+    Image = None
+
+logger = logging.getLogger('microblog.fotos')
+
+# Tempo de cache das miniaturas: o nome muda quando o conteúdo muda
+ONE_YEAR = 365 * 24 * 3600
+
+KEY_PATTERN = re.compile(r'[0-9a-f]{64}\.(png|jpg|gif|webp)')
+
+MIMETYPES = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+}
+
+class PhotoError(ValueError):
+    """
+    Foto inacessível, grande demais ou em formato não suportado.
+    """
+
+def sniff(data):
+    """
+    Identifica o formato da imagem pelos primeiros bytes.
+
+    O Content-Type informado pelo servidor de origem não é confiável, então
+    a extensão gravada vem sempre do conteúdo.
+
+    Returns:
+        str | None: 'png', 'jpg', 'gif', 'webp' ou None
+    """
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if data.startswith(b'\xff\xd8\xff'):
+        return 'jpg'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+def _check_host(hostname, allow_private):
+    """
+    Recusa endereços internos (loopback, rede privada, link-local).
+
+    Sem isso, a URL da foto poderia fazer o servidor acessar serviços da
+    rede interna.
+
+    Raises:
+        PhotoError: Se o host não resolver ou for interno
+    """
+    if allow_private:
+        return
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(hostname, None)}
+    except socket.gaierror as e:
+        raise PhotoError(f"Host da foto não encontrado: {hostname}") from e
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+        if not ip.is_global:
+            raise PhotoError("A URL da foto aponta para um endereço interno")
+
+class _CheckedRedirect(urllib.request.HTTPRedirectHandler):
+    """
+    Aplica as mesmas regras de URL a cada redirecionamento.
+    """
+
+    def __init__(self, allow_private):
+        self.allow_private = allow_private
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        _check_url(newurl, self.allow_private)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+def _check_url(url, allow_private):
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise PhotoError("A URL da foto deve começar com http:// ou https://")
+    _check_host(parts.hostname, allow_private)
+
+def fetch_image(url, max_bytes, timeout=5, allow_private=False):
+    """
+    Baixa a imagem, lendo no máximo max_bytes.
+
+    Args:
+        url (str): URL http(s) da imagem
+        max_bytes (int): Tamanho máximo aceito
+        timeout (float, optional): Segundos de espera pelo servidor de origem
+        allow_private (bool, optional): Aceita hosts da rede interna
+
+    Returns:
+        tuple[bytes, str]: Conteúdo e formato (ver sniff)
+
+    Raises:
+        PhotoError: Se a URL for inválida, o download falhar ou o conteúdo
+            não for uma imagem aceita
+    """
+    _check_url(url, allow_private)
+    opener = urllib.request.build_opener(_CheckedRedirect(allow_private))
+    request = urllib.request.Request(url, headers={
+        'User-Agent': 'microblog-fotos/1.0',
+        'Accept': 'image/*',
+    })
+
+    try:
+        with opener.open(request, timeout=timeout) as response:
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > max_bytes:
+                raise PhotoError(f"A foto deve ter no máximo {max_bytes // 1024} KB")
+            if not response.headers.get_content_type().startswith('image/'):
+                raise PhotoError("A URL não aponta para uma imagem")
+            data = response.read(max_bytes + 1)
+    except PhotoError:
+        raise
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise PhotoError(f"Não foi possível baixar a foto ({e})") from e
+
+    if len(data) > max_bytes:
+        raise PhotoError(f"A foto deve ter no máximo {max_bytes // 1024} KB")
+
+    fmt = sniff(data)
+    if fmt is None:
+        raise PhotoError("Formato de imagem não suportado (use PNG, JPEG, GIF ou WebP)")
+    return data, fmt
+
+def make_thumbnails(data, fmt, sizes, max_pixels):
+    """
+    Gera uma miniatura quadrada para cada tamanho.
+
+    Imagens com transparência viram PNG; as demais, JPEG. GIFs animados
+    usam o primeiro quadro.
+
+    Args:
+        data (bytes): Imagem original
+        fmt (str): Formato detectado por sniff()
+        sizes (Iterable[int]): Lados das miniaturas, em pixels
+        max_pixels (int): Limite de largura x altura da original
+
+    Returns:
+        tuple[str, dict[int, bytes]]: Formato das miniaturas e conteúdo
+        de cada tamanho
+
+    Raises:
+        PhotoError: Se a imagem for grande demais ou estiver corrompida
+    """
+    if Image is None:
+        return fmt, {size: data for size in sizes}
+
+    try:
+        # open() só lê o cabeçalho: as dimensões são conferidas antes de decodificar
+        image = Image.open(io.BytesIO(data))
+        if image.width * image.height > max_pixels:
+            raise PhotoError(f"A foto deve ter no máximo {max_pixels // 1_000_000} megapixels")
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except PhotoError:
+        raise
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as e:
+        raise PhotoError("A imagem está corrompida ou não pôde ser lida") from e
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    out_fmt = 'png' if has_alpha else 'jpg'
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    thumbs = {}
+    for size in sizes:
+        thumb = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        if out_fmt == 'png':
+            thumb.save(buffer, 'PNG', optimize=True)
+        else:
+            thumb.save(buffer, 'JPEG', quality=85, optimize=True, progressive=True)
+        thumbs[size] = buffer.getvalue()
+    return out_fmt, thumbs
+
+def thumbnail_name(key, size):
+    """
+    Nome do arquivo da miniatura: '<hash>.jpg' -> '<hash>-150.jpg'.
+    """
+    stem, ext = key.rsplit('.', 1)
+    return f'{stem}-{size}.{ext}'
+
+class ThumbnailStore:
+    """
+    Diretório de miniaturas com limite de tamanho e descarte LRU.
+
+    O índice em memória guarda os arquivos em ordem de último uso; ao ser
+    criado, ele é montado a partir das datas de modificação, e cada acesso
+    atualiza essa data, então a ordem sobrevive a reinícios. Com vários
+    workers cada um tem seu índice: um arquivo removido por outro worker
+    é tratado como ausente e gerado de novo.
+
+    Attributes:
+        directory (str): Pasta das miniaturas
+        max_bytes (int): Tamanho máximo do diretório
+        sizes (tuple[int]): Tamanhos gerados para cada foto
+        evictions (int): Miniaturas descartadas por falta de espaço
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.max_bytes = 0
+        self.sizes = ()
+        self.max_photo_bytes = 0
+        self.max_pixels = 0
+        self.timeout = 5
+        self.allow_private = False
+        self.evictions = 0
+        self.hits = 0
+        self.misses = 0
+        self._index = OrderedDict()  # nome -> bytes
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Configura o diretório e os limites.
+
+        Configurações:
+            PHOTO_CACHE_DIR (str): Pasta das miniaturas. Padrão: instance/fotos
+            PHOTO_CACHE_MAX_BYTES (int): Tamanho máximo da pasta
+            PHOTO_THUMB_SIZES (list[int]): Lados das miniaturas, em pixels
+            PHOTO_MAX_BYTES (int): Tamanho máximo da imagem original
+            PHOTO_MAX_PIXELS (int): Largura x altura máxima da original
+            PHOTO_FETCH_TIMEOUT (float): Segundos de espera pelo download
+            PHOTO_ALLOW_PRIVATE_HOSTS (bool): Aceita URLs da rede interna
+
+        Args:
+            app (Flask): Aplicação Flask
+        """
+        self.directory = app.config.get('PHOTO_CACHE_DIR') or os.path.join(app.instance_path, 'fotos')
+        self.max_bytes = app.config.get('PHOTO_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        self.sizes = tuple(app.config.get('PHOTO_THUMB_SIZES', (150, 300)))
+        self.max_photo_bytes = app.config.get('PHOTO_MAX_BYTES', 5 * 1024 * 1024)
+        self.max_pixels = app.config.get('PHOTO_MAX_PIXELS', 25_000_000)
+        self.timeout = app.config.get('PHOTO_FETCH_TIMEOUT', 5)
+        self.allow_private = app.config.get('PHOTO_ALLOW_PRIVATE_HOSTS', False)
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+        app.extensions['thumbnails'] = self
+
+        if Image is None:
+            logger.warning("Pillow não instalado: fotos serão guardadas sem redimensionar")
+
+    def _load_index(self):
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.is_file() and not entry.name.startswith('.'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+        entries.sort()
+        with self._lock:
+            self._index = OrderedDict((name, size) for _, name, size in entries)
+            self._total = sum(size for _, _, size in entries)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def get(self, name):
+        """
+        Marca a miniatura como usada e confere se ela existe.
+
+        Returns:
+            bool: True se o arquivo está no disco
+        """
+        path = self._path(name)
+        with self._lock:
+            if not os.path.exists(path):
+                size = self._index.pop(name, None)
+                if size is not None:
+                    self._total -= size
+                self.misses += 1
+                return False
+            if name in self._index:
+                self._index.move_to_end(name)
+            else:
+                # Gravada por outro worker
+                size = os.path.getsize(path)
+                self._index[name] = size
+                self._total += size
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True
+
+    def put(self, name, data):
+        """
+        Grava uma miniatura (de forma atômica) e descarta as mais antigas.
+        """
+        path = self._path(name)
+        temp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp, 'wb') as f:
+            f.write(data)
+        os.replace(temp, path)
+
+        with self._lock:
+            self._total -= self._index.pop(name, 0)
+            self._index[name] = len(data)
+            self._total += len(data)
+            self._evict()
+
+    def _evict(self):
+        # Mantém ao menos o arquivo recém-gravado
+        while self._total > self.max_bytes and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._total -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+
+    def import_photo(self, url):
+        """
+        Baixa a foto, gera as miniaturas e grava todas no diretório.
+
+        Returns:
+            str: Chave da foto ('<sha256>.<formato>'), usada nas URLs
+
+        Raises:
+            PhotoError: Se a foto não puder ser usada
+        """
+        data, fmt = fetch_image(url, self.max_photo_bytes, self.timeout, self.allow_private)
+        out_fmt, thumbs = make_thumbnails(data, fmt, self.sizes, self.max_pixels)
+        key = f'{hashlib.sha256(data).hexdigest()}.{out_fmt}'
+        for size, payload in thumbs.items():
+            self.put(thumbnail_name(key, size), payload)
+        return key
+
+    def stats(self):
+        with self._lock:
+            return {
+                'files': len(self._index),
+                'bytes': self._total,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+# Instância global, no mesmo estilo de cache e limiter
+thumbnails = ThumbnailStore()
+
+fotos = Blueprint('fotos', __name__, url_prefix='/fotos')
+
+@fotos.route('/<int:size>/<key>')
+def thumbnail(size, key):
+    """
+    Serve uma miniatura com cache de longo prazo.
+
+    Se o arquivo foi descartado do cache, ele é gerado de novo a partir da
+    URL original do usuário dono da foto. Se a imagem mudou na origem, a
+    resposta redireciona para a chave nova.
+    """
+    if size not in thumbnails.sizes or not KEY_PATTERN.fullmatch(key):
+        abort(404)
+
+    name = thumbnail_name(key, size)
+    if not thumbnails.get(name):
+        from app import alquimias
+        current = alquimias.refresh_photo(key)
+        if current is None:
+            abort(404)
+        if current != key:
+            return redirect(url_for('fotos.thumbnail', size=size, key=current))
+
+    response = send_from_directory(thumbnails.directory, name, max_age=ONE_YEAR)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+@fotos.app_context_processor
+def _photo_helpers():
+    def photo_src(user, size):
+        """
+        URL da miniatura do usuário, ou a imagem padrão.
+        """
+        if user is not None and getattr(user, 'photo_key', None) and size in thumbnails.sizes:
+            return url_for('fotos.thumbnail', size=size, key=user.photo_key)
+        return url_for('static', filename='img/user.png')
+    return {'photo_src': photo_src}
+
+
+# Comandos de linha: flask fotos sync
+fotos_cli = AppGroup('fotos', help='Miniaturas das fotos de perfil.')
+
+@fotos_cli.command('sync')
+def sync_command():
+    """
+    Gera miniaturas para usuários com photo_url e sem photo_key.
+    """
+    from app import alquimias
+
+    done, failed = alquimias.sync_photos(echo=click.echo)
+    click.echo(f"✅ {done} fotos processadas, {failed} com erro")
@@ -0,0 +1,437 @@
+"""
+Instrumentação da aplicação.
+
+Este módulo conta as instruções SQL executadas durante cada requisição,
+usando os eventos de engine do SQLAlchemy. Em modo debug (ou com
+SQL_QUERY_COUNTER=True) o total é devolvido no cabeçalho X-SQL-Queries,
+o que permite verificar que uma página roda um número fixo de consultas.
+
+Também mantém um histograma de latência por rota (endpoint), para
+comparar o tempo de resposta antes e depois de uma otimização.
+
+Com INSTRUMENTATION=True são ativados também:
+
+- Tempo gasto em SQL e na renderização de templates, por requisição
+- Log de consultas lentas (acima de SLOW_QUERY_MS) com os parâmetros
+- Métricas no formato texto do Prometheus, em /_metrics
+- Perfil com cProfile de uma fração das requisições (PROFILE_SAMPLE_RATE),
+  salvo em arquivos .prof (abra com python -m pstats ou snakeviz)
+
+As métricas ficam na memória de cada processo: com vários workers, cada
+um expõe os próprios números.
+"""
+
+import bisect
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from flask import g, has_request_context, request, before_render_template, template_rendered
+from sqlalchemy import event
+
+logger = logging.getLogger('microblog.request')
+sql_logger = logging.getLogger('microblog.sql')
+profile_logger = logging.getLogger('microblog.profile')
+
+QUERY_HEADER = 'X-SQL-Queries'
+
+# Limites superiores dos buckets de latência, em segundos
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """
+    Histograma cumulativo com buckets fixos, no estilo do Prometheus.
+    
+    Attributes:
+        buckets (tuple[float]): Limites superiores dos buckets
+        counts (list[int]): Observações por bucket (o último é +Inf)
+        total (float): Soma de todas as observações
+        count (int): Número de observações
+    """
+    
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def observe(self, value):
+        """
+        Registra uma observação.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+    
+    def quantile(self, q):
+        """
+        Estima um quantil pelo limite superior do bucket que o contém.
+        
+        Args:
+            q (float): Quantil entre 0 e 1 (por exemplo, 0.99)
+            
+        Returns:
+            float | None: Limite do bucket (inf se cair no último)
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for index, amount in enumerate(self.counts):
+            seen += amount
+            if seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+    
+    def snapshot(self):
+        """
+        Retorna contagem, média, p50/p99 e buckets cumulativos.
+        """
+        cumulative, running = {}, 0
+        for bound, amount in zip(self.buckets + (float('inf'),), self.counts):
+            running += amount
+            cumulative['+Inf' if bound == float('inf') else str(bound)] = running
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets': cumulative,
+        }
+
+# Histogramas de latência por endpoint
+route_latency = {}
+_latency_lock = threading.Lock()
+
+def observe_latency(endpoint, seconds):
+    """
+    Registra a duração de uma requisição no histograma do endpoint.
+    """
+    histogram = route_latency.get(endpoint)
+    if histogram is None:
+        with _latency_lock:
+            histogram = route_latency.setdefault(endpoint, Histogram())
+    histogram.observe(seconds)
+
+def latency_snapshot():
+    """
+    Resumo dos histogramas de latência de todas as rotas.
+    
+    Returns:
+        dict: endpoint -> snapshot() do histograma
+    """
+    return {endpoint: hist.snapshot() for endpoint, hist in sorted(route_latency.items())}
+
+class Metrics:
+    """
+    Contadores por endpoint, agregados ao longo da vida do processo.
+    
+    Attributes:
+        requests (Counter): (endpoint, método, status) -> requisições
+        sql_queries (Counter): endpoint -> consultas SQL
+        sql_seconds (defaultdict): endpoint -> segundos gastos em SQL
+        template_seconds (defaultdict): endpoint -> segundos renderizando
+        slow_queries (int): Consultas acima do limite de SLOW_QUERY_MS
+        profiles (int): Requisições perfiladas
+    """
+    
+    def __init__(self):
+        self.requests = Counter()
+        self.sql_queries = Counter()
+        self.sql_seconds = defaultdict(float)
+        self.template_seconds = defaultdict(float)
+        self.slow_queries = 0
+        self.profiles = 0
+        self._lock = threading.Lock()
+    
+    def record_request(self, endpoint, method, status, queries, sql_seconds, template_seconds):
+        """
+        Soma os números de uma requisição concluída.
+        """
+        with self._lock:
+            self.requests[(endpoint, method, str(status))] += 1
+            self.sql_queries[endpoint] += queries
+            self.sql_seconds[endpoint] += sql_seconds
+            self.template_seconds[endpoint] += template_seconds
+    
+    def count_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+    
+    def count_profile(self):
+        with self._lock:
+            self.profiles += 1
+
+# Métricas do processo atual
+metrics = Metrics()
+
+def _label(value):
+    # Escapa valores de label conforme o formato texto do Prometheus
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_prometheus(gauges=None, counters=None):
+    """
+    Gera as métricas no formato texto do Prometheus (versão 0.0.4).
+    
+    Args:
+        gauges (dict, optional): Valores extras exportados como
+            microblog_<nome> (por exemplo, os contadores do cache)
+        counters (dict, optional): Contadores com labels de outros módulos,
+            no formato {nome: (ajuda, [({label: valor}, total), ...])}
+        
+    Returns:
+        str: Corpo da resposta de /_metrics
+    """
+    lines = []
+    
+    def header(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+    
+    name = 'microblog_request_duration_seconds'
+    header(name, 'histogram', 'Tempo de resposta por endpoint.')
+    for endpoint, hist in sorted(route_latency.items()):
+        label = f'endpoint="{_label(endpoint)}"'
+        for bound, total in hist.snapshot()['buckets'].items():
+            lines.append(f'{name}_bucket{{{label},le="{bound}"}} {total}')
+        lines.append(f'{name}_sum{{{label}}} {hist.total}')
+        lines.append(f'{name}_count{{{label}}} {hist.count}')
+    
+    with metrics._lock:
+        requests = sorted(metrics.requests.items())
+        per_endpoint = [
+            ('microblog_sql_queries_total', 'Consultas SQL executadas.', metrics.sql_queries),
+            ('microblog_sql_duration_seconds_total', 'Tempo gasto em SQL.', metrics.sql_seconds),
+            ('microblog_template_render_seconds_total', 'Tempo renderizando templates.',
+             metrics.template_seconds),
+        ]
+        per_endpoint = [(n, h, sorted(values.items())) for n, h, values in per_endpoint]
+        slow_queries, profiles = metrics.slow_queries, metrics.profiles
+    
+    name = 'microblog_requests_total'
+    header(name, 'counter', 'Requisições atendidas.')
+    for (endpoint, method, status), total in requests:
+        lines.append(
+            f'{name}{{endpoint="{_label(endpoint)}",method="{method}",status="{status}"}} {total}'
+        )
+    
+    for name, help_text, values in per_endpoint:
+        header(name, 'counter', help_text)
+        for endpoint, total in values:
+            lines.append(f'{name}{{endpoint="{_label(endpoint)}"}} {total}')
+    
+    header('microblog_slow_queries_total', 'counter', 'Consultas acima de SLOW_QUERY_MS.')
+    lines.append(f'microblog_slow_queries_total {slow_queries}')
+    header('microblog_profiles_total', 'counter', 'Requisições perfiladas com cProfile.')
+    lines.append(f'microblog_profiles_total {profiles}')
+    
+    for name, (help_text, samples) in (counters or {}).items():
+        header(f'microblog_{name}', 'counter', help_text)
+        for labels, total in samples:
+            label = ','.join(f'{k}="{_label(v)}"' for k, v in labels.items())
+            lines.append(f'microblog_{name}{{{label}}} {total}')
+    
+    for key, value in (gauges or {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            header(f'microblog_{key}', 'gauge', key.replace('_', ' ') + '.')
+            lines.append(f'microblog_{key} {value}')
+    
+    return '\n'.join(lines) + '\n'
+
+def _contar_query(conn, cursor, statement, parameters, context, executemany):
+    """
+    Listener 'before_cursor_execute': soma uma consulta à requisição atual.
+    """
+    if has_request_context():
+        g.sql_queries = g.get('sql_queries', 0) + 1
+
+@contextmanager
+def contar_queries(engine):
+    """
+    Conta as consultas executadas no engine dentro de um bloco with.
+    
+    Útil fora do ciclo de requisição (scripts, shell, testes).
+    
+    Args:
+        engine (Engine): Engine do SQLAlchemy a ser observado
+        
+    Yields:
+        dict: Dicionário cujo campo 'total' é atualizado a cada consulta
+        
+    Example:
+        >>> with contar_queries(db.engine) as contagem:
+        ...     alquimias.get_timeline_page()
+        >>> contagem['total']
+        1
+    """
+    contagem = {'total': 0}
+    
+    def _listener(*args):
+        contagem['total'] += 1
+    
+    event.listen(engine, 'before_cursor_execute', _listener)
+    try:
+        yield contagem
+    finally:
+        event.remove(engine, 'before_cursor_execute', _listener)
+
+def _timing_listeners(slow_query_seconds):
+    """
+    Cria os listeners que medem o tempo de cada consulta SQL.
+    
+    O início fica em uma pilha em conn.info (uma conexão nunca executa duas
+    consultas ao mesmo tempo, mas a pilha tolera execuções aninhadas).
+    """
+    def _inicio(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+    
+    def _fim(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get('query_started')
+        if not stack:
+            return
+        elapsed = time.perf_counter() - stack.pop()
+        if has_request_context():
+            g.sql_time = g.get('sql_time', 0.0) + elapsed
+        if elapsed >= slow_query_seconds:
+            metrics.count_slow_query()
+            sql_logger.warning(
+                "Consulta lenta (%.1f ms): %s | parâmetros: %r",
+                elapsed * 1000, ' '.join(statement.split()), parameters
+            )
+    
+    def _erro(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get('query_started'):
+            connection.info['query_started'].pop()
+    
+    return _inicio, _fim, _erro
+
+def _iniciar_template(sender, template, context, **extra):
+    if has_request_context():
+        g.setdefault('template_started', []).append(time.perf_counter())
+
+def _fim_template(sender, template, context, **extra):
+    stack = g.get('template_started') if has_request_context() else None
+    if stack:
+        elapsed = time.perf_counter() - stack.pop()
+        # Templates aninhados (render_post dentro de index.html) não são contados duas vezes
+        if not stack:
+            g.template_time = g.get('template_time', 0.0) + elapsed
+
+def _salvar_perfil(profiler, directory, endpoint):
+    """
+    Grava o perfil em directory/<endpoint>-<ms>.prof e loga as funções mais caras.
+    """
+    path = os.path.join(directory, f"{endpoint}-{int(time.time() * 1000)}.prof")
+    profiler.dump_stats(path)
+    metrics.count_profile()
+    profile_logger.info("Perfil de %s salvo em %s", endpoint, path)
+    
+    if profile_logger.isEnabledFor(logging.DEBUG):
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(15)
+        profile_logger.debug(output.getvalue())
+
+def configure_logging(app):
+    """
+    Configura o logging raiz com o nível de LOG_LEVEL, se ainda não houver handlers.
+    """
+    logging.basicConfig(
+        level=app.config.get('LOG_LEVEL', 'INFO'),
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+
+def init_app(app, db):
+    """
+    Registra o contador de consultas e o cronômetro de requisições.
+    
+    O listener é sempre registrado (custo desprezível); o cabeçalho só é
+    adicionado quando app.debug ou SQL_QUERY_COUNTER estiverem ativos.
+    Com INSTRUMENTATION=True registra também os medidores de tempo de SQL
+    e templates, o log de consultas lentas e o profiler por amostragem.
+    
+    Configurações:
+        INSTRUMENTATION (bool): Liga a instrumentação detalhada. Padrão: False
+        SLOW_QUERY_MS (float): Limite do log de consultas lentas. Padrão: 100
+        PROFILE_SAMPLE_RATE (float): Fração das requisições perfiladas (0 a 1).
+            Padrão: 0
+        PROFILE_DIR (str): Pasta dos arquivos .prof. Padrão: instance/profiles
+    
+    Args:
+        app (Flask): Aplicação Flask
+        db (SQLAlchemy): Extensão de banco de dados já inicializada
+    """
+    configure_logging(app)
+    enabled = app.config.get('INSTRUMENTATION', False)
+    sample_rate = app.config.get('PROFILE_SAMPLE_RATE', 0.0) if enabled else 0.0
+    profile_dir = app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+    
+    with app.app_context():
+        engines = [db.engine] + ([db.readonly_engine] if getattr(db, 'readonly_engine', None) else [])
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', _contar_query)
+            if enabled:
+                inicio, fim, erro = _timing_listeners(app.config.get('SLOW_QUERY_MS', 100) / 1000)
+                event.listen(engine, 'before_cursor_execute', inicio)
+                event.listen(engine, 'after_cursor_execute', fim)
+                event.listen(engine, 'handle_error', erro)
+    
+    if enabled:
+        before_render_template.connect(_iniciar_template, app)
+        template_rendered.connect(_fim_template, app)
+    
+    if sample_rate:
+        os.makedirs(profile_dir, exist_ok=True)
+    
+    @app.before_request
+    def _iniciar_cronometro():
+        g.request_started = time.perf_counter()
+        if sample_rate and random.random() < sample_rate:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                return  # Outro profiler já está ativo nesta thread
+            g.profiler = profiler
+    
+    @app.after_request
+    def _expor_contagem(response):
+        if app.debug or app.config.get('SQL_QUERY_COUNTER'):
+            response.headers[QUERY_HEADER] = str(g.get('sql_queries', 0))
+        
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or 'desconhecido'
+        observe_latency(endpoint, elapsed)
+        
+        if enabled:
+            queries = g.get('sql_queries', 0)
+            sql_time = g.get('sql_time', 0.0)
+            template_time = g.get('template_time', 0.0)
+            metrics.record_request(endpoint, request.method, response.status_code,
+                                   queries, sql_time, template_time)
+            logger.debug(
+                "%s %s %s %.1f ms | sql: %d consultas, %.1f ms | templates: %.1f ms",
+                request.method, request.path, response.status_code, elapsed * 1000,
+                queries, sql_time * 1000, template_time * 1000
+            )
+        return response
+    
+    @app.teardown_request
+    def _encerrar_perfil(exc):
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _salvar_perfil(profiler, profile_dir, request.endpoint or 'desconhecido')
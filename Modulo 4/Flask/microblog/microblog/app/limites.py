@@ -0,0 +1,324 @@
+"""
+Limite de requisições (rate limiting) por usuário e por IP.
+
+Cada regra de RATE_LIMITS é um token bucket: o balde começa cheio com
+'burst' fichas, cada requisição gasta uma, e as fichas voltam à taxa de
+'rate' a cada 'per' segundos. Sem fichas, a requisição recebe 429 com o
+cabeçalho Retry-After, antes de chegar à view (nenhum hash de senha nem
+escrita no SQLite é feito).
+
+    RATE_LIMITS = {
+        'login': {
+            'endpoints': ['main.login', 'api.create_session'],
+            'rate': 5, 'per': 60, 'burst': 10, 'key': 'ip',
+        },
+    }
+
+A chave 'key' define de quem é o balde: 'ip' (request.remote_addr) ou
+'user' (ID da sessão do Flask-Login; visitantes anônimos caem no IP). O ID
+é lido direto do cookie de sessão, então o limitador não faz consultas
+SQL. Atrás de um proxy reverso, use werkzeug.middleware.proxy_fix.ProxyFix
+para que remote_addr seja o IP do cliente.
+
+Backends (RATE_LIMIT_BACKEND):
+
+- 'memory': baldes em processo. Os baldes ficam em ordem de último uso;
+  como um balde parado por capacity/taxa segundos já está cheio de novo,
+  os mais antigos são descartados do início da fila a cada chamada, com
+  custo O(1) amortizado.
+- 'shared': baldes em um servidor no estilo redis (RATE_LIMIT_SHARED_URL),
+  atualizados por um script Lua atômico. Vale para todos os workers.
+
+Decisões (permitidas/negadas por regra) aparecem em /_metrics.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from flask import request, session
+from werkzeug.exceptions import TooManyRequests
+
+logger = logging.getLogger('microblog.ratelimit')
+
+DEFAULT_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+class Rule:
+    """
+    Regra de limite carregada de RATE_LIMITS.
+
+    Attributes:
+        name (str): Nome da regra (também é o nome do balde)
+        endpoints (tuple[str]): Endpoints do Flask cobertos pela regra
+        rate (float): Fichas devolvidas por segundo
+        capacity (float): Tamanho do balde (rajada máxima)
+        key (str): 'ip' ou 'user'
+        methods (tuple[str]): Métodos HTTP limitados
+    """
+
+    def __init__(self, name, endpoints, rate, per=1, burst=None, key='ip', methods=DEFAULT_METHODS):
+        if key not in ('ip', 'user'):
+            raise ValueError(f"RATE_LIMITS[{name!r}]: key deve ser 'ip' ou 'user'")
+        self.name = name
+        self.endpoints = tuple(endpoints)
+        self.rate = rate / per
+        self.capacity = float(burst if burst is not None else rate)
+        self.key = key
+        self.methods = tuple(method.upper() for method in methods)
+
+    @property
+    def idle_ttl(self):
+        """
+        Segundos parado após os quais o balde está cheio (pode ser descartado).
+        """
+        return self.capacity / self.rate
+
+    def __repr__(self) -> str:
+        return f'Rule({self.name}: {self.capacity:g} fichas, {self.rate:g}/s por {self.key})'
+
+
+class MemoryBackend:
+    """
+    Baldes em memória, um OrderedDict por regra ordenado por último uso.
+
+    Attributes:
+        max_keys (int): Limite de baldes por regra (protege contra muitos IPs)
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}  # regra -> OrderedDict(chave -> [fichas, atualizado_em])
+        self._lock = threading.Lock()
+
+    def consume(self, rule, key, cost=1):
+        """
+        Tenta gastar cost fichas do balde.
+
+        Returns:
+            tuple[bool, float]: Se foi permitido e as fichas restantes
+        """
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._buckets.setdefault(rule.name, OrderedDict())
+
+            # Descarta os baldes parados há tempo suficiente para estarem cheios
+            horizon = now - rule.idle_ttl
+            while buckets:
+                oldest = next(iter(buckets.values()))
+                if oldest[1] > horizon and len(buckets) < self.max_keys:
+                    break
+                buckets.popitem(last=False)
+
+            state = buckets.get(key)
+            if state is None:
+                state = buckets[key] = [rule.capacity, now]
+            else:
+                buckets.move_to_end(key)
+                state[0] = min(rule.capacity, state[0] + (now - state[1]) * rule.rate)
+                state[1] = now
+
+            allowed = state[0] >= cost
+            if allowed:
+                state[0] -= cost
+            return allowed, state[0]
+
+    def size(self):
+        return sum(len(buckets) for buckets in self._buckets.values())
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# Atualiza o balde atomicamente no servidor, usando o relógio do próprio servidor
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+class SharedBackend:
+    """
+    Baldes compartilhados entre workers, em um servidor no estilo redis.
+
+    A expiração fica a cargo do servidor (PEXPIRE igual ao tempo para o
+    balde encher), então baldes inativos não ocupam memória.
+
+    Attributes:
+        client: Cliente com register_script (API do redis-py)
+        prefix (str): Prefixo das chaves
+    """
+
+    def __init__(self, client, prefix='microblog:ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_LUA)
+
+    def consume(self, rule, key, cost=1):
+        allowed, tokens = self._script(
+            keys=[f'{self.prefix}{rule.name}:{key}'],
+            args=[rule.rate, rule.capacity, cost]
+        )
+        return bool(allowed), float(tokens)
+
+    def size(self):
+        return None
+
+    def clear(self):
+        pass
+
+
+class RateLimiter:
+    """
+    Aplica as regras de RATE_LIMITS antes de cada requisição.
+
+    Segue o padrão das extensões Flask: a instância é criada no import e
+    configurada depois com init_app(app).
+
+    Attributes:
+        backend: MemoryBackend ou SharedBackend
+        rules (dict[str, Rule]): Regras por nome
+        allowed (dict[str, int]): Requisições permitidas por regra
+        denied (dict[str, int]): Requisições negadas (429) por regra
+    """
+
+    def __init__(self):
+        self.backend = MemoryBackend()
+        self.rules = {}
+        self.enabled = True
+        self.allowed = {}
+        self.denied = {}
+        self._by_endpoint = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app, client=None):
+        """
+        Carrega as regras e registra o before_request.
+
+        Configurações:
+            RATE_LIMIT_ENABLED (bool): Liga o limitador. Padrão: True
+            RATE_LIMITS (dict): Regras (ver docstring do módulo)
+            RATE_LIMIT_BACKEND (str): 'memory' ou 'shared'. Padrão: 'memory'
+            RATE_LIMIT_MAX_KEYS (int): Baldes por regra no backend em memória
+            RATE_LIMIT_SHARED_URL (str): URL do servidor para 'shared'
+
+        Args:
+            app (Flask): Aplicação Flask
+            client (optional): Cliente já construído para o backend 'shared'
+
+        Raises:
+            ValueError: Se uma regra ou o backend forem inválidos
+        """
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.rules = {
+            name: Rule(name, **options)
+            for name, options in app.config.get('RATE_LIMITS', {}).items()
+        }
+        self._by_endpoint = {}
+        for rule in self.rules.values():
+            for endpoint in rule.endpoints:
+                self._by_endpoint.setdefault(endpoint, []).append(rule)
+        self.allowed = {name: 0 for name in self.rules}
+        self.denied = {name: 0 for name in self.rules}
+
+        kind = app.config.get('RATE_LIMIT_BACKEND', 'memory')
+        if kind == 'memory':
+            self.backend = MemoryBackend(app.config.get('RATE_LIMIT_MAX_KEYS', 100000))
+        elif kind == 'shared':
+            if client is None:
+                # Dependência opcional: só é exigida quando o backend é usado
+                import redis
+                client = redis.Redis.from_url(app.config['RATE_LIMIT_SHARED_URL'])
+            self.backend = SharedBackend(client)
+        else:
+            raise ValueError(f"RATE_LIMIT_BACKEND desconhecido: {kind!r}")
+
+        app.extensions['rate_limiter'] = self
+        app.before_request(self.check)
+
+    def _identity(self, rule):
+        if rule.key == 'user':
+            # Lido do cookie de sessão: current_user faria uma consulta SQL
+            user_id = session.get('_user_id')
+            if user_id is not None:
+                return f'user:{user_id}'
+        return f'ip:{request.remote_addr}'
+
+    def hit(self, rule, identity, cost=1):
+        """
+        Consome fichas de uma regra e contabiliza a decisão.
+
+        Returns:
+            tuple[bool, float]: Se foi permitido e segundos até haver fichas
+        """
+        allowed, tokens = self.backend.consume(rule, identity, cost)
+        with self._lock:
+            counter = self.allowed if allowed else self.denied
+            counter[rule.name] = counter.get(rule.name, 0) + 1
+        retry_after = 0.0 if allowed else (cost - tokens) / rule.rate
+        return allowed, retry_after
+
+    def check(self):
+        """
+        before_request: responde 429 se alguma regra da rota estiver esgotada.
+
+        Raises:
+            TooManyRequests: Com Retry-After em segundos
+        """
+        if not self.enabled:
+            return None
+        for rule in self._by_endpoint.get(request.endpoint, ()):
+            if request.method not in rule.methods:
+                continue
+            identity = self._identity(rule)
+            allowed, retry_after = self.hit(rule, identity)
+            if not allowed:
+                wait = max(1, int(retry_after + 0.999))
+                logger.info("Limite '%s' atingido por %s em %s", rule.name, identity, request.path)
+                raise TooManyRequests(
+                    f"Muitas requisições. Tente novamente em {wait} segundos.",
+                    retry_after=wait
+                )
+        return None
+
+    def stats(self):
+        """
+        Contadores por regra, para métricas.
+
+        Returns:
+            dict: allowed e denied por regra, e buckets (backend em memória)
+        """
+        with self._lock:
+            return {
+                'allowed': dict(self.allowed),
+                'denied': dict(self.denied),
+                'buckets': self.backend.size(),
+            }
+
+    def reset(self):
+        """
+        Esvazia os baldes e zera os contadores (útil em testes).
+        """
+        self.backend.clear()
+        with self._lock:
+            self.allowed = {name: 0 for name in self.rules}
+            self.denied = {name: 0 for name in self.rules}
+
+
+# Instância global, no mesmo estilo de cache e db
+limiter = RateLimiter()
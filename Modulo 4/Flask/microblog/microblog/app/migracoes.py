@@ -0,0 +1,385 @@
+"""
+Executor de migrações versionadas do banco de dados.
+
+Cada migração é um arquivo em app/migrations/ chamado NNNN_descricao.py,
+aplicado em ordem numérica. O arquivo define:
+
+    def upgrade(ctx):      # obrigatório: aplica a mudança
+    def estimate(ctx):     # opcional: linhas afetadas (para --dry-run)
+
+As versões aplicadas ficam na tabela schema_version, junto com o
+checksum (SHA-256) do arquivo. Se um arquivo já aplicado for alterado,
+o executor se recusa a continuar.
+
+Cargas de dados grandes usam ctx.backfill(), que processa a tabela em
+lotes de N linhas com um commit por lote. Assim nenhuma transação segura
+o lock de escrita por muito tempo, e uma execução interrompida continua
+do último lote gravado (tabela schema_backfill_progress).
+
+Uso:
+    flask db upgrade               # aplica as migrações pendentes
+    flask db upgrade --dry-run     # mostra o que seria feito
+    flask db upgrade --batch-size 5000
+    flask db status
+    flask db reconcile-counters    # corrige users.post_count e last_post_at
+"""
+
+import hashlib
+import importlib.util
+import os
+import re
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import text
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+FILENAME_RE = re.compile(r'^(\d{4})_(\w+)\.py$')
+DEFAULT_BATCH_SIZE = 1000
+
+class MigrationError(Exception):
+    """
+    Erro de consistência das migrações (checksum alterado, versão duplicada).
+    """
+
+
+class Migration:
+    """
+    Arquivo de migração descoberto em disco.
+
+    Attributes:
+        version (int): Número da versão (prefixo do arquivo)
+        name (str): Descrição (resto do nome do arquivo)
+        path (str): Caminho do arquivo
+        checksum (str): SHA-256 do conteúdo do arquivo
+    """
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        with open(path, 'rb') as f:
+            self.checksum = hashlib.sha256(f.read()).hexdigest()
+        self._module = None
+
+    @property
+    def module(self):
+        """
+        Carrega o arquivo como módulo na primeira vez que é usado.
+        """
+        if self._module is None:
+            spec = importlib.util.spec_from_file_location(f'migration_{self.version:04d}', self.path)
+            self._module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self._module)
+        return self._module
+
+    def __repr__(self) -> str:
+        return f'Migration({self.version:04d}_{self.name})'
+
+
+class MigrationContext:
+    """
+    Objeto recebido por upgrade(ctx) e estimate(ctx).
+
+    Attributes:
+        conn (Connection): Conexão do SQLAlchemy usada pela migração
+        version (int): Versão da migração em execução
+        batch_size (int): Linhas por lote em backfill()
+        dry_run (bool): True quando apenas estimando
+    """
+
+    def __init__(self, conn, version, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, echo=print):
+        self.conn = conn
+        self.version = version
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.echo = echo
+
+    def execute(self, sql, params=None):
+        """
+        Executa uma instrução SQL (texto) na transação atual.
+        """
+        return self.conn.execute(text(sql), params or {})
+
+    def scalar(self, sql, params=None):
+        """
+        Executa uma consulta e devolve o primeiro valor da primeira linha.
+        """
+        return self.execute(sql, params).scalar()
+
+    def commit(self):
+        self.conn.commit()
+
+    def table_exists(self, table):
+        return self.scalar(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name", {'name': table}
+        ) is not None
+
+    def column_exists(self, table, column):
+        columns = [row[1] for row in self.execute(f"PRAGMA table_info({table})")]
+        return column in columns
+
+    def count(self, table):
+        return self.scalar(f"SELECT COUNT(*) FROM {table}") if self.table_exists(table) else 0
+
+    def backfill_started(self, name):
+        """
+        Verifica se um backfill com este nome já começou (e talvez parou no meio).
+        """
+        return self._progress(name) is not None
+
+    def _progress(self, name):
+        if not self.table_exists('schema_backfill_progress'):  # dry-run em banco novo
+            return None
+        return self.execute(
+            "SELECT last_id, upper_id FROM schema_backfill_progress WHERE version = :v AND name = :n",
+            {'v': self.version, 'n': name}
+        ).first()
+
+    def pending_rows(self, name, table):
+        """
+        Quantas linhas de table ainda faltam para o backfill informado.
+        """
+        row = self._progress(name)
+        if row is None:
+            return self.count(table)
+        return self.scalar(
+            f"SELECT COUNT(*) FROM {table} WHERE id > :last AND id <= :upper",
+            {'last': row[0], 'upper': row[1]}
+        )
+
+    def backfill(self, name, sql, table='posts', upper_id=None):
+        """
+        Aplica sql em lotes de batch_size linhas de table, com commit por lote.
+
+        O SQL recebe os parâmetros :first_id e :last_id, que delimitam o
+        intervalo de IDs do lote. O limite superior é fixado na primeira
+        execução (MAX(id) naquele momento, ou upper_id): linhas criadas
+        depois disso são responsabilidade do código da aplicação ou dos
+        triggers, não do backfill.
+
+        Args:
+            name (str): Identificador do backfill dentro da migração
+            sql (str): Instrução com :first_id e :last_id
+            table (str): Tabela percorrida (precisa de coluna id crescente)
+            upper_id (int, optional): Maior ID a processar
+
+        Returns:
+            int: Número de lotes processados nesta execução
+        """
+        row = self._progress(name)
+        if row is None:
+            if upper_id is None:
+                upper_id = self.scalar(f"SELECT MAX(id) FROM {table}") or 0
+            self.execute(
+                "INSERT INTO schema_backfill_progress (version, name, last_id, upper_id) "
+                "VALUES (:v, :n, 0, :upper)",
+                {'v': self.version, 'n': name, 'upper': upper_id}
+            )
+            self.commit()
+            last_id = 0
+        else:
+            last_id, upper_id = row
+            if last_id < upper_id:
+                self.echo(f"   ↪️ Retomando '{name}' a partir do id {last_id + 1}")
+
+        batches = 0
+        while last_id < upper_id:
+            end_id = self.scalar(
+                f"SELECT MAX(id) FROM (SELECT id FROM {table} "
+                f"WHERE id > :last AND id <= :upper ORDER BY id LIMIT :limit)",
+                {'last': last_id, 'upper': upper_id, 'limit': self.batch_size}
+            )
+            if end_id is None:
+                end_id = upper_id
+            else:
+                self.execute(sql, {'first_id': last_id + 1, 'last_id': end_id})
+
+            self.execute(
+                "UPDATE schema_backfill_progress SET last_id = :last WHERE version = :v AND name = :n",
+                {'last': end_id, 'v': self.version, 'n': name}
+            )
+            self.commit()
+            batches += 1
+            last_id = end_id
+            self.echo(f"   📦 '{name}': lote {batches} até o id {end_id} de {upper_id}")
+
+        return batches
+
+
+def discover(directory=MIGRATIONS_DIR):
+    """
+    Lista os arquivos de migração em ordem de versão.
+
+    Returns:
+        list[Migration]: Migrações encontradas
+
+    Raises:
+        MigrationError: Se duas migrações tiverem a mesma versão
+    """
+    migrations = {}
+    for filename in sorted(os.listdir(directory)):
+        match = FILENAME_RE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"Versão {version:04d} duplicada: {filename}")
+        migrations[version] = Migration(version, match.group(2), os.path.join(directory, filename))
+    return [migrations[v] for v in sorted(migrations)]
+
+def _ensure_tables(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+        "checksum VARCHAR NOT NULL, applied_at DATETIME NOT NULL)"
+    ))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_backfill_progress ("
+        "version INTEGER NOT NULL, name VARCHAR NOT NULL, "
+        "last_id INTEGER NOT NULL, upper_id INTEGER NOT NULL, "
+        "PRIMARY KEY (version, name))"
+    ))
+    conn.commit()
+
+def _applied(conn):
+    # Sem a tabela (banco novo, consultado só para leitura): nada aplicado
+    exists = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    )).first()
+    if exists is None:
+        return {}
+    rows = conn.execute(text("SELECT version, checksum FROM schema_version")).all()
+    return {version: checksum for version, checksum in rows}
+
+def _check_checksums(migrations, applied):
+    for migration in migrations:
+        stored = applied.get(migration.version)
+        if stored is not None and stored != migration.checksum:
+            raise MigrationError(
+                f"A migração {migration.version:04d}_{migration.name} foi alterada depois "
+                f"de aplicada. Crie uma nova migração em vez de editar a antiga."
+            )
+
+def upgrade(engine, dry_run=False, batch_size=DEFAULT_BATCH_SIZE, directory=MIGRATIONS_DIR, echo=print):
+    """
+    Aplica as migrações pendentes, em ordem.
+
+    Em dry-run nada é gravado no banco, nem as tabelas de controle.
+
+    Args:
+        engine (Engine): Engine do banco de dados
+        dry_run (bool, optional): Só mostra as migrações e as linhas estimadas
+        batch_size (int, optional): Linhas por lote nos backfills
+        directory (str, optional): Pasta com os arquivos de migração
+        echo (Callable[[str], None], optional): Função de saída das mensagens
+
+    Returns:
+        list[Migration]: Migrações aplicadas (ou que seriam, em dry-run)
+
+    Raises:
+        MigrationError: Se uma migração aplicada tiver sido alterada
+    """
+    migrations = discover(directory)
+
+    with engine.connect() as conn:
+        if not dry_run:
+            _ensure_tables(conn)
+        applied = _applied(conn)
+        _check_checksums(migrations, applied)
+
+        pending = [m for m in migrations if m.version not in applied]
+        if not pending:
+            echo("✅ Banco de dados atualizado. Nenhuma migração pendente.")
+            return []
+
+        for migration in pending:
+            ctx = MigrationContext(conn, migration.version, batch_size, dry_run, echo)
+            label = f"{migration.version:04d}_{migration.name}"
+
+            if dry_run:
+                estimate = getattr(migration.module, 'estimate', None)
+                rows = estimate(ctx) if estimate else None
+                detail = f"~{rows} linhas" if rows is not None else "linhas não estimadas"
+                echo(f"🔍 {label}: {detail}")
+                conn.rollback()
+                continue
+
+            echo(f"🔄 Aplicando {label}...")
+            migration.module.upgrade(ctx)
+            conn.execute(
+                text("INSERT INTO schema_version (version, name, checksum, applied_at) "
+                     "VALUES (:v, :n, :c, :t)"),
+                {'v': migration.version, 'n': migration.name,
+                 'c': migration.checksum, 't': datetime.now()}
+            )
+            conn.commit()
+            echo(f"✅ {label} aplicada")
+
+    return pending
+
+def status(engine, directory=MIGRATIONS_DIR):
+    """
+    Lista cada migração com seu estado.
+
+    Returns:
+        list[tuple[Migration, str]]: Pares (migração, 'aplicada' | 'pendente' | 'alterada')
+    """
+    migrations = discover(directory)
+    with engine.connect() as conn:
+        applied = _applied(conn)
+
+    result = []
+    for migration in migrations:
+        stored = applied.get(migration.version)
+        if stored is None:
+            state = 'pendente'
+        elif stored != migration.checksum:
+            state = 'alterada'
+        else:
+            state = 'aplicada'
+        result.append((migration, state))
+    return result
+
+
+# Comandos de linha: flask db upgrade | flask db status | flask db reconcile-counters
+db_cli = AppGroup('db', help='Migrações do banco de dados.')
+
+@db_cli.command('upgrade')
+@click.option('--dry-run', is_flag=True, help='Mostra as migrações pendentes e as linhas estimadas.')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Linhas por lote (e por commit) nos backfills.')
+def upgrade_command(dry_run, batch_size):
+    """
+    Aplica as migrações pendentes.
+    """
+    from app import db
+    try:
+        upgrade(db.engine, dry_run=dry_run, batch_size=batch_size, echo=click.echo)
+    except MigrationError as e:
+        raise click.ClickException(str(e))
+
+@db_cli.command('status')
+def status_command():
+    """
+    Mostra as migrações aplicadas e pendentes.
+    """
+    from app import db
+    icons = {'aplicada': '✅', 'pendente': '⏳', 'alterada': '⚠️'}
+    for migration, state in status(db.engine):
+        click.echo(f"{icons[state]} {migration.version:04d}_{migration.name} ({state})")
+
+@db_cli.command('reconcile-counters')
+@click.option('--dry-run', is_flag=True, help='Apenas conta os usuários com contadores divergentes.')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Usuários por lote (e por commit).')
+def reconcile_counters_command(dry_run, batch_size):
+    """
+    Corrige users.post_count e users.last_post_at a partir de posts.
+    """
+    from app import alquimias
+    result = alquimias.reconcile_user_counters(batch_size, dry_run=dry_run, echo=click.echo)
+    verb = 'divergentes' if dry_run else 'corrigidos'
+    click.echo(f"✅ {result['checked']} usuários verificados em {result['batches']} lotes, "
+               f"{result['fixed']} {verb}")
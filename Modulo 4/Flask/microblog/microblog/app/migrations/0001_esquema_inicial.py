@@ -0,0 +1,34 @@
+"""
+Esquema inicial: tabelas users e posts da primeira versão do microblog.
+
+Usa IF NOT EXISTS para que bancos criados antes das migrações (pelo
+antigo db.create_all() no import) possam ser adotados sem erro.
+"""
+
+def upgrade(ctx):
+    ctx.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER NOT NULL,
+            username VARCHAR NOT NULL,
+            password_hash VARCHAR NOT NULL,
+            remember BOOLEAN NOT NULL,
+            last_login DATETIME NOT NULL,
+            photo_url VARCHAR,
+            bio VARCHAR,
+            PRIMARY KEY (id),
+            UNIQUE (username)
+        )
+    """)
+    ctx.execute("""
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER NOT NULL,
+            body VARCHAR NOT NULL,
+            timestamp DATETIME NOT NULL,
+            user_id INTEGER NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(user_id) REFERENCES users (id)
+        )
+    """)
+
+def estimate(ctx):
+    return 0
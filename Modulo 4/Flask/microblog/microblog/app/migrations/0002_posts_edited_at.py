@@ -0,0 +1,13 @@
+"""
+Adiciona a coluna edited_at à tabela posts (antigo add_editted_at_column.py).
+
+Posts existentes ficam com edited_at = NULL (não editados).
+"""
+
+def upgrade(ctx):
+    if not ctx.column_exists('posts', 'edited_at'):
+        ctx.execute("ALTER TABLE posts ADD COLUMN edited_at DATETIME")
+
+def estimate(ctx):
+    # ADD COLUMN no SQLite só altera o esquema, sem reescrever linhas
+    return 0
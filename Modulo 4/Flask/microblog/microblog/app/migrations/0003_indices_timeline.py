@@ -0,0 +1,20 @@
+"""
+Índices compostos da paginação por cursor (timestamp, id) da timeline
+e dos posts de cada usuário.
+"""
+
+def upgrade(ctx):
+    ctx.execute(
+        "CREATE INDEX IF NOT EXISTS ix_posts_timestamp_id "
+        "ON posts (timestamp DESC, id DESC)"
+    )
+    ctx.execute(
+        "CREATE INDEX IF NOT EXISTS ix_posts_user_id_timestamp "
+        "ON posts (user_id, timestamp DESC, id DESC)"
+    )
+    # Atualiza as estatísticas usadas pelo planejador de consultas
+    ctx.execute("ANALYZE posts")
+
+def estimate(ctx):
+    # Cada índice lê a tabela inteira uma vez
+    return 2 * ctx.count('posts')
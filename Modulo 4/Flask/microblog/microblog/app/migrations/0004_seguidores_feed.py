@@ -0,0 +1,54 @@
+"""
+Grafo de seguidores e feeds pré-calculados.
+
+Cria followers e feed_entries, adiciona users.follower_count e copia os
+posts existentes para o feed de seus autores, em lotes.
+"""
+
+def upgrade(ctx):
+    ctx.execute("""
+        CREATE TABLE IF NOT EXISTS followers (
+            follower_id INTEGER NOT NULL,
+            followed_id INTEGER NOT NULL,
+            PRIMARY KEY (follower_id, followed_id),
+            FOREIGN KEY(follower_id) REFERENCES users (id),
+            FOREIGN KEY(followed_id) REFERENCES users (id)
+        )
+    """)
+    ctx.execute(
+        "CREATE INDEX IF NOT EXISTS ix_followers_followed_id "
+        "ON followers (followed_id, follower_id)"
+    )
+    ctx.execute("""
+        CREATE TABLE IF NOT EXISTS feed_entries (
+            user_id INTEGER NOT NULL,
+            post_id INTEGER NOT NULL,
+            timestamp DATETIME NOT NULL,
+            PRIMARY KEY (user_id, post_id),
+            FOREIGN KEY(user_id) REFERENCES users (id),
+            FOREIGN KEY(post_id) REFERENCES posts (id)
+        )
+    """)
+    ctx.execute(
+        "CREATE INDEX IF NOT EXISTS ix_feed_entries_user_timestamp "
+        "ON feed_entries (user_id, timestamp DESC, post_id DESC)"
+    )
+    ctx.execute("CREATE INDEX IF NOT EXISTS ix_feed_entries_post_id ON feed_entries (post_id)")
+    
+    if not ctx.column_exists('users', 'follower_count'):
+        ctx.execute("ALTER TABLE users ADD COLUMN follower_count INTEGER NOT NULL DEFAULT 0")
+        ctx.execute(
+            "UPDATE users SET follower_count = "
+            "(SELECT COUNT(*) FROM followers WHERE followed_id = users.id)"
+        )
+    ctx.commit()
+    
+    # Cada autor vê os próprios posts no feed; INSERT OR IGNORE torna o lote idempotente
+    ctx.backfill(
+        'feed_entries',
+        "INSERT OR IGNORE INTO feed_entries (user_id, post_id, timestamp) "
+        "SELECT user_id, id, timestamp FROM posts WHERE id BETWEEN :first_id AND :last_id"
+    )
+
+def estimate(ctx):
+    return ctx.count('users') + ctx.pending_rows('feed_entries', 'posts')
@@ -0,0 +1,69 @@
+"""
+Índice de busca textual (FTS5) sobre posts.body.
+
+Os triggers mantêm o índice em sincronia a partir do momento em que são
+criados; os posts anteriores entram por um backfill em lotes, limitado
+ao maior ID existente na criação dos triggers.
+
+Enquanto o backfill não termina, os triggers ignoram os posts do
+intervalo ainda não indexado: um 'delete' do FTS5 para uma linha que
+nunca foi inserida corrompe o índice ("database disk image is
+malformed"). Esses posts entram no índice com o conteúdo atual quando o
+lote deles for processado.
+"""
+
+VERSION = 5
+BACKFILL = 'posts_fts'
+
+def _not_pending(row):
+    # Verdadeiro se row.id não está no intervalo que o backfill ainda vai indexar
+    return (
+        "NOT EXISTS (SELECT 1 FROM schema_backfill_progress "
+        f"WHERE version = {VERSION} AND name = '{BACKFILL}' "
+        f"AND {row}.id > last_id AND {row}.id <= upper_id)"
+    )
+
+FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "body, content='posts', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts "
+    f"WHEN {_not_pending('new')} BEGIN "
+    "INSERT INTO posts_fts(rowid, body) VALUES (new.id, new.body); "
+    "END",
+    
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts "
+    f"WHEN {_not_pending('old')} BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+    "END",
+    
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF body ON posts "
+    f"WHEN {_not_pending('old')} BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+    "INSERT INTO posts_fts(rowid, body) VALUES (new.id, new.body); "
+    "END",
+]
+
+def upgrade(ctx):
+    created = not ctx.table_exists('posts_fts')
+    
+    upper_id = None
+    if created:
+        for statement in FTS_DDL:
+            ctx.execute(statement)
+        upper_id = ctx.scalar("SELECT MAX(id) FROM posts") or 0
+    
+    # Banco que já tinha o índice (script antigo add_posts_fts.py): nada a indexar
+    if created or ctx.backfill_started(BACKFILL):
+        ctx.backfill(
+            BACKFILL,
+            "INSERT INTO posts_fts (rowid, body) "
+            "SELECT id, body FROM posts WHERE id BETWEEN :first_id AND :last_id",
+            upper_id=upper_id
+        )
+
+def estimate(ctx):
+    if ctx.table_exists('posts_fts') and not ctx.backfill_started(BACKFILL):
+        return 0
+    return ctx.pending_rows(BACKFILL, 'posts')
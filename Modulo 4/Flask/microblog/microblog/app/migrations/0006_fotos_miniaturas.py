@@ -0,0 +1,16 @@
+"""
+Adiciona users.photo_key, a chave das miniaturas da foto de perfil.
+
+Usuários que já tinham photo_url ficam com photo_key = NULL (imagem
+padrão) até rodar 'flask fotos sync', que baixa as fotos e gera as
+miniaturas.
+"""
+
+def upgrade(ctx):
+    if not ctx.column_exists('users', 'photo_key'):
+        ctx.execute("ALTER TABLE users ADD COLUMN photo_key VARCHAR")
+    # Usado para gerar de novo uma miniatura descartada do cache
+    ctx.execute("CREATE INDEX IF NOT EXISTS ix_users_photo_key ON users (photo_key)")
+
+def estimate(ctx):
+    return 0
@@ -0,0 +1,29 @@
+"""
+Contadores desnormalizados por usuário: users.post_count e users.last_post_at.
+
+Os valores dos usuários existentes são calculados em lotes de IDs de
+usuário. A partir daí create_post, bulk_create_posts e delete_post mantêm
+os contadores na mesma transação do post; 'flask db reconcile-counters'
+corrige eventuais divergências.
+"""
+
+def upgrade(ctx):
+    if not ctx.column_exists('users', 'post_count'):
+        ctx.execute("ALTER TABLE users ADD COLUMN post_count INTEGER NOT NULL DEFAULT 0")
+    if not ctx.column_exists('users', 'last_post_at'):
+        ctx.execute("ALTER TABLE users ADD COLUMN last_post_at DATETIME")
+    ctx.commit()
+    
+    # Valores absolutos: repetir um lote (retomada) não conta posts duas vezes.
+    # As subconsultas usam ix_posts_user_id_timestamp.
+    ctx.backfill(
+        'user_counters',
+        "UPDATE users SET "
+        "post_count = (SELECT COUNT(*) FROM posts WHERE posts.user_id = users.id), "
+        "last_post_at = (SELECT MAX(timestamp) FROM posts WHERE posts.user_id = users.id) "
+        "WHERE id BETWEEN :first_id AND :last_id",
+        table='users'
+    )
+
+def estimate(ctx):
+    return ctx.pending_rows('user_counters', 'users')
@@ -1,10 +1,28 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy import inspect
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app import db
+from app import db, senhas
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 from typing import Optional
 
+def utcnow():
+    """
+    Data e hora atual em UTC, sem fuso (o SQLite guarda datas sem fuso).
+    
+    Único relógio das datas gravadas pela aplicação: criação e edição de
+    posts e último login.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+# Tabela de associação do grafo de seguidores (quem segue quem)
+followers = db.Table(
+    'followers',
+    db.Column('follower_id', db.ForeignKey('users.id'), primary_key=True),
+    db.Column('followed_id', db.ForeignKey('users.id'), primary_key=True),
+    # Busca dos seguidores de um autor no fan-out de create_post
+    db.Index('ix_followers_followed_id', 'followed_id', 'follower_id'),
+)
+
 class User(UserMixin, db.Model):
     """
     Modelo de usuário com perfil completo.
@@ -18,8 +36,14 @@ class User(UserMixin, db.Model):
         remember (bool): Flag para persistência de sessão
         last_login (datetime): Último acesso
         photo_url (str, optional): URL da foto de perfil
+        photo_key (str, optional): Chave das miniaturas da foto (ver app/fotos.py)
         bio (str, optional): Biografia do usuário
+        follower_count (int): Número de seguidores (desnormalizado)
+        post_count (int): Número de posts (desnormalizado)
+        last_post_at (datetime, optional): Data do post mais recente (desnormalizado)
         posts (relationship): Relação com posts do usuário
+        following (relationship): Usuários que este usuário segue
+        followers (relationship): Usuários que seguem este usuário
     """
     __tablename__ = 'users'
     
@@ -31,19 +55,45 @@ class User(UserMixin, db.Model):
     
     # ✅ NOVOS CAMPOS
     photo_url: Mapped[Optional[str]] = mapped_column(default=None, nullable=True)
+    photo_key: Mapped[Optional[str]] = mapped_column(default=None, nullable=True, index=True)
     bio: Mapped[Optional[str]] = mapped_column(default=None, nullable=True)
     
+    # Mantido por follow/unfollow; decide entre fan-out na escrita ou na leitura
+    follower_count: Mapped[int] = mapped_column(default=0, server_default='0', nullable=False)
+    
+    # Mantidos por create_post/delete_post; o perfil lê sem COUNT(*) em posts
+    post_count: Mapped[int] = mapped_column(default=0, server_default='0', nullable=False)
+    last_post_at: Mapped[Optional[datetime]] = mapped_column(default=None, nullable=True)
+    
     # Relacionamento com posts
     posts: Mapped[list["Post"]] = relationship('Post', back_populates='author', lazy='dynamic')
+    
+    # Grafo de seguidores
+    following: Mapped[list["User"]] = relationship(
+        'User',
+        secondary=followers,
+        primaryjoin=lambda: User.id == followers.c.follower_id,
+        secondaryjoin=lambda: User.id == followers.c.followed_id,
+        back_populates='followers',
+        lazy='dynamic'
+    )
+    followers: Mapped[list["User"]] = relationship(
+        'User',
+        secondary=followers,
+        primaryjoin=lambda: User.id == followers.c.followed_id,
+        secondaryjoin=lambda: User.id == followers.c.follower_id,
+        back_populates='following',
+        lazy='dynamic'
+    )
 
     def set_password(self, password):
         """
-        Gera hash seguro da senha.
+        Gera hash seguro da senha (no pool de processos de app.senhas).
         
         Args:
             password (str): Senha em texto plano
         """
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = senhas.hash_password(password)
     
     def check_password(self, password):
         """
@@ -55,7 +105,7 @@ class User(UserMixin, db.Model):
         Returns:
             bool: True se senha correta
         """
-        return check_password_hash(self.password_hash, password)
+        return senhas.verify_password(self.password_hash, password)
 
     def __repr__(self) -> str:
         return f'User(id={self.id}, username={self.username})'
@@ -80,7 +130,7 @@ class Post(db.Model):
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     body: Mapped[str] = mapped_column(nullable=False)
-    timestamp: Mapped[datetime] = mapped_column(default=datetime.now, nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(default=utcnow, nullable=False)
     edited_at: Mapped[Optional[datetime]] = mapped_column(default=None, nullable=True)
     user_id: Mapped[int] = mapped_column(db.ForeignKey('users.id'), nullable=False)
     
@@ -88,4 +138,44 @@ class Post(db.Model):
     author: Mapped["User"] = relationship('User', back_populates='posts')
     
     def __repr__(self) -> str:
-        return f'Post(id={self.id}, body={self.body[:20]}..., author={self.author.username})'
\ No newline at end of file
+        # Não força o carregamento do autor só para montar o repr
+        if 'author' in inspect(self).unloaded:
+            return f'Post(id={self.id}, body={self.body[:20]}..., user_id={self.user_id})'
+        return f'Post(id={self.id}, body={self.body[:20]}..., author={self.author.username})'
+
+class FeedEntry(db.Model):
+    """
+    Entrada do feed pré-calculado (home) de um usuário.
+    
+    Cada post é copiado para o feed de cada seguidor no momento em que é
+    criado (fan-out na escrita). Ler a home vira uma única busca por
+    intervalo no índice (user_id, timestamp, post_id).
+    
+    Attributes:
+        user_id (int): Dono do feed (FK)
+        post_id (int): Post exibido no feed (FK)
+        timestamp (datetime): Cópia de Post.timestamp, usada na ordenação
+        post (relationship): Relação com o post
+    """
+    __tablename__ = 'feed_entries'
+    
+    user_id: Mapped[int] = mapped_column(db.ForeignKey('users.id'), primary_key=True)
+    post_id: Mapped[int] = mapped_column(db.ForeignKey('posts.id'), primary_key=True)
+    timestamp: Mapped[datetime] = mapped_column(nullable=False)
+    
+    post: Mapped["Post"] = relationship('Post')
+    
+    __table_args__ = (
+        db.Index('ix_feed_entries_user_timestamp', 'user_id', db.desc('timestamp'), db.desc('post_id')),
+        # Remoção das entradas de um post em delete_post
+        db.Index('ix_feed_entries_post_id', 'post_id'),
+    )
+    
+    def __repr__(self) -> str:
+        return f'FeedEntry(user_id={self.user_id}, post_id={self.post_id})'
+
+
+# Índices compostos para a paginação por keyset (timestamp, id):
+# a timeline global e o feed de cada usuário viram buscas por intervalo
+db.Index('ix_posts_timestamp_id', Post.timestamp.desc(), Post.id.desc())
+db.Index('ix_posts_user_id_timestamp', Post.user_id, Post.timestamp.desc(), Post.id.desc())
\ No newline at end of file
@@ -1,44 +1,209 @@
 from flask import (
+    Blueprint,
+    current_app,
     render_template,
     request,
     url_for,
     redirect,
-    flash
+    flash,
+    abort,
+    jsonify,
+    Response
 )
-from app import app, db
-from app import alquimias
+from markupsafe import Markup
+from app import db
+from app import alquimias, instrumentacao
+from app.cache import cache
+from app.fotos import PhotoError, thumbnails
+from app.limites import limiter
 from flask_login import login_user, logout_user, current_user, login_required
 
 """
 Rotas da aplicação Microblog.
 
 Inclui autenticação, CRUD de posts e gerenciamento de perfil.
+As rotas ficam no blueprint 'main', registrado por create_app().
 """
 
-@app.route('/')
+main = Blueprint('main', __name__)
+
+@main.app_context_processor
+def inject_render_post():
+    """
+    Disponibiliza render_post() nos templates.
+    
+    O HTML de cada post é guardado no cache (fragment:<id>:<autor?>) e
+    reaproveitado entre requisições até o post ser editado ou deletado.
+    Aceita tanto posts serializados (dict) quanto objetos Post.
+    """
+    def render_post(post):
+        if not isinstance(post, dict):
+            post = alquimias.serialize_post(post)
+        is_owner = post['user_id'] == current_user.id
+        return cache.get_or_set(
+            alquimias.fragment_key(post['id'], is_owner),
+            lambda: Markup(render_template('_post.html', post=post, user=current_user))
+        )
+    return {'render_post': render_post}
+
+@main.route('/')
 @login_required
 def index():
     """
     Página inicial (home) com timeline de posts.
     
-    Exibe os 5 posts mais recentes de todos os usuários usando get_timeline().
+    Exibe uma página da timeline de todos os usuários usando
+    get_timeline_cached(). O parâmetro ?cursor= da URL aponta para a
+    página seguinte (posts mais antigos).
     Requer autenticação (redireciona para login se não autenticado).
     """
     user = None
     posts = []
+    next_cursor = None
     
     if current_user.is_authenticated:
         user = current_user
-        posts = alquimias.get_timeline(limit=5)
+        try:
+            posts, next_cursor = alquimias.get_timeline_cached(
+                cursor=request.args.get('cursor')
+            )
+        except ValueError:
+            abort(400)
 
     return render_template(
         'index.html',
         title='Home',
         user=user,
-        posts=posts
+        posts=posts,
+        next_cursor=next_cursor,
+        is_first_page='cursor' not in request.args
     )
 
-@app.route('/login', methods=['GET', 'POST'])
+@main.route('/feed')
+@login_required
+def feed():
+    """
+    Feed pessoal com posts próprios e de quem o usuário segue.
+    
+    Lido da tabela feed_entries, pré-calculada no momento em que cada
+    post é criado (ver alquimias.get_home_feed_page).
+    """
+    try:
+        posts, next_cursor = alquimias.get_home_feed_page(
+            current_user.id,
+            cursor=request.args.get('cursor')
+        )
+    except ValueError:
+        abort(400)
+    
+    return render_template(
+        'feed.html',
+        title='Feed',
+        user=current_user,
+        posts=posts,
+        next_cursor=next_cursor,
+        is_first_page='cursor' not in request.args
+    )
+
+@main.route('/user/<username>')
+@login_required
+def user_profile(username):
+    """
+    Perfil público de um usuário com seus posts paginados.
+    
+    Args:
+        username (str): Nome do usuário exibido
+    """
+    profile = alquimias.user_exists(username.lower())
+    if not profile:
+        abort(404)
+    
+    try:
+        posts, next_cursor = alquimias.get_user_posts_page(
+            profile.id,
+            cursor=request.args.get('cursor')
+        )
+    except ValueError:
+        abort(400)
+    
+    return render_template(
+        'user.html',
+        title=f'@{profile.username}',
+        user=current_user,
+        profile=profile,
+        following=alquimias.is_following(current_user.id, profile.id),
+        posts=posts,
+        next_cursor=next_cursor,
+        is_first_page='cursor' not in request.args
+    )
+
+@main.route('/follow/<username>', methods=['POST'])
+@login_required
+def follow(username):
+    """
+    Passa a seguir um usuário.
+    
+    Args:
+        username (str): Nome do usuário a ser seguido
+    """
+    profile = alquimias.user_exists(username.lower())
+    if not profile:
+        abort(404)
+    
+    try:
+        alquimias.follow_user(current_user.id, profile.id)
+        flash(f'Agora você segue @{profile.username}!', 'success')
+    except ValueError as e:
+        flash(str(e), 'error')
+    
+    return redirect(url_for('main.user_profile', username=profile.username))
+
+@main.route('/unfollow/<username>', methods=['POST'])
+@login_required
+def unfollow(username):
+    """
+    Deixa de seguir um usuário.
+    
+    Args:
+        username (str): Nome do usuário
+    """
+    profile = alquimias.user_exists(username.lower())
+    if not profile:
+        abort(404)
+    
+    alquimias.unfollow_user(current_user.id, profile.id)
+    flash(f'Você deixou de seguir @{profile.username}', 'info')
+    
+    return redirect(url_for('main.user_profile', username=profile.username))
+
+@main.route('/search')
+@login_required
+def search():
+    """
+    Busca textual nos posts (FTS5), ordenada por relevância.
+    
+    Query string:
+        q (str): Termos de busca
+        cursor (str, optional): Cursor da página de resultados anterior
+    """
+    query = request.args.get('q', '').strip()
+    
+    try:
+        results, next_cursor = alquimias.search_posts(query, cursor=request.args.get('cursor'))
+    except ValueError:
+        abort(400)
+    
+    return render_template(
+        'search.html',
+        title='Buscar',
+        user=current_user,
+        query=query,
+        results=results,
+        next_cursor=next_cursor,
+        is_first_page='cursor' not in request.args
+    )
+
+@main.route('/login', methods=['GET', 'POST'])
 def login():
     """
     Rota de login (GET: exibe formulário, POST: processa login).
@@ -47,7 +212,7 @@ def login():
     Valida credenciais e inicia sessão se válidas.
     """
     if current_user.is_authenticated:
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     if request.method == 'POST':
         username = request.form['username'].lower()
@@ -56,17 +221,17 @@ def login():
         user = alquimias.validate_user_password(username, password)
         
         if user: 
-            print("Login bem-sucedido")
+            current_app.logger.info("Login bem-sucedido: %s", username)
             login_user(user, remember=user.remember)
-            return redirect(url_for('index'))
+            return redirect(url_for('main.index'))
         else:
-            print("Usuário ou senha inválidos")
+            current_app.logger.warning("Falha de login para %s", username)
             flash('Usuário ou senha inválidos', 'error')
-            return redirect(url_for('login'))
+            return redirect(url_for('main.login'))
     
     return render_template('login.html', title='Sign In')
 
-@app.route('/cadastro', methods=['GET', 'POST'])
+@main.route('/cadastro', methods=['GET', 'POST'])
 def register():
     """
     Rota de cadastro de novo usuário.
@@ -80,38 +245,42 @@ def register():
     username = request.form['username'].lower()
     
     if alquimias.user_exists(username):
-        print("\n Username already taken \n")
+        current_app.logger.info("Cadastro recusado, nome em uso: %s", username)
         flash('Nome de usuário já está em uso', 'error')
-        return redirect(url_for('register'))
+        return redirect(url_for('main.register'))
     
     password = request.form['password']
     remember = True if request.form.get('remember') == 'on' else False
     photo_url = request.form.get('photo_url', '').strip() or None
     bio = request.form.get('bio', '').strip() or None
     
-    user = alquimias.create_user(
-        username=username,
-        password=password,
-        remember=remember,
-        photo_url=photo_url,
-        bio=bio
-    )
+    try:
+        user = alquimias.create_user(
+            username=username,
+            password=password,
+            remember=remember,
+            photo_url=photo_url,
+            bio=bio
+        )
+    except PhotoError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('main.register'))
     
     login_user(user, remember=remember)
     flash(f'Bem-vindo, {user.username}!', 'success')
     
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
-@app.route('/logout')
+@main.route('/logout')
 @login_required
 def logout():
     """
     Encerra sessão do usuário e redireciona para login.
     """
     logout_user()
-    return redirect(url_for('login'))
+    return redirect(url_for('main.login'))
 
-@app.route('/post', methods=['GET', 'POST'])
+@main.route('/post', methods=['GET', 'POST'])
 @login_required
 def post():
     """
@@ -129,18 +298,18 @@ def post():
     
     if not body:
         flash('O post não pode estar vazio', 'error')
-        return redirect(url_for('post'))
+        return redirect(url_for('main.post'))
     
     try:
         alquimias.create_post(user_id=current_user.id, body=body)
         flash('Post criado com sucesso!', 'success')
     except ValueError as e:
         flash(str(e), 'error')
-        return redirect(url_for('post'))
+        return redirect(url_for('main.post'))
     
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
-@app.route('/post/<int:post_id>/edit', methods=['GET', 'POST'])
+@main.route('/post/<int:post_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_post(post_id):
     """
@@ -156,7 +325,7 @@ def edit_post(post_id):
     
     if post.user_id != current_user.id:
         flash('Você não tem permissão para editar este post', 'error')
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     if request.method == 'GET':
         return render_template('edit_post.html', title='Editar Post', post=post)
@@ -168,11 +337,11 @@ def edit_post(post_id):
         flash('Post atualizado com sucesso!', 'success')
     except ValueError as e:
         flash(str(e), 'error')
-        return redirect(url_for('edit_post', post_id=post_id))
+        return redirect(url_for('main.edit_post', post_id=post_id))
     
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
-@app.route('/post/<int:post_id>/delete', methods=['POST'])
+@main.route('/post/<int:post_id>/delete', methods=['POST'])
 @login_required
 def delete_post(post_id):
     """
@@ -188,7 +357,7 @@ def delete_post(post_id):
     
     if post.user_id != current_user.id:
         flash('Você não tem permissão para deletar este post', 'error')
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     try:
         alquimias.delete_post(post_id)
@@ -196,9 +365,9 @@ def delete_post(post_id):
     except ValueError as e:
         flash(str(e), 'error')
     
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
-@app.route('/profile/photo', methods=['GET', 'POST'])
+@main.route('/profile/photo', methods=['GET', 'POST'])
 @login_required
 def update_photo():
     """
@@ -208,7 +377,7 @@ def update_photo():
     POST: Processa URL da nova foto ou remoção.
     
     Actions:
-        - update: Atualiza photo_url com nova URL
+        - update: Baixa a foto da URL, gera as miniaturas e atualiza o perfil
         - remove: Remove foto (volta para user.png padrão)
     """
     if request.method == 'GET':
@@ -217,21 +386,23 @@ def update_photo():
     action = request.form.get('action')
     
     if action == 'remove':
-        current_user.photo_url = None
-        db.session.commit()
+        alquimias.set_user_photo(current_user, None)
         flash('Foto de perfil removida com sucesso!', 'success')
     else:
         photo_url = request.form.get('photo_url', '').strip()
         if photo_url:
-            current_user.photo_url = photo_url
-            db.session.commit()
-            flash('Foto de perfil atualizada com sucesso!', 'success')
+            try:
+                alquimias.set_user_photo(current_user, photo_url)
+                flash('Foto de perfil atualizada com sucesso!', 'success')
+            except PhotoError as e:
+                flash(str(e), 'error')
+                return redirect(url_for('main.update_photo'))
         else:
             flash('Por favor, forneça uma URL válida', 'error')
     
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
-@app.route('/profile/bio', methods=['GET', 'POST'])
+@main.route('/profile/bio', methods=['GET', 'POST'])
 @login_required
 def update_bio():
     """
@@ -262,4 +433,53 @@ def update_bio():
         else:
             flash('Por favor, escreva algo na bio', 'error')
     
-    return redirect(url_for('index'))
\ No newline at end of file
+    return redirect(url_for('main.index'))
+
+@main.route('/_cache/stats')
+@login_required
+def cache_stats():
+    """
+    Contadores do cache (hits, misses, evicções) em JSON.
+    
+    Disponível apenas em modo debug ou com CACHE_STATS_ENDPOINT=True.
+    """
+    if not (current_app.debug or current_app.config.get('CACHE_STATS_ENDPOINT')):
+        abort(404)
+    return jsonify(cache.stats())
+
+@main.route('/_latency/stats')
+@login_required
+def latency_stats():
+    """
+    Histogramas de latência por rota em JSON.
+    
+    Disponível apenas em modo debug ou com LATENCY_STATS_ENDPOINT=True.
+    """
+    if not (current_app.debug or current_app.config.get('LATENCY_STATS_ENDPOINT')):
+        abort(404)
+    return jsonify(instrumentacao.latency_snapshot())
+
+@main.route('/_metrics')
+def prometheus_metrics():
+    """
+    Métricas no formato texto do Prometheus.
+    
+    Disponível apenas com INSTRUMENTATION=True. Não exige login, para que o
+    coletor consiga ler; restrinja o acesso no proxy reverso.
+    """
+    if not current_app.config.get('INSTRUMENTATION'):
+        abort(404)
+    gauges = {f'cache_{key}': value for key, value in cache.stats().items()}
+    gauges.update({f'photo_cache_{key}': value for key, value in thumbnails.stats().items()})
+    
+    limits = limiter.stats()
+    gauges['ratelimit_buckets'] = limits['buckets']
+    counters = {
+        'ratelimit_decisions_total': ('Decisões do limite de requisições.', [
+            ({'rule': rule, 'decision': decision}, total)
+            for decision in ('allowed', 'denied')
+            for rule, total in sorted(limits[decision].items())
+        ]),
+    }
+    body = instrumentacao.render_prometheus(gauges, counters)
+    return Response(body, mimetype='text/plain; version=0.0.4')
\ No newline at end of file
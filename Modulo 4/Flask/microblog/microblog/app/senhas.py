@@ -0,0 +1,163 @@
+"""
+Hash de senhas fora das threads de requisição.
+
+Gerar e verificar hashes (scrypt/PBKDF2) é trabalho de CPU que segura a
+thread do worker durante dezenas de milissegundos. Este módulo envia esse
+trabalho para um pool de processos limitado, e a thread da requisição só
+espera o resultado, sem disputar o GIL com as demais requisições.
+
+Configurações:
+    PASSWORD_HASH_METHOD (str): Algoritmo e custo no formato do werkzeug,
+        por exemplo 'scrypt:32768:8:1' ou 'pbkdf2:sha256:600000'.
+        Padrão: 'scrypt' (padrão do werkzeug)
+    PASSWORD_HASH_WORKERS (int): Processos do pool. 0 = calcula na própria
+        thread (útil em testes). Padrão: 1. Cada processo do servidor (por
+        exemplo, cada worker do gunicorn) cria o seu pool, então o total
+        de processos de hash é workers do servidor x este valor
+    PASSWORD_HASH_MAX_PENDING (int): Máximo de hashes na fila; acima disso a
+        requisição espera uma vaga. Padrão: 4 x workers
+
+Hashes gerados com outro algoritmo ou custo são refeitos de forma
+transparente no próximo login bem-sucedido (ver needs_rehash).
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = 'scrypt'
+
+_settings = {
+    'method': DEFAULT_METHOD,
+    'workers': 1,
+    'max_pending': None,
+}
+_derived = {}
+_pool = None
+_pool_pid = None
+_slots = None
+_lock = threading.Lock()
+
+def init_app(app):
+    """
+    Lê a configuração de hash da aplicação.
+
+    O pool só é criado no primeiro uso, dentro do processo que vai usá-lo
+    (importante quando o servidor cria workers com fork). O prefixo do
+    método e o hash de dummy_verify são calculados aqui, na inicialização,
+    e não na thread da primeira requisição que precisar deles.
+
+    Args:
+        app (Flask): Aplicação com as chaves PASSWORD_HASH_*
+    """
+    global _pool
+    workers = app.config.get('PASSWORD_HASH_WORKERS', 1)
+    _settings['method'] = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+    _settings['workers'] = workers
+    _settings['max_pending'] = app.config.get('PASSWORD_HASH_MAX_PENDING', 4 * max(workers, 1))
+    _derive(_settings['method'])
+
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+
+def _get_pool():
+    global _pool, _pool_pid, _slots
+    with _lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # 'spawn' evita herdar threads e conexões do processo pai
+            _pool = ProcessPoolExecutor(
+                max_workers=_settings['workers'],
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _pool_pid = os.getpid()
+            _slots = threading.BoundedSemaphore(_settings['max_pending'])
+        return _pool, _slots
+
+def _run(func, *args):
+    """
+    Executa func(*args) no pool (ou na própria thread, se workers = 0).
+    """
+    if not _settings['workers']:
+        return func(*args)
+
+    pool, slots = _get_pool()
+    with slots:
+        return pool.submit(func, *args).result()
+
+def hash_password(password):
+    """
+    Gera o hash da senha com o algoritmo e o custo configurados.
+
+    Args:
+        password (str): Senha em texto plano
+
+    Returns:
+        str: Hash no formato 'metodo$salt$hash' do werkzeug
+    """
+    return _run(generate_password_hash, password, _settings['method'])
+
+def verify_password(password_hash, password):
+    """
+    Verifica uma senha contra o hash armazenado.
+
+    Args:
+        password_hash (str): Hash armazenado
+        password (str): Senha em texto plano
+
+    Returns:
+        bool: True se a senha estiver correta
+    """
+    return _run(check_password_hash, password_hash, password)
+
+def _derive(method):
+    """
+    Prefixo completo do método e hash usado por dummy_verify().
+
+    Cada valor custa um hash inteiro; fica guardado por método.
+
+    Returns:
+        tuple[str, str]: ('scrypt' vira 'scrypt:32768:8:1', hash de uma senha fixa)
+    """
+    if method not in _derived:
+        prefix = generate_password_hash('', method).split('$', 1)[0]
+        _derived[method] = (prefix, generate_password_hash('senha-inexistente', method))
+    return _derived[method]
+
+def needs_rehash(password_hash):
+    """
+    Indica se o hash foi gerado com outro algoritmo ou custo.
+
+    Args:
+        password_hash (str): Hash armazenado
+
+    Returns:
+        bool: True se o hash deve ser refeito com a configuração atual
+    """
+    return password_hash.split('$', 1)[0] != _derive(_settings['method'])[0]
+
+def dummy_verify(password):
+    """
+    Faz uma verificação com o mesmo custo de uma real, sempre falhando.
+
+    Usado quando o usuário não existe, para que o tempo de resposta não
+    revele quais nomes de usuário estão cadastrados.
+
+    Args:
+        password (str): Senha recebida no formulário
+
+    Returns:
+        bool: Sempre False
+    """
+    verify_password(_derive(_settings['method'])[1], password)
+    return False
+
+@atexit.register
+def _shutdown():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,304 @@
+"""
+Importação e exportação de posts em massa.
+
+Os arquivos são lidos e escritos em streaming, então o uso de memória
+não depende do tamanho do arquivo nem da tabela:
+
+- Importação: as linhas são lidas em lotes de N posts. Cada lote resolve
+  os autores com uma única consulta (nomes já vistos ficam em um
+  dicionário) e é gravado com um INSERT em lote e um commit.
+- Exportação: as linhas vêm do banco com yield_per, em partições de N
+  linhas, e são escritas conforme chegam.
+
+Formatos aceitos: JSONL (um objeto por linha) e CSV com cabeçalho. Os
+campos são username, body e timestamp (ISO 8601, opcional na importação).
+A exportação inclui também id e edited_at.
+
+Uso:
+    flask posts import posts.jsonl
+    flask posts import posts.csv --batch-size 5000
+    flask posts export posts.jsonl
+    flask posts export - --format csv > posts.csv
+"""
+
+import csv
+import json
+import time
+from datetime import datetime, timezone
+from itertools import islice
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select
+
+FORMATS = ('jsonl', 'csv')
+DEFAULT_BATCH_SIZE = 1000
+MAX_WARNINGS = 10  # Linhas ignoradas listadas individualmente
+EXPORT_FIELDS = ['id', 'username', 'body', 'timestamp', 'edited_at']
+
+def _detect_format(filename, fmt):
+    if fmt:
+        return fmt
+    if filename.lower().endswith('.csv'):
+        return 'csv'
+    return 'jsonl'
+
+def read_rows(stream, fmt):
+    """
+    Lê o arquivo linha a linha, sem carregá-lo inteiro na memória.
+
+    Args:
+        stream (TextIO): Arquivo aberto em modo texto
+        fmt (str): 'jsonl' ou 'csv'
+
+    Yields:
+        tuple[int, dict]: Número da linha no arquivo e registro lido
+
+    Raises:
+        ValueError: Se uma linha JSONL não for um objeto JSON válido
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Linha {line_number}: JSON inválido ({e.msg})") from e
+        if not isinstance(row, dict):
+            raise ValueError(f"Linha {line_number}: esperado um objeto JSON")
+        yield line_number, row
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def _parse_timestamp(value, default):
+    if not value:
+        return default
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is not None:
+        # O banco guarda UTC sem fuso (ver models.utcnow): o SQLite descartaria o offset
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+def _wrong_type(row):
+    # Em JSONL os campos podem ter qualquer tipo JSON; autor e corpo precisam ser texto
+    for field, label in (('username', 'usuário'), ('body', 'corpo')):
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            return f'{label} não é texto'
+    return None
+
+class UserLookup:
+    """
+    Resolve nomes de usuário em IDs com uma consulta por lote.
+
+    Nomes já resolvidos (inclusive os inexistentes) ficam guardados, então
+    cada autor é consultado no banco uma única vez por importação.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._ids = {}
+        self.queries = 0
+
+    def resolve(self, usernames):
+        """
+        Busca no banco os nomes ainda desconhecidos.
+
+        Args:
+            usernames (Iterable[str]): Nomes usados no lote
+
+        Returns:
+            dict: Mapeamento nome -> ID (None para usuários inexistentes)
+        """
+        from app.models.models import User
+
+        missing = {name for name in usernames if name not in self._ids}
+        if missing:
+            self.queries += 1
+            found = dict(self.session.execute(
+                select(User.username, User.id).where(User.username.in_(missing))
+            ).all())
+            for name in missing:
+                self._ids[name] = found.get(name)
+        return self._ids
+
+def import_posts(stream, fmt='jsonl', batch_size=DEFAULT_BATCH_SIZE, echo=print):
+    """
+    Importa posts de um arquivo JSONL ou CSV em lotes.
+
+    Linhas com corpo vazio, autor inexistente, timestamp inválido ou
+    campos que não são texto são ignoradas e contadas; o restante do lote
+    é gravado normalmente. Timestamps com fuso são convertidos para UTC.
+
+    Args:
+        stream (TextIO): Arquivo de entrada
+        fmt (str, optional): 'jsonl' ou 'csv'. Padrão: 'jsonl'
+        batch_size (int, optional): Posts por INSERT (e por commit)
+        echo (Callable[[str], None], optional): Função de saída das mensagens
+
+    Returns:
+        dict: Contadores imported, skipped, batches, user_queries e seconds
+
+    Raises:
+        ValueError: Se o arquivo estiver malformado
+    """
+    from app import db, alquimias
+    from app.cache import cache
+    from app.models.models import utcnow
+
+    lookup = UserLookup(db.session)
+    imported = skipped = batches = 0
+    started = time.perf_counter()
+
+    def skip(line_number, reason):
+        nonlocal skipped
+        skipped += 1
+        if skipped <= MAX_WARNINGS:
+            echo(f"   ⚠️ Linha {line_number} ignorada: {reason}")
+
+    for chunk in _chunks(read_rows(stream, fmt), batch_size):
+        # Tipos errados saem antes da consulta de autores (uma lista não é
+        # um nome válido nem pode ser chave de dicionário)
+        typed = []
+        for line_number, row in chunk:
+            reason = _wrong_type(row)
+            if reason:
+                skip(line_number, reason)
+            else:
+                typed.append((line_number, row))
+
+        user_ids = lookup.resolve(row.get('username') for _, row in typed)
+        now = utcnow()
+        rows = []
+
+        for line_number, row in typed:
+            body = (row.get('body') or '').strip()
+            user_id = user_ids.get(row.get('username'))
+            try:
+                timestamp = _parse_timestamp(row.get('timestamp'), now)
+            except (TypeError, ValueError):
+                timestamp = None
+
+            if not body or user_id is None or timestamp is None:
+                skip(line_number, 'corpo vazio' if not body
+                     else 'usuário inexistente' if user_id is None
+                     else 'timestamp inválido')
+                continue
+            rows.append({'user_id': user_id, 'body': body, 'timestamp': timestamp})
+
+        imported += alquimias.bulk_create_posts(rows)
+        batches += 1
+        elapsed = time.perf_counter() - started
+        echo(f"   📦 Lote {batches}: {imported} posts ({imported / elapsed:.0f} posts/s)")
+
+    # Posts importados podem cair em qualquer página da timeline
+    if imported:
+        cache.clear()
+
+    return {
+        'imported': imported,
+        'skipped': skipped,
+        'batches': batches,
+        'user_queries': lookup.queries,
+        'seconds': time.perf_counter() - started,
+    }
+
+def export_posts(stream, fmt='jsonl', batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Exporta todos os posts em ordem de ID, em streaming.
+
+    As linhas são buscadas com yield_per(batch_size): apenas uma partição
+    fica em memória por vez, e nenhum objeto ORM é criado.
+
+    Args:
+        stream (TextIO): Arquivo de saída
+        fmt (str, optional): 'jsonl' ou 'csv'. Padrão: 'jsonl'
+        batch_size (int, optional): Linhas buscadas do banco por vez
+
+    Returns:
+        int: Número de posts exportados
+    """
+    from app import db
+    from app.models.models import User, Post
+
+    stmt = (
+        select(Post.id, User.username, Post.body, Post.timestamp, Post.edited_at)
+        .join(User, User.id == Post.user_id)
+        .order_by(Post.id)
+    )
+
+    writer = None
+    if fmt == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(EXPORT_FIELDS)
+
+    exported = 0
+    with db.engine.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(stmt)
+        for partition in result.partitions():
+            for post_id, username, body, timestamp, edited_at in partition:
+                timestamp = timestamp.isoformat()
+                edited_at = edited_at.isoformat() if edited_at else None
+                if writer:
+                    writer.writerow([post_id, username, body, timestamp, edited_at or ''])
+                else:
+                    stream.write(json.dumps({
+                        'id': post_id, 'username': username, 'body': body,
+                        'timestamp': timestamp, 'edited_at': edited_at,
+                    }, ensure_ascii=False) + '\n')
+            exported += len(partition)
+
+    return exported
+
+
+# Comandos de linha: flask posts import | flask posts export
+posts_cli = AppGroup('posts', help='Importação e exportação de posts.')
+
+@posts_cli.command('import')
+@click.argument('arquivo', type=click.File('r', encoding='utf-8'))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS),
+              help='Formato do arquivo. Padrão: pela extensão (.csv ou jsonl).')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Posts por INSERT (e por commit).')
+def import_command(arquivo, fmt, batch_size):
+    """
+    Importa posts de ARQUIVO (use - para a entrada padrão).
+    """
+    fmt = _detect_format(arquivo.name, fmt)
+    try:
+        result = import_posts(arquivo, fmt, batch_size, echo=click.echo)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    rate = result['imported'] / result['seconds'] if result['seconds'] else 0
+    click.echo(
+        f"✅ {result['imported']} posts importados em {result['seconds']:.2f}s "
+        f"({rate:.0f} posts/s), {result['batches']} lotes, "
+        f"{result['user_queries']} consultas de usuários, {result['skipped']} linhas ignoradas"
+    )
+
+@posts_cli.command('export')
+@click.argument('arquivo', type=click.File('w', encoding='utf-8'))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS),
+              help='Formato do arquivo. Padrão: pela extensão (.csv ou jsonl).')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+              help='Linhas buscadas do banco por vez.')
+def export_command(arquivo, fmt, batch_size):
+    """
+    Exporta todos os posts para ARQUIVO (use - para a saída padrão).
+    """
+    fmt = _detect_format(arquivo.name, fmt)
+    started = time.perf_counter()
+    exported = export_posts(arquivo, fmt, batch_size)
+    elapsed = time.perf_counter() - started
+    # Mensagens vão para stderr para não misturar com a exportação em '-'
+    click.echo(f"✅ {exported} posts exportados em {elapsed:.2f}s", err=True)
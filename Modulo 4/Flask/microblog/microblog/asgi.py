@@ -0,0 +1,10 @@
+"""
+Ponto de entrada da aplicação para servidores ASGI.
+
+Uso:
+    uvicorn asgi:application --workers 4
+"""
+
+from app.assincrono import create_asgi_app
+
+application = create_asgi_app()
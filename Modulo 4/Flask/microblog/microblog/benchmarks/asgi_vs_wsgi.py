@@ -0,0 +1,259 @@
+"""
+Teste de carga comparando os modos WSGI (threads) e ASGI (event loop).
+
+Sobe a aplicação em um subprocesso, nos dois modos, sobre o mesmo banco:
+
+- wsgi: servidor do werkzeug com uma thread por conexão
+- asgi: uvicorn com create_asgi_app() (timeline e posts de usuário no
+  event loop com aiosqlite)
+
+Cada cliente repete GETs na timeline e nos posts de usuários, mantendo a
+conexão aberta quando o servidor permite (o do werkzeug sempre a fecha),
+com 100, 500 e 1000 clientes simultâneos. O cache fica desligado, para que
+toda requisição chegue ao SQLite. Ao final mostra requisições por segundo,
+p50 e p99 de cada modo.
+
+Servidor e clientes rodam na mesma máquina: com poucos núcleos, os
+processos de carga disputam a CPU com o servidor.
+
+Como usar (a partir da pasta microblog/):
+    python benchmarks/asgi_vs_wsgi.py
+    python benchmarks/asgi_vs_wsgi.py --clientes 100 500 --duracao 10 --modos asgi
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+USUARIOS = 50
+POSTS_POR_USUARIO = 100
+HOST = '127.0.0.1'
+
+def _ambiente(caminho_db):
+    """
+    Variáveis de ambiente usadas pelo servidor e pela preparação do banco.
+    """
+    env = dict(os.environ)
+    env.update({
+        'MICROBLOG_PROFILE': 'production',
+        'FLASK_SECRET_KEY': 'carga',
+        'FLASK_SQLALCHEMY_DATABASE_URI': f'sqlite:///{caminho_db}',
+        # Sem cache, para que toda leitura chegue ao banco
+        'FLASK_CACHE_BACKEND': 'null',
+        'FLASK_RATE_LIMIT_ENABLED': 'false',
+        'FLASK_PASSWORD_HASH_WORKERS': '0',
+        'PYTHONPATH': RAIZ,
+    })
+    return env
+
+def preparar_banco(caminho_db):
+    """
+    Aplica as migrações e cria usuários e posts com inserts em lote.
+    """
+    from app import create_app, db, alquimias, migracoes
+    from app.models.models import utcnow
+
+    app = create_app('production', {
+        'SECRET_KEY': 'carga',
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{caminho_db}',
+        'PASSWORD_HASH_WORKERS': 0,
+    })
+    inicio = utcnow() - timedelta(days=1)
+    with app.app_context():
+        migracoes.upgrade(db.engine, echo=lambda msg: None)
+        ids = [alquimias.create_user(f'carga{i}', 'carga123').id for i in range(USUARIOS)]
+        linhas = [
+            {'user_id': ids[i % USUARIOS], 'body': f'Post {i} de carga',
+             'timestamp': inicio + timedelta(seconds=i)}
+            for i in range(USUARIOS * POSTS_POR_USUARIO)
+        ]
+        alquimias.bulk_create_posts(linhas)
+
+def servir(modo, porta):
+    """
+    Roda o servidor no processo atual (chamado pelo subprocesso).
+    """
+    if modo == 'wsgi':
+        from werkzeug.serving import WSGIRequestHandler, make_server
+        from app import create_app
+
+        class Handler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        server = make_server(HOST, porta, create_app(), threaded=True, request_handler=Handler)
+        server.socket.listen(2048)
+        server.serve_forever()
+    else:
+        import uvicorn
+        from app.assincrono import create_asgi_app
+
+        uvicorn.run(create_asgi_app(), host=HOST, port=porta, log_level='warning', backlog=2048)
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+def _esperar_servidor(porta, processo, timeout=30):
+    fim = time.monotonic() + timeout
+    while time.monotonic() < fim:
+        if processo.poll() is not None:
+            raise RuntimeError("O servidor terminou antes de aceitar conexões")
+        try:
+            with socket.create_connection((HOST, porta), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Servidor não respondeu na porta {porta}")
+
+async def _requisicao(reader, writer, caminho):
+    writer.write(f"GET {caminho} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode())
+    await writer.drain()
+    cabecalho = await reader.readuntil(b'\r\n\r\n')
+    linhas = cabecalho.decode('latin-1').split('\r\n')
+    status = int(linhas[0].split(' ')[1])
+    tamanho = 0
+    manter = True
+    for linha in linhas[1:]:
+        nome, _, valor = linha.partition(':')
+        nome = nome.lower()
+        if nome == 'content-length':
+            tamanho = int(valor)
+        elif nome == 'connection' and valor.strip().lower() == 'close':
+            manter = False
+    if tamanho:
+        await reader.readexactly(tamanho)
+    return status, manter
+
+async def _clientes(porta, quantidade, duracao, semente):
+    latencias = []
+    erros = [0]
+    fim = time.monotonic() + duracao
+
+    async def _cliente(indice):
+        rng = random.Random(semente * 100000 + indice)
+        writer = None
+        while time.monotonic() < fim:
+            if rng.random() < 0.5:
+                caminho = '/api/v1/timeline'
+            else:
+                caminho = f'/api/v1/users/carga{rng.randrange(USUARIOS)}/posts'
+            # A latência inclui abrir a conexão quando o servidor não a mantém
+            inicio = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(HOST, porta, limit=1 << 20)
+                status, manter = await _requisicao(reader, writer, caminho)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                erros[0] += 1
+                status, manter = None, False
+            if status == 200:
+                latencias.append(time.perf_counter() - inicio)
+            elif status is not None:
+                erros[0] += 1
+            if not manter and writer is not None:
+                writer.close()
+                writer = None
+        if writer is not None:
+            writer.close()
+
+    await asyncio.gather(*(_cliente(i) for i in range(quantidade)))
+    return latencias, erros[0]
+
+def _processo_cliente(args):
+    porta, quantidade, duracao, semente = args
+    return asyncio.run(_clientes(porta, quantidade, duracao, semente))
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def rodar_modo(modo, caminho_db, clientes, duracao, processos):
+    """
+    Sobe o servidor no modo escolhido e mede cada nível de concorrência.
+
+    Returns:
+        list[tuple]: (clientes, req/s, p50, p99, erros) por nível
+    """
+    porta = _porta_livre()
+    servidor = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--servir', modo, '--porta', str(porta)],
+        env=_ambiente(caminho_db)
+    )
+    resultados = []
+    try:
+        _esperar_servidor(porta, servidor)
+        ctx = multiprocessing.get_context('spawn')
+        with ctx.Pool(processos) as pool:
+            for quantidade in clientes:
+                # Os clientes são divididos entre processos para não saturar um só núcleo
+                partes = [quantidade // processos + (i < quantidade % processos) for i in range(processos)]
+                tarefas = [(porta, parte, duracao, i) for i, parte in enumerate(partes) if parte]
+                saidas = pool.map(_processo_cliente, tarefas)
+                latencias = [x for lat, _ in saidas for x in lat]
+                erros = sum(err for _, err in saidas)
+                resultados.append((
+                    quantidade, len(latencias) / duracao,
+                    statistics.median(latencias or [0]), _percentil(latencias, 0.99), erros
+                ))
+                print(f"   {modo.upper()} {quantidade:>5} clientes: {len(latencias) / duracao:,.1f} req/s, "
+                      f"p99 {_percentil(latencias, 0.99) * 1000:.1f} ms, {erros} erros")
+    finally:
+        servidor.terminate()
+        servidor.wait()
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os modos WSGI e ASGI do microblog")
+    parser.add_argument('--clientes', type=int, nargs='+', default=[100, 500, 1000],
+                        help='Níveis de clientes simultâneos')
+    parser.add_argument('--duracao', type=float, default=5.0, help='Segundos de carga por nível')
+    parser.add_argument('--modos', nargs='+', default=['wsgi', 'asgi'], choices=['wsgi', 'asgi'])
+    parser.add_argument('--processos', type=int, default=2, help='Processos gerando carga')
+    parser.add_argument('--servir', choices=['wsgi', 'asgi'], help=argparse.SUPPRESS)
+    parser.add_argument('--porta', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.servir:
+        servir(args.servir, args.porta)
+        return
+
+    print("=" * 60)
+    print(f"🚀 WSGI x ASGI: {', '.join(map(str, args.clientes))} clientes, {args.duracao:.0f}s por nível")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_db = os.path.join(pasta, 'carga.db')
+        os.environ.update(_ambiente(caminho_db))
+        preparar_banco(caminho_db)
+        print(f"📦 Banco com {USUARIOS} usuários e {USUARIOS * POSTS_POR_USUARIO} posts")
+        print()
+
+        tabela = {}
+        for modo in args.modos:
+            tabela[modo] = rodar_modo(modo, caminho_db, args.clientes, args.duracao, args.processos)
+            print()
+
+    print("📊 Resultado")
+    print(f"   {'modo':<6}{'clientes':>10}{'req/s':>12}{'p50 (ms)':>12}{'p99 (ms)':>12}{'erros':>8}")
+    for modo, linhas in tabela.items():
+        for quantidade, rps, p50, p99, erros in linhas:
+            print(f"   {modo:<6}{quantidade:>10}{rps:>12,.1f}{p50 * 1000:>12.1f}{p99 * 1000:>12.1f}{erros:>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Teste de carga comparando os perfis 'development' e 'production' do SQLite.
+
+Simula vários workers (processos, como no gunicorn), cada um com algumas
+threads, fazendo uma mistura de leituras (GET /) e escritas (POST /post)
+no mesmo arquivo de banco. Ao final mostra requisições por segundo,
+latências e quantas requisições falharam com 'database is locked'.
+
+Como usar (a partir da pasta microblog/):
+    python benchmarks/carga_sqlite.py
+    python benchmarks/carga_sqlite.py --workers 4 --threads 8 --duracao 10 --escritas 0.2
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+USUARIOS = 20
+SENHA = 'carga123'
+
+def _importar_app(perfil, caminho_db):
+    """
+    Cria a aplicação com o perfil e o banco informados.
+
+    create_app() lê a configuração do ambiente (variáveis FLASK_*), então
+    cada processo define o ambiente antes de criar a aplicação.
+    """
+    os.environ['MICROBLOG_PROFILE'] = perfil
+    os.environ['FLASK_SECRET_KEY'] = 'carga'
+    os.environ['FLASK_SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{caminho_db}'
+    # Sem cache, para que toda leitura chegue ao banco
+    os.environ['FLASK_CACHE_BACKEND'] = 'null'
+    # Mede o banco, não o limite de requisições
+    os.environ['FLASK_RATE_LIMIT_ENABLED'] = 'false'
+    # Os workers do teste são processos daemon do multiprocessing.Pool, que
+    # não podem criar o pool de processos do hash de senhas
+    os.environ['FLASK_PASSWORD_HASH_WORKERS'] = '0'
+    from app import create_app, db, alquimias
+    return create_app(), db, alquimias
+
+def preparar_banco(perfil, caminho_db):
+    """
+    Aplica as migrações e cria os usuários usados no teste.
+    """
+    app, db, alquimias = _importar_app(perfil, caminho_db)
+    from app import migracoes
+    with app.app_context():
+        migracoes.upgrade(db.engine, echo=lambda msg: None)
+        for i in range(USUARIOS):
+            user = alquimias.create_user(f'carga{i}', SENHA)
+            for j in range(20):
+                alquimias.create_post(user.id, f'Post inicial {j} de carga{i}')
+
+def _worker(args):
+    """
+    Processo worker: roda várias threads com um test_client cada.
+
+    Returns:
+        tuple[list[float], list[float], int]: Latências de leitura,
+        latências de escrita e número de erros
+    """
+    perfil, caminho_db, threads, duracao, fracao_escrita, semente = args
+    app, _, _ = _importar_app(perfil, caminho_db)
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+
+    leituras, escritas = [], []
+    erros = [0]
+    lock = threading.Lock()
+    fim = time.monotonic() + duracao
+
+    def _loop(indice):
+        rng = random.Random(semente * 1000 + indice)
+        client = app.test_client()
+        client.post('/login', data={'username': f'carga{rng.randrange(USUARIOS)}', 'password': SENHA})
+        while time.monotonic() < fim:
+            escrever = rng.random() < fracao_escrita
+            inicio = time.perf_counter()
+            if escrever:
+                resp = client.post('/post', data={'body': f'carga {rng.random()}'})
+            else:
+                resp = client.get('/')
+            gasto = time.perf_counter() - inicio
+            with lock:
+                if resp.status_code >= 500:
+                    erros[0] += 1
+                elif escrever:
+                    escritas.append(gasto)
+                else:
+                    leituras.append(gasto)
+
+    pool = [threading.Thread(target=_loop, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return leituras, escritas, erros[0]
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def rodar_perfil(perfil, workers, threads, duracao, fracao_escrita):
+    """
+    Executa o teste para um perfil em um banco novo e imprime o resultado.
+    """
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_db = os.path.join(pasta, 'carga.db')
+
+        ctx = multiprocessing.get_context('spawn')
+        with ctx.Pool(1) as p:
+            p.apply(preparar_banco, (perfil, caminho_db))
+
+        tarefas = [(perfil, caminho_db, threads, duracao, fracao_escrita, i) for i in range(workers)]
+        with ctx.Pool(workers) as p:
+            resultados = p.map(_worker, tarefas)
+
+    leituras = [x for r in resultados for x in r[0]]
+    escritas = [x for r in resultados for x in r[1]]
+    erros = sum(r[2] for r in resultados)
+    total = len(leituras) + len(escritas)
+
+    print(f"📊 Perfil '{perfil}'")
+    print(f"   Requisições/s : {total / duracao:,.1f}")
+    print(f"   Leituras      : {len(leituras)} (p50 {statistics.median(leituras or [0]) * 1000:.1f} ms, "
+          f"p99 {_percentil(leituras, 0.99) * 1000:.1f} ms)")
+    print(f"   Escritas      : {len(escritas)} (p50 {statistics.median(escritas or [0]) * 1000:.1f} ms, "
+          f"p99 {_percentil(escritas, 0.99) * 1000:.1f} ms)")
+    print(f"   Erros (5xx)   : {erros}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga dos perfis SQLite do microblog")
+    parser.add_argument('--workers', type=int, default=4, help='Processos simulando workers do gunicorn')
+    parser.add_argument('--threads', type=int, default=4, help='Threads por worker')
+    parser.add_argument('--duracao', type=float, default=5.0, help='Segundos de carga por perfil')
+    parser.add_argument('--escritas', type=float, default=0.2, help='Fração de requisições que escrevem')
+    parser.add_argument('--perfis', nargs='+', default=['development', 'production'])
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"🚀 Carga: {args.workers} workers x {args.threads} threads, "
+          f"{args.duracao:.0f}s, {args.escritas:.0%} escritas")
+    print("=" * 60)
+    print()
+    for perfil in args.perfis:
+        rodar_perfil(perfil, args.workers, args.threads, args.duracao, args.escritas)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+"""
+Ponto de entrada da aplicação para o comando flask.
+
+Uso:
+    flask --app microblog db upgrade
+    flask --app microblog run
+"""
+
+from app import create_app, db
+
+app = create_app()
@@ -0,0 +1,69 @@
+"""
+Fixtures dos testes: aplicação com banco SQLite temporário já migrado.
+
+A fixture app não deixa um contexto de aplicação ativo: cada requisição do
+cliente de testes abre o seu (e o seu g, onde ficam os contadores por
+requisição). Para preparar dados, use "with app.app_context():".
+
+Rode a partir da pasta microblog/:
+    python -m pytest -q
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db, migracoes
+from app.models.models import User
+
+@pytest.fixture
+def app_config():
+    """
+    Chaves extras da configuração; sobrescreva no módulo de testes.
+    """
+    return {}
+
+@pytest.fixture
+def app(tmp_path, app_config):
+    app = create_app('development', {
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'microblog.db'}",
+        'CACHE_BACKEND': 'null',
+        'PASSWORD_HASH_WORKERS': 0,
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'RATE_LIMIT_ENABLED': False,
+        'SQL_QUERY_COUNTER': True,
+        'PHOTO_CACHE_DIR': str(tmp_path / 'fotos'),
+        **app_config,
+    })
+    with app.app_context():
+        migracoes.upgrade(db.engine, echo=lambda message: None)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def make_user(username, **fields):
+    """
+    Cria um usuário direto no banco (sem passar pelo hash de senha).
+    """
+    fields.setdefault('last_login', datetime.now())
+    user = User(username=username, password_hash='x', **fields)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+def login(client, user_id):
+    """
+    Marca o usuário como autenticado na sessão do cliente de testes.
+    """
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
@@ -0,0 +1,29 @@
+"""
+Validação do corpo JSON nas rotas de escrita da API.
+"""
+
+import pytest
+
+from app import alquimias
+from conftest import login, make_user
+
+@pytest.fixture
+def author(app, client):
+    with app.app_context():
+        user_id = make_user('api').id
+        post_id = alquimias.create_post(user_id, 'original').id
+    login(client, user_id)
+    return post_id
+
+@pytest.mark.parametrize('body', [5, ['texto'], {'a': 1}, True])
+def test_non_string_body_is_rejected(client, author, body):
+    created = client.post('/api/v1/posts', json={'body': body})
+    updated = client.patch(f'/api/v1/posts/{author}', json={'body': body})
+    
+    assert created.status_code == 400
+    assert updated.status_code == 400
+    assert 'body' in created.get_json()['error']
+
+def test_missing_body_is_rejected(client, author):
+    assert client.post('/api/v1/posts', json={}).status_code == 400
+    assert client.post('/api/v1/posts', json={'body': 'ok'}).status_code == 201
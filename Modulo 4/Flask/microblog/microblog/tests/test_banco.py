@@ -0,0 +1,50 @@
+"""
+Roteamento da sessão entre o engine principal e o pool somente leitura, e
+carga da configuração a partir do ambiente.
+"""
+
+import pytest
+from flask import Flask
+from sqlalchemy import select, text
+
+from app import config, create_app, db
+from app.cache import NullBackend, cache
+from app.models.models import User
+from conftest import make_user
+
+@pytest.fixture
+def app_config():
+    return {'READONLY_POOL_SIZE': 2}
+
+def test_reads_use_the_readonly_pool(app):
+    with app.test_request_context('/', method='POST'):
+        assert db.readonly_engine is not None
+        bind = db.session.get_bind(clause=select(User))
+        assert bind is db.readonly_engine
+        assert db.session.get_bind(clause=text("SELECT 1")) is db.readonly_engine
+
+def test_text_write_inside_a_get_uses_the_primary_engine(app):
+    with app.app_context():
+        user_id = make_user('alguem').id
+    
+    with app.test_request_context('/', method='GET'):
+        db.session.execute(text("UPDATE users SET bio = 'nova' WHERE id = :id"), {'id': user_id})
+        # A transação já escreveu no principal: a leitura enxerga a escrita
+        assert db.session.get_bind(clause=select(User)) is db.engine
+        assert db.session.scalar(select(User.bio).where(User.id == user_id)) == 'nova'
+        db.session.commit()
+        
+        assert db.session.get_bind(clause=select(User)) is db.readonly_engine
+        assert db.session.scalar(select(User.bio).where(User.id == user_id)) == 'nova'
+        db.session.remove()
+
+def test_cache_backend_null_from_environment(app, monkeypatch, tmp_path):
+    monkeypatch.setenv('FLASK_CACHE_BACKEND', 'null')
+    create_app('development', {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'outro.db'}"})
+    assert isinstance(cache.backend, NullBackend)
+
+def test_missing_secret_key_names_the_profile(monkeypatch):
+    monkeypatch.setitem(config.PROFILES, 'staging', config.ProductionConfig)
+    monkeypatch.delenv('FLASK_SECRET_KEY', raising=False)
+    with pytest.raises(RuntimeError, match="'staging'"):
+        config.load_config(Flask(__name__), 'staging')
@@ -0,0 +1,20 @@
+"""
+Backend compartilhado do cache, com o cliente local no lugar do redis.
+"""
+
+from app.cache import CLEAR_BATCH, LocalClient, SharedBackend
+
+def test_clear_only_deletes_keys_with_its_prefix():
+    client = LocalClient()
+    backend = SharedBackend(client)
+    for index in range(CLEAR_BATCH + 10):  # Mais de um lote de DELETE
+        backend.set(f'post:{index}', {'id': index})
+    client.set('microblog:ratelimit:login:1.2.3.4', b'balde')
+    client.set('outra-aplicacao:sessao', b'dados')
+    
+    backend.clear()
+    
+    assert backend.get_many(['post:0', f'post:{CLEAR_BATCH}']) == {}
+    assert list(client.scan_iter(match=backend.prefix + '*')) == []
+    assert client.get('microblog:ratelimit:login:1.2.3.4') == b'balde'
+    assert client.get('outra-aplicacao:sessao') == b'dados'
@@ -0,0 +1,29 @@
+"""
+O número de consultas SQL de uma página não pode crescer com o número de posts.
+"""
+
+from app import alquimias
+from app.instrumentacao import QUERY_HEADER
+from conftest import login, make_user
+
+def test_timeline_query_count_is_constant(app, client):
+    with app.app_context():
+        login(client, make_user('leitor').id)
+    
+    counts = []
+    created = 0
+    for total in (1, 3, alquimias.PAGE_SIZE):
+        # Cada post é de um autor diferente: carregar os autores um a um
+        # (N+1) faria a contagem crescer junto com a página
+        with app.app_context():
+            for index in range(created, total):
+                author = make_user(f'autor{index}')
+                alquimias.create_post(author.id, f'post número {index}')
+        created = total
+        
+        response = client.get('/')
+        assert response.status_code == 200
+        assert response.get_data(as_text=True).count('post número') == total
+        counts.append(int(response.headers[QUERY_HEADER]))
+    
+    assert counts == [counts[0]] * len(counts)
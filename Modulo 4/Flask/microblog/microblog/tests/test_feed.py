@@ -0,0 +1,71 @@
+"""
+Feed pessoal: fan-out na escrita, leitura direta de autores grandes e a
+passagem de um autor pelo limite FEED_FANOUT_LIMIT.
+"""
+
+import pytest
+
+from app import alquimias
+from app.instrumentacao import QUERY_HEADER
+from conftest import login, make_user
+
+@pytest.fixture
+def app_config():
+    return {'FEED_FANOUT_LIMIT': 2, 'CACHE_BACKEND': 'memory'}
+
+def _feed_bodies(user_id):
+    posts, _ = alquimias.get_home_feed_page(user_id)
+    return [post.body for post in posts]
+
+def test_posts_made_above_the_limit_survive_dropping_below_it(app):
+    with app.app_context():
+        author = make_user('famoso').id
+        fans = [make_user(f'fã{index}').id for index in range(3)]
+        for fan in fans:
+            alquimias.follow_user(fan, author)
+        
+        # 3 seguidores > limite 2: o post não é copiado para os feeds
+        alquimias.create_post(author, 'acima do limite')
+        assert _feed_bodies(fans[0]) == ['acima do limite']
+        
+        alquimias.unfollow_user(fans[2], author)
+        
+        assert _feed_bodies(fans[0]) == ['acima do limite']
+        assert _feed_bodies(fans[1]) == ['acima do limite']
+        assert _feed_bodies(fans[2]) == []
+        
+        # De volta ao fan-out na escrita
+        alquimias.create_post(author, 'abaixo do limite')
+        assert _feed_bodies(fans[0]) == ['abaixo do limite', 'acima do limite']
+
+def test_crossing_the_limit_upwards_switches_followers_to_pull(app):
+    with app.app_context():
+        author = make_user('famoso').id
+        fans = [make_user(f'fã{index}').id for index in range(3)]
+        alquimias.follow_user(fans[0], author)
+        alquimias.follow_user(fans[1], author)
+        assert _feed_bodies(fans[0]) == []  # Lista de autores grandes em cache
+        
+        alquimias.follow_user(fans[2], author)
+        alquimias.create_post(author, 'novo')
+        
+        for fan in fans:
+            assert _feed_bodies(fan) == ['novo']
+
+def test_feed_read_without_large_authors_is_one_range_scan(app, client):
+    with app.app_context():
+        reader = make_user('leitor').id
+        author = make_user('autor').id
+        alquimias.follow_user(reader, author)
+        alquimias.create_post(author, 'oi')
+    login(client, reader)
+    
+    first = client.get('/feed')
+    second = client.get('/feed')
+    timeline = client.get('/')
+    
+    assert 'oi' in second.get_data(as_text=True)
+    # Sessão (usuário) + busca em feed_entries; a lista de autores grandes
+    # só é consultada na primeira leitura
+    assert int(second.headers[QUERY_HEADER]) == int(first.headers[QUERY_HEADER]) - 1
+    assert int(second.headers[QUERY_HEADER]) == int(timeline.headers[QUERY_HEADER])
@@ -0,0 +1,159 @@
+"""
+Fotos de perfil: validação do download e cache de miniaturas.
+
+Um http.server local faz o papel do site de origem das fotos.
+"""
+
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import db
+from app.fotos import PhotoError, fetch_image, thumbnail_name, thumbnails
+from app.models.models import User
+from conftest import make_user
+
+Image = pytest.importorskip('PIL.Image')
+
+def _image(color, fmt='PNG', size=(40, 40)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, fmt)
+    return buffer.getvalue()
+
+class Origin:
+    """
+    Servidor de origem: cada caminho responde (status, Content-Type, corpo).
+    """
+    
+    def __init__(self):
+        self.routes = {}
+        origin = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, content_type, body = origin.routes.get(
+                    self.path, (404, 'text/plain', b'nada aqui'))
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+    
+    def serve(self, path, body, content_type='image/png', status=200):
+        self.routes[path] = (status, content_type, body)
+        return f'http://127.0.0.1:{self.server.server_port}{path}'
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def origin():
+    server = Origin()
+    yield server
+    server.close()
+
+@pytest.fixture
+def app_config():
+    return {
+        'PHOTO_ALLOW_PRIVATE_HOSTS': True,
+        'PHOTO_MAX_BYTES': 50_000,
+        'CACHE_BACKEND': 'memory',
+    }
+
+def test_valid_photo_is_stored_as_thumbnails(app, origin):
+    url = origin.serve('/ok.png', _image('red'))
+    
+    key = thumbnails.import_photo(url)
+    
+    assert key.endswith('.jpg')  # Sem transparência: miniaturas em JPEG
+    for size in thumbnails.sizes:
+        assert thumbnails.get(thumbnail_name(key, size))
+
+def test_oversized_photo_is_rejected(app, origin):
+    url = origin.serve('/grande.png', _image('blue') + b'\0' * 60_000)
+    
+    with pytest.raises(PhotoError, match='no máximo'):
+        thumbnails.import_photo(url)
+
+def test_non_image_content_type_is_rejected(app, origin):
+    url = origin.serve('/pagina.html', b'<html></html>', content_type='text/html')
+    
+    with pytest.raises(PhotoError, match='não aponta para uma imagem'):
+        thumbnails.import_photo(url)
+
+def test_spoofed_content_type_is_checked_against_the_bytes(app, origin):
+    url = origin.serve('/falsa.png', b'<html>nao sou png</html>' * 4)
+    
+    with pytest.raises(PhotoError, match='Formato de imagem não suportado'):
+        thumbnails.import_photo(url)
+    
+    # JPEG servido como PNG: o formato vem do conteúdo
+    url = origin.serve('/trocada.png', _image('green', 'JPEG'))
+    data, fmt = fetch_image(url, 50_000, allow_private=True)
+    assert fmt == 'jpg'
+
+def test_private_hosts_are_refused(app, origin, monkeypatch):
+    url = origin.serve('/interna.png', _image('red'))
+    monkeypatch.setattr(thumbnails, 'allow_private', False)
+    
+    with pytest.raises(PhotoError, match='endereço interno'):
+        thumbnails.import_photo(url)
+    with pytest.raises(PhotoError, match='http'):
+        fetch_image('file:///etc/passwd', 50_000)
+
+def test_evicted_thumbnail_is_regenerated(app, client, origin, monkeypatch):
+    first_url = origin.serve('/primeira.png', _image('red'))
+    with app.app_context():
+        first = thumbnails.import_photo(first_url)
+        make_user('dona', photo_url=first_url, photo_key=first)
+    
+    # Só cabem as miniaturas de uma foto: a segunda descarta a primeira
+    monkeypatch.setattr(thumbnails, 'max_bytes', thumbnails.stats()['bytes'] + 100)
+    thumbnails.import_photo(origin.serve('/segunda.png', _image('blue')))
+    assert thumbnails.evictions > 0
+    assert not thumbnails.get(thumbnail_name(first, 150))
+    
+    response = client.get(f'/fotos/150/{first}')
+    
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'image/jpeg'
+    assert 'immutable' in response.headers['Cache-Control']
+
+def test_changed_source_redirects_to_the_new_key(app, client, origin, monkeypatch):
+    url = origin.serve('/muda.png', _image('red'))
+    with app.app_context():
+        old = thumbnails.import_photo(url)
+        user_id = make_user('mutante', photo_url=url, photo_key=old).id
+    
+    # A imagem muda na origem e as miniaturas antigas são descartadas
+    origin.serve('/muda.png', _image('yellow'))
+    monkeypatch.setattr(thumbnails, 'max_bytes', 0)
+    thumbnails.import_photo(origin.serve('/outra.png', _image('blue')))
+    assert not thumbnails.get(thumbnail_name(old, 150))
+    monkeypatch.undo()
+    
+    response = client.get(f'/fotos/150/{old}')
+    
+    assert response.status_code == 302
+    new = response.headers['Location'].rsplit('/', 1)[1]
+    assert new != old
+    assert client.get(f'/fotos/150/{new}').status_code == 200
+    with app.app_context():
+        assert db.session.get(User, user_id).photo_key == new
+    
+    # Páginas renderizadas antes da troca continuam funcionando
+    assert client.get(f'/fotos/300/{old}').status_code == 302
+
+def test_unknown_key_is_not_found(app, client):
+    assert client.get(f'/fotos/150/{"0" * 64}.jpg').status_code == 404
+    assert client.get('/fotos/150/nao-e-chave').status_code == 404
@@ -0,0 +1,86 @@
+"""
+Executor de migrações: dry-run sem escrita e backfill do índice FTS5
+retomado depois de posts alterados no meio do caminho.
+"""
+
+import os
+import shutil
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import migracoes
+
+class Interrupted(Exception):
+    pass
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migracoes.db'}")
+    yield engine
+    engine.dispose()
+
+def _quiet(message):
+    pass
+
+def _tables(engine):
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master"))}
+
+def test_dry_run_writes_nothing(engine):
+    pending = migracoes.upgrade(engine, dry_run=True, echo=_quiet)
+    
+    assert [m.version for m in pending] == [m.version for m in migracoes.discover()]
+    assert _tables(engine) == set()
+    assert all(state == 'pendente' for _, state in migracoes.status(engine))
+    assert _tables(engine) == set()
+
+def test_fts_backfill_survives_updates_and_deletes_of_pending_posts(engine, tmp_path):
+    # Esquema até a 0004, com posts que a 0005 vai ter de indexar
+    before_fts = tmp_path / 'ate_0004'
+    before_fts.mkdir()
+    for migration in migracoes.discover():
+        if migration.version < 5:
+            shutil.copy(migration.path, before_fts / os.path.basename(migration.path))
+    migracoes.upgrade(engine, directory=str(before_fts), echo=_quiet)
+    
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, username, password_hash, remember, last_login) "
+            "VALUES (1, 'ana', 'x', 0, '2024-01-01 00:00:00')"
+        ))
+        for post_id in range(1, 7):
+            conn.execute(text(
+                "INSERT INTO posts (id, body, timestamp, user_id) VALUES (:id, :body, :ts, 1)"
+            ), {'id': post_id, 'body': f'original {post_id}', 'ts': f'2024-01-01 00:00:0{post_id}'})
+    
+    # A 0005 para depois do primeiro lote (posts 1 e 2 indexados)
+    def interrupt(message):
+        if "'posts_fts': lote 1" in message:
+            raise Interrupted
+    with pytest.raises(Interrupted):
+        migracoes.upgrade(engine, batch_size=2, echo=interrupt)
+    
+    # A aplicação continua no ar: altera posts indexados e pendentes
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE posts SET body = 'editado um' WHERE id = 1"))
+        conn.execute(text("UPDATE posts SET body = 'editado quatro' WHERE id = 4"))
+        conn.execute(text("DELETE FROM posts WHERE id IN (2, 5)"))
+        conn.execute(text(
+            "INSERT INTO posts (id, body, timestamp, user_id) "
+            "VALUES (7, 'novo sete', '2024-01-01 00:00:07', 1)"
+        ))
+    
+    migracoes.upgrade(engine, batch_size=2, echo=_quiet)
+    
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO posts_fts(posts_fts, rank) VALUES ('integrity-check', 1)"))
+        
+        def search(term):
+            return sorted(row[0] for row in conn.execute(
+                text("SELECT rowid FROM posts_fts WHERE posts_fts MATCH :q"), {'q': term}
+            ))
+        
+        assert search('editado') == [1, 4]
+        assert search('original') == [3, 6]
+        assert search('novo') == [7]
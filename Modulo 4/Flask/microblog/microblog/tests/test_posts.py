@@ -0,0 +1,74 @@
+"""
+Criação de posts (individual, em lote e por importação) e os contadores
+desnormalizados.
+"""
+
+import io
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app import alquimias, db, transferencia
+from app.models.models import FeedEntry, Post, User, utcnow
+from conftest import make_user
+
+def test_bulk_create_only_touches_its_own_rows(app):
+    with app.app_context():
+        author = make_user('importado').id
+        other = make_user('concorrente').id
+        fan = make_user('fã').id
+        alquimias.follow_user(fan, other)
+        
+        # Post de outro usuário com ID no meio do intervalo do lote
+        concurrent = alquimias.create_post(other, 'concorrente').id
+        now = utcnow()
+        rows = [
+            {'id': concurrent - 1, 'user_id': author, 'body': 'a', 'timestamp': now},
+            {'id': concurrent + 1, 'user_id': author, 'body': 'b', 'timestamp': now},
+        ]
+        assert alquimias.bulk_create_posts(rows) == 2
+        
+        entries = db.session.scalar(
+            select(func.count()).select_from(FeedEntry).where(FeedEntry.post_id == concurrent)
+        )
+        assert entries == 2  # Autor e seguidor, uma vez cada
+        assert db.session.get(User, other).post_count == 1
+        assert db.session.get(User, author).post_count == 2
+
+def test_posts_use_utc_timestamps(app):
+    with app.app_context():
+        author = make_user('relógio').id
+        post = alquimias.create_post(author, 'agora')
+        assert abs(post.timestamp - utcnow()) < timedelta(seconds=5)
+        
+        post = alquimias.update_post(post.id, 'depois')
+        assert post.edited_at >= post.timestamp
+
+def _import(lines):
+    messages = []
+    stream = io.StringIO('\n'.join(json.dumps(line) for line in lines) + '\n')
+    result = transferencia.import_posts(stream, echo=messages.append)
+    return result, messages
+
+def test_import_skips_rows_with_wrong_json_types(app):
+    with app.app_context():
+        make_user('ana')
+        result, messages = _import([
+            {'username': 'ana', 'body': 5},
+            {'username': ['ana'], 'body': 'x'},
+            {'username': 'ana', 'body': 'válido'},
+        ])
+        
+        assert result['imported'] == 1
+        assert result['skipped'] == 2
+        assert any('Linha 1 ignorada: corpo não é texto' in message for message in messages)
+        assert any('Linha 2 ignorada: usuário não é texto' in message for message in messages)
+
+def test_import_converts_aware_timestamps_to_utc(app):
+    with app.app_context():
+        author = make_user('ana').id
+        _import([{'username': 'ana', 'body': 'com fuso', 'timestamp': '2024-01-01T10:00:00+02:00'}])
+        
+        post = db.session.scalars(select(Post).where(Post.user_id == author)).one()
+        assert post.timestamp == datetime(2024, 1, 1, 8, 0)
@@ -0,0 +1,22 @@
+"""
+Hash de senhas: valores derivados do método calculados na inicialização.
+"""
+
+import pytest
+
+from app import senhas
+
+@pytest.fixture
+def app_config():
+    return {'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1234'}
+
+def test_init_app_precomputes_prefix_and_dummy_hash(app, monkeypatch):
+    assert 'pbkdf2:sha256:1234' in senhas._derived
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("hash calculado durante a requisição")
+    monkeypatch.setattr(senhas, 'generate_password_hash', fail)
+    
+    assert senhas.needs_rehash('pbkdf2:sha256:600000$salt$hash')
+    assert not senhas.needs_rehash('pbkdf2:sha256:1234$salt$hash')
+    assert senhas.dummy_verify('qualquer') is False